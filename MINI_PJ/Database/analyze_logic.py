@@ -1,11 +1,17 @@
 # analyze_logic.py
 
 import pandas as pd
-import re
-import math
+import threading
+import time
+from collections import OrderedDict
 from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
 import mysql.connector
 from mysql.connector import Error
+from dbc_parser import parse_sg_bits
+from bit_mask import compute_byte_masks, is_big_endian
+from signal_classifier import classify_signals
+import perf
 
 # ============================================
 # ⚙️ DB 설정 (통합)
@@ -17,24 +23,80 @@ DB_NAME = "car_skill"
 MYSQL_PORT = 3306
 
 
+# 커넥션 풀 설정 (모든 DB 함수가 하나의 엔진/풀을 공유)
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 5
+POOL_RECYCLE_SEC = 1800  # 서버 wait_timeout 전에 연결 재생성
+POOL_TIMEOUT_SEC = 10  # 풀이 가득 찼을 때 대기 한도
+
+
 # ============================================
-# 🔌 DB 연결 함수
+# 🔌 DB 연결 함수 (공유 커넥션 풀)
 # ============================================
+_engine = None
+_engine_lock = threading.Lock()
+
+# 풀 대기 시간과 쿼리 시간을 분리해서 누적합니다.
+DB_STATS = {"checkouts": 0, "pool_wait_sec": 0.0, "queries": 0, "query_sec": 0.0}
+_stats_lock = threading.Lock()
+
+
+def _add_stat(count_key, time_key, elapsed):
+    with _stats_lock:
+        DB_STATS[count_key] += 1
+        DB_STATS[time_key] += elapsed
+    perf.record(f"db.{count_key}", elapsed)  # 계측이 켜져 있으면 p50/p95용으로도 기록
+
+
+def get_db_stats():
+    """커넥션 풀 대기/쿼리 시간 누적값과 평균(ms)을 반환합니다."""
+    with _stats_lock:
+        stats = dict(DB_STATS)
+    stats["avg_pool_wait_ms"] = stats["pool_wait_sec"] * 1000 / max(stats["checkouts"], 1)
+    stats["avg_query_ms"] = stats["query_sec"] * 1000 / max(stats["queries"], 1)
+    return stats
+
+
+def get_engine():
+    """SQLAlchemy 엔진(커넥션 풀 포함)을 처음 호출될 때 한 번만 만들어 재사용합니다."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                db_url = f"mysql+mysqlconnector://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{DB_NAME}"
+                _engine = create_engine(
+                    db_url,
+                    pool_size=POOL_SIZE,
+                    max_overflow=POOL_MAX_OVERFLOW,
+                    pool_recycle=POOL_RECYCLE_SEC,
+                    pool_timeout=POOL_TIMEOUT_SEC,
+                    pool_pre_ping=True,  # 끊어진 연결은 꺼내기 전에 확인 후 교체
+                    connect_args={"connection_timeout": 5},
+                )
+    return _engine
+
+
 def get_conn():
-    """MySQL DB 연결 객체를 반환합니다."""
+    """풀에서 MySQL 연결을 꺼내 반환합니다. close() 하면 풀로 반납됩니다."""
+    start = time.perf_counter()
     try:
-        conn = mysql.connector.connect(
-            host=MYSQL_HOST,
-            user=MYSQL_USER,
-            password=MYSQL_PASSWORD,
-            database=DB_NAME,
-            port=MYSQL_PORT,
-            connection_timeout=5,
-        )
+        conn = get_engine().raw_connection()
         return conn
-    except Error as e:
+    except (Error, SQLAlchemyError) as e:
         print(f"DB 접속 에러: {e}")
         return None
+    finally:
+        _add_stat("checkouts", "pool_wait_sec", time.perf_counter() - start)
+
+
+def run_query(cur, query, params=None):
+    """쿼리를 실행하고 한 행을 가져오며, 소요 시간을 DB_STATS에 기록합니다."""
+    start = time.perf_counter()
+    try:
+        cur.execute(query, params)
+        return cur.fetchone()
+    finally:
+        _add_stat("queries", "query_sec", time.perf_counter() - start)
 
 
 # ============================================
@@ -42,74 +104,350 @@ def get_conn():
 # ============================================
 def parse_bits_from_original_code(original_code: str):
     """'SG_ Name : StartBit|BitLength@endianness...' 문자열에서 start_bit와 bit_length를 파싱합니다."""
-    try:
-        after_colon = original_code.split(":", 1)[1].strip()
-        before_at = after_colon.split("@", 1)[0].strip()
-        start_str, length_str = before_at.split("|")
-        return int(start_str), int(length_str)
-    except Exception as e:
-        print(f"parse_bits 실패: {original_code} {e}")
-        return None, None
+    bits = parse_sg_bits(original_code)
+    if bits is None:
+        return None, None  # 호출하는 쪽에서 (None, None)으로 실패를 판단합니다.
+    return bits
 
 
-def calculate_bits(start_bit: int, bit_length: int):
-    """Intel(@1) 기준 64비트(8바이트) 비트 마스크를 계산합니다."""
-    total_bits = [0] * 8
+def calculate_bits(start_bit: int, bit_length: int, byte_order="little_endian", payload_bytes=8):
+    """Intel(@1)/Motorola(@0) 비트 마스크를 바이트 리스트로 계산합니다 (CAN FD는 payload_bytes=64)."""
     if start_bit is None or bit_length is None:
-        return total_bits
-
-    for i in range(bit_length):
-        bit_position = start_bit + i
-        if bit_position >= 64:
-            break
+        return [0] * payload_bytes
 
-        byte_index = bit_position // 8
-        bit_index = bit_position % 8
-        total_bits[byte_index] |= 1 << bit_index
+    masks = compute_byte_masks([start_bit], [bit_length], is_big_endian(byte_order), payload_bytes)
+    return masks[0].tolist()
 
-    return total_bits
 
-
-def get_can_id_by_original_code(original_code: str):
-    """original_code 문자열로 DB에서 CAN ID를 조회합니다."""
+# ============================================
+# 🗂️ original_code → CAN ID 인메모리 인덱스
+# ============================================
+def normalize_code(code: str):
+    """공백(스페이스/탭/개행)을 하나로 합쳐 비교용 키를 만듭니다."""
+    return " ".join(code.split())
+
+
+def fetch_table_fingerprint(cur, tables):
+    """테이블별 (이름, 행 수, UPDATE_TIME) 튜플로 변경 여부 판단용 지문을 만듭니다.
+
+    cur는 dictionary=True 커서여야 합니다.
+    """
+    counts = run_query(
+        cur,
+        "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {t}) AS `{t}`" for t in tables) + ";",
+    )
+    cur.execute(
+        "SELECT TABLE_NAME, UPDATE_TIME FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ("
+        + ", ".join(["%s"] * len(tables)) + ");",
+        (DB_NAME, *tables),
+    )
+    times = {r["TABLE_NAME"]: str(r["UPDATE_TIME"]) for r in cur.fetchall()}
+    return tuple((t, counts[t], times.get(t)) for t in tables)
+
+
+def get_catalog_fingerprint():
+    """signals/messages 테이블 지문 문자열을 반환합니다. DB에 접속할 수 없으면 None."""
     conn = get_conn()
     if conn is None:
         return None
-
     try:
         cur = conn.cursor(dictionary=True)
-        clean = original_code.strip()
+        fingerprint = fetch_table_fingerprint(cur, ("signals", "messages"))
+        cur.close()
+        return repr(fingerprint)
+    except Error as e:
+        print(f"DB 조회 에러: {e}")
+        return None
+    finally:
+        conn.close()
 
-        query1 = "SELECT message_id FROM original_code WHERE TRIM(original_code) = TRIM(%s) LIMIT 1;"
-        cur.execute(query1, (clean,))
-        row = cur.fetchone()
 
-        if not row:
-            query2 = "SELECT message_id FROM original_code WHERE original_code LIKE %s LIMIT 1;"
-            cur.execute(query2, (f"%{clean}%",))
-            row = cur.fetchone()
+class OriginalCodeIndex:
+    """original_code/messages 테이블을 한 번 읽어 정규화된 키 → frame_id 해시맵으로 보관합니다.
+
+    행 수가 max_entries 이하이면 전체를 미리 적재하고, 더 크면 조회된 키만
+    LRU로 유지합니다. check_interval 초마다 테이블 지문을 확인해 바뀌면 비웁니다.
+    DB 접속에 실패하면 retry_min초부터 retry_max초까지 두 배씩 늘려 가며 재접속을 미룹니다.
+    """
+
+    def __init__(self, max_entries=200_000, check_interval=30.0, retry_min=5.0, retry_max=300.0):
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self.complete = False  # 테이블 전체가 적재되어 있는지
+        self._map = OrderedDict()
+        self._message_ids = {}  # 정규화 키 → message_id (전체 적재 상태에서만 채움)
+        self._fingerprint = None
+        self._last_check = 0.0
+        self._retry_at = 0.0  # 이 시각(monotonic) 전에는 DB에 다시 접속하지 않음
+        self._retry_delay = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._map)
+
+    def connect(self):
+        """백오프 중이 아니면 풀에서 연결을 꺼냅니다 (백오프 중이거나 실패하면 None).
+
+        실패하면 다음 재시도 시각을 뒤로 미룹니다. 인덱스 밖의 조회도 같은 백오프를 따르도록 씁니다.
+        """
+        now = time.monotonic()
+        if now < self._retry_at:
+            return None
+        conn = get_conn()
+        if conn is None:
+            self._retry_delay = min(max(self._retry_delay * 2, self.retry_min), self.retry_max)
+            self._retry_at = now + self._retry_delay
+        else:
+            self._retry_delay = 0.0
+        return conn
 
-        if not row:
+    def load(self):
+        """테이블 지문을 확인하고, max_entries 이하이면 전체를 해시맵에 적재합니다."""
+        conn = self.connect()
+        if conn is None:
+            return False
+
+        try:
+            cur = conn.cursor(dictionary=True)
+            fingerprint = fetch_table_fingerprint(cur, ("original_code", "messages"))
+            new_map = OrderedDict()
+            message_ids = {}
+            complete = fingerprint[0][1] <= self.max_entries
+            if complete:
+                start = time.perf_counter()
+                cur.execute(
+                    "SELECT oc.original_code, oc.message_id, m.frame_id FROM original_code oc "
+                    "LEFT JOIN messages m ON oc.message_id = m.id;"
+                )
+                while True:
+                    rows = cur.fetchmany(5000)
+                    if not rows:
+                        break
+                    for r in rows:
+                        # 같은 키가 여러 번 나오면 첫 번째 행을 유지 (LIMIT 1과 동일)
+                        key = normalize_code(r["original_code"] or "")
+                        if key not in new_map:
+                            new_map[key] = r["frame_id"]
+                            message_ids[key] = r["message_id"]
+                _add_stat("queries", "query_sec", time.perf_counter() - start)
             cur.close()
+        except Error as e:
+            print(f"DB 조회 에러: {e}")
+            return False
+        finally:
             conn.close()
+
+        with self._lock:
+            self._map = new_map
+            self._message_ids = message_ids
+            self.complete = complete
+            self._fingerprint = fingerprint
+            self._last_check = time.monotonic()
+        return True
+
+    def invalidate(self):
+        """캐시를 비워 다음 조회 때 다시 적재하도록 합니다."""
+        with self._lock:
+            self._map = OrderedDict()
+            self._message_ids = {}
+            self.complete = False
+            self._fingerprint = None
+
+    def _refresh_if_stale(self):
+        if self._fingerprint is None:
+            self.load()
+            return
+        if time.monotonic() - self._last_check < self.check_interval:
+            return
+
+        conn = self.connect()
+        if conn is None:
+            return  # 오프라인이면 기존 캐시를 그대로 사용 (재접속은 백오프)
+        try:
+            cur = conn.cursor(dictionary=True)
+            fingerprint = fetch_table_fingerprint(cur, ("original_code", "messages"))
+            cur.close()
+        except Error as e:
+            print(f"DB 조회 에러: {e}")
+            return
+        finally:
+            conn.close()
+
+        self._last_check = time.monotonic()
+        if fingerprint != self._fingerprint:
+            self.load()
+
+    def _query_one(self, clean, key):
+        """인덱스에 없는 키를 DB에서 한 번의 JOIN으로 조회합니다 (부분 적재 모드).
+
+        원본 컬럼에 함수를 씌우지 않고 입력값(앞뒤 공백 제거)과 정규화 키를
+        그대로 비교해 original_code 인덱스를 탑니다.
+        """
+        conn = self.connect()
+        if conn is None:
+            return None
+        try:
+            cur = conn.cursor(dictionary=True)
+            row = run_query(
+                cur,
+                "SELECT m.frame_id FROM original_code oc "
+                "LEFT JOIN messages m ON oc.message_id = m.id "
+                "WHERE oc.original_code IN (%s, %s) LIMIT 1;",
+                (clean, key),
+            )
+            cur.close()
+            return row["frame_id"] if row else None
+        except Error as e:
+            print(f"DB 조회 에러: {e}")
             return None
+        finally:
+            conn.close()
 
-        msg_id = row["message_id"]
-        can_id = None
-        if msg_id is not None:
-            query_msg = "SELECT frame_id FROM messages WHERE id = %s LIMIT 1;"
-            cur.execute(query_msg, (msg_id,))
-            msg_row = cur.fetchone()
-            if msg_row:
-                can_id = msg_row["frame_id"]
+    def lookup(self, original_code: str):
+        """정규화된 original_code로 frame_id를 O(1)에 찾습니다. 없으면 None."""
+        self._refresh_if_stale()
+        key = normalize_code(original_code)
+
+        with self._lock:
+            if key in self._map:
+                self._map.move_to_end(key)
+                return self._map[key]
+            if self.complete:
+                return None
+
+        can_id = self._query_one(original_code.strip(), key)
+        with self._lock:
+            self._map[key] = can_id  # 미일치(None)도 저장해 반복 조회를 막음
+            while len(self._map) > self.max_entries:
+                self._map.popitem(last=False)
+        return can_id
 
-        cur.close()
-        conn.close()
+
+    def resolve_many(self, codes):
+        """테이블 전체가 적재되어 있으면 코드마다 (message_id, frame_id) 또는 None(미일치) 목록을,
+        아니면 None을 반환합니다 (resolve_original_codes가 DB 대신 쓰는 경로)."""
+        self._refresh_if_stale()
+        with self._lock:
+            if not self.complete:
+                return None
+            result = []
+            for code in codes:
+                key = normalize_code(code)
+                result.append((self._message_ids.get(key), self._map[key]) if key in self._map else None)
+            return result
+
+
+code_index = OriginalCodeIndex()
+
+
+@perf.timed("lookup.can_id")
+def get_can_id_by_original_code(original_code: str):
+    """original_code 문자열로 CAN ID를 조회합니다 (인메모리 인덱스 → DB LIKE 검색 순).
+
+    테이블 전체가 인덱스에 적재되어 있으면 인덱스에 없는 코드는 DB에 묻지 않고 None을 반환합니다.
+    """
+    can_id = code_index.lookup(original_code)
+    if can_id is not None or code_index.complete:
         return can_id
 
+    conn = code_index.connect()
+    if conn is None:
+        return None
+
+    try:
+        cur = conn.cursor(dictionary=True)
+        clean = original_code.strip()
+
+        # 정확히 일치하는 행이 없을 때만 부분 일치로 한 번 더 찾습니다.
+        query = (
+            "SELECT m.frame_id FROM original_code oc "
+            "LEFT JOIN messages m ON oc.message_id = m.id "
+            "WHERE oc.original_code LIKE %s LIMIT 1;"
+        )
+        row = run_query(cur, query, (f"%{clean}%",))
+        cur.close()
+        return row["frame_id"] if row else None
+
     except Error as e:
         print(f"DB 조회 에러: {e}")
         return None
+    finally:
+        conn.close()  # 풀로 반납
+
+
+@perf.timed("lookup.resolve_batch")
+def resolve_original_codes(codes, chunk_size=1000):
+    """여러 original_code를 임시 테이블 + JOIN 한 번으로 일괄 조회합니다.
+
+    반환: original_code, message_id, frame_id, matched 컬럼의 DataFrame
+    (입력 순서 유지, 일치하지 않은 행은 matched=False)
+    code_index가 테이블 전체를 적재해 두었으면 DB 대신 인덱스로 찾아 lookup과 같은 결과를 냅니다.
+    """
+    codes = list(codes)
+    result = pd.DataFrame({"original_code": codes})
+    result["_key"] = [normalize_code(c) for c in codes]
+
+    cached = code_index.resolve_many(codes) if codes else None
+    if cached is not None:
+        result["matched"] = [hit is not None for hit in cached]
+        result["message_id"] = pd.array([hit[0] if hit else None for hit in cached], dtype="Int64")
+        result["frame_id"] = pd.array([hit[1] if hit else None for hit in cached], dtype="Int64")
+        return result[["original_code", "message_id", "frame_id", "matched"]]
+    # 임시 테이블 쪽에만 (앞뒤 공백 제거한 원문, 정규화 키) 두 형태를 넣고
+    # original_code 컬럼은 그대로 비교해 인덱스를 타게 합니다.
+    keys = list(dict.fromkeys(  # 중복 제거 (순서 유지)
+        pair for c, k in zip(codes, result["_key"]) for pair in ((c.strip(), k), (k, k))
+    ))
+
+    found = pd.DataFrame(columns=["_key", "message_id", "frame_id"])
+    conn = get_conn() if keys else None
+    if conn is not None:
+        try:
+            cur = conn.cursor()
+            cur.execute("DROP TEMPORARY TABLE IF EXISTS tmp_codes;")
+            cur.execute(
+                "CREATE TEMPORARY TABLE tmp_codes (code TEXT NOT NULL, code_key TEXT NOT NULL);"
+            )
+            for i in range(0, len(keys), chunk_size):
+                cur.executemany(
+                    "INSERT INTO tmp_codes (code, code_key) VALUES (%s, %s)",
+                    keys[i:i + chunk_size],
+                )
+
+            start = time.perf_counter()
+            # 풀 연결(mysqlconnector 방언)의 기본 커서는 결과 전체를 받아 두는 buffered 커서이므로
+            # 서버 측 커서를 명시해 chunk_size씩 받아 메모리 사용을 제한합니다.
+            stream = conn.cursor(buffered=False)
+            stream.execute(
+                "SELECT t.code_key, oc.message_id, m.frame_id FROM tmp_codes t "
+                "JOIN original_code oc ON oc.original_code = t.code "
+                "LEFT JOIN messages m ON oc.message_id = m.id;"
+            )
+            rows = []
+            while True:
+                batch = stream.fetchmany(chunk_size)
+                if not batch:
+                    break  # 결과를 끝까지 읽어야 같은 연결에서 다음 쿼리(DROP)를 보낼 수 있음
+                rows.extend(batch)
+            stream.close()
+            _add_stat("queries", "query_sec", time.perf_counter() - start)
+
+            cur.execute("DROP TEMPORARY TABLE IF EXISTS tmp_codes;")
+            cur.close()
+            found = pd.DataFrame(rows, columns=["_key", "message_id", "frame_id"])
+            found = found.drop_duplicates("_key")  # 같은 코드가 여러 행이면 첫 행 (LIMIT 1과 동일)
+        except Error as e:
+            print(f"DB 조회 에러: {e}")
+        finally:
+            conn.close()
+
+    result = result.merge(found, on="_key", how="left", indicator=True)
+    result["matched"] = result["_merge"] == "both"
+    result[["message_id", "frame_id"]] = result[["message_id", "frame_id"]].astype("Int64")
+    return result.drop(columns=["_key", "_merge"])
 
 
 # ============================================
@@ -123,6 +461,8 @@ class CarPoint:
         self.y = y
         self.category = category
         self.color = "red"
+        self.fault = False  # 실시간 고장 규칙이 발생 중이면 True (선택 색과 별개로 표시)
+        self.item_id = None  # 캔버스 oval 아이템 id (한 번 만들고 itemconfig로 갱신)
 
     def toggle_color(self):
         self.color = "green" if self.color == "red" else "red"
@@ -132,41 +472,27 @@ class CarPoint:
 # 🧠 데이터 로딩 및 처리
 # ============================================
 
+@perf.timed("catalog.db_load")
 def load_and_process_data():
 
     """DB에서 시그널 데이터를 로드하고 위치/상태로 분류합니다."""
-    location_patterns = {
-        "Front": r"(?i)Front|Head|Bonnet|Engine|F_|Hood|Wiper",
-        "Rear": r"(?i)Rear|Tail|Trunk|Back|R_Fog|Brake",
-        "Left": r"(?i)Left|_L_|Drvr|Driver|LH",
-        "Right": r"(?i)Right|_R_|Psngr|Pass|RH",
-    }
-    error_pattern = r"(?i)Fail|Error|Open|Short|Fault|Warn|Abnormal|Err"
-
-    def classify_signal(name):
-        category = "Other"
-        for loc, pat in location_patterns.items():
-            if re.search(pat, name):
-                category = loc
-                break
-
-        status = "작동(Normal)"
-        if re.search(error_pattern, name):
-            status = "고장(Error)"
-
-        return pd.Series([category, status])
-
     try:
-        db_url = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{DB_NAME}"
-        engine = create_engine(db_url)
-        with engine.connect() as connection:
+        start = time.perf_counter()
+        with get_engine().connect() as connection:
+            _add_stat("checkouts", "pool_wait_sec", time.perf_counter() - start)
             query = """
-                SELECT s.*, m.name AS message_name 
+                SELECT s.*, m.name AS message_name, m.frame_id AS frame_id, m.dlc AS dlc
                 FROM signals s 
                 JOIN messages m ON s.message_id = m.id
             """
+            start = time.perf_counter()
             df_all = pd.read_sql(query, connection)
-            df_all[["Category", "Status"]] = df_all["name"].apply(classify_signal)
+            _add_stat("queries", "query_sec", time.perf_counter() - start)
+            with perf.timer("catalog.classify"):
+                category, status, rule_hits = classify_signals(df_all["name"])
+            df_all["Category"] = category
+            df_all["Status"] = status
+            df_all.attrs["rule_hits"] = rule_hits  # 규칙별 적용 건수
             return df_all
 
     except Exception as e:
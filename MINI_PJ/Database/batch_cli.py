@@ -0,0 +1,224 @@
+# batch_cli.py
+"""SG_ 라인 목록 또는 DBC 파일을 GUI 없이 일괄 해석하는 명령줄 도구.
+
+사용 예)
+    python batch_cli.py signals.dbc -o result.csv
+    type lines.txt | python batch_cli.py - --format json --resolve-db
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from bit_mask import CANFD_PAYLOAD_BYTES, compute_byte_masks, is_big_endian
+from dbc_parser import parse_bo_line, parse_sg_line
+
+DEFAULT_CHUNK_SIZE = 2000  # 프로세스 하나에 넘길 라인 수
+INFLIGHT_PER_WORKER = 2  # 워커당 동시에 넘겨 둘 청크 수 (입력을 미리 다 읽지 않도록)
+
+RESULT_COLUMNS = [
+    "line_no", "message_name", "can_id", "is_extended", "dlc", "name", "start_bit", "bit_length",
+    "byte_order", "is_signed", "factor", "offset", "min_val", "max_val", "unit",
+    "mask_hex", "mask_u64", "original_code", "parsed",
+]
+
+
+# ============================================
+# 📥 입력 읽기 및 청크 분할
+# ============================================
+def iter_chunks(stream, chunk_size):
+    """SG_/BO_ 라인만 골라 chunk_size개씩 (라인 목록, 직전 BO_ 라인)으로 묶습니다.
+
+    직전 BO_ 라인을 함께 넘기므로 청크 경계에서 메시지 문맥이 끊기지 않습니다.
+    """
+    chunk = []
+    current_bo = None  # 이 청크 시작 시점의 BO_ 라인
+    last_bo = None
+    for line_no, raw in enumerate(stream, 1):
+        line = raw.strip()
+        if line.startswith("BO_ "):
+            last_bo = line
+        elif not line.startswith("SG_"):
+            continue
+        chunk.append((line_no, line))
+        if len(chunk) >= chunk_size:
+            yield chunk, current_bo
+            chunk, current_bo = [], last_bo
+    if chunk:
+        yield chunk, current_bo
+
+
+# ============================================
+# ⚙️ 워커: 파싱 + 마스크 계산
+# ============================================
+def process_chunk(args):
+    """(워커 프로세스) 청크의 SG_ 라인을 파싱하고 마스크를 한 번에 계산합니다."""
+    chunk, bo_line, payload_bytes = args
+    message = parse_bo_line(bo_line) if bo_line else None
+
+    rows = []
+    for line_no, line in chunk:
+        if line.startswith("BO_ "):
+            message = parse_bo_line(line) or message
+            continue
+        sig = parse_sg_line(line)
+        base = {
+            "line_no": line_no,
+            "message_name": message.name if message else None,
+            "can_id": message.frame_id if message else None,
+            "is_extended": message.is_extended if message else None,
+            "dlc": message.dlc if message else None,
+            "original_code": line,
+        }
+        if sig is None:
+            rows.append({**base, "parsed": False})
+            continue
+        rows.append({
+            **base,
+            "name": sig.name,
+            "start_bit": sig.start_bit,
+            "bit_length": sig.bit_length,
+            "byte_order": sig.byte_order,
+            "is_signed": sig.is_signed,
+            "factor": sig.factor,
+            "offset": sig.offset,
+            "min_val": sig.min_val,
+            "max_val": sig.max_val,
+            "unit": sig.unit,
+            "parsed": True,
+        })
+
+    df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    ok = df["parsed"].to_numpy(dtype=bool)
+    if ok.any():
+        parsed = df[ok]
+        masks = compute_byte_masks(
+            parsed["start_bit"].astype("int64"),
+            parsed["bit_length"].astype("int64"),
+            is_big_endian(parsed["byte_order"].to_numpy()),
+            payload_bytes,
+        )
+        # 전부 NaN(float)인 컬럼에 문자열을 넣을 수 없으므로 object 배열로 통째로 교체
+        mask_hex = np.full(len(df), None, dtype=object)
+        mask_u64 = np.full(len(df), None, dtype=object)
+        # 메시지 DLC를 알면 그 길이까지만 16진수로 표시합니다.
+        dlcs = parsed["dlc"].fillna(payload_bytes).astype("int64").to_numpy()
+        mask_hex[ok] = [
+            (m[:n] if not m[n:].any() else m).tobytes().hex(" ").upper()
+            for m, n in zip(masks, dlcs)
+        ]
+        # 8바이트를 넘는 (CAN FD) 마스크는 정수 하나로 표현할 수 없으므로 비워 둡니다.
+        mask_u64[ok] = [
+            int.from_bytes(m[:8].tobytes(), "little") if not m[8:].any() else None
+            for m in masks
+        ]
+        df["mask_hex"] = mask_hex
+        df["mask_u64"] = mask_u64
+    return df
+
+
+def bounded_map(pool, func, jobs, window):
+    """pool.map과 같은 순서로 결과를 내되, 처리 중인 청크를 window개까지만 제출합니다.
+
+    Executor.map은 입력 iterable을 처음에 전부 제출하므로 큰 파일/파이프를 통째로 읽습니다.
+    """
+    pending = deque()
+    for job in jobs:
+        pending.append(pool.submit(func, job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# ============================================
+# 🔗 DB 조회 (선택)
+# ============================================
+def resolve_can_ids(df):
+    """DBC 문맥으로 CAN ID를 알 수 없는 라인만 DB에서 한 번에 조회합니다."""
+    from analyze_logic import resolve_original_codes  # DB 모듈은 필요할 때만 로드
+
+    missing = df["can_id"].isna() & df["parsed"]
+    if missing.any():
+        resolved = resolve_original_codes(df.loc[missing, "original_code"].tolist())
+        df.loc[missing, "can_id"] = resolved["frame_id"].to_numpy()
+    return df
+
+
+# ============================================
+# 📤 출력
+# ============================================
+def write_result(df, output, fmt):
+    if fmt == "parquet":
+        if output in (None, "-"):
+            print("parquet 형식은 -o 로 파일 경로를 지정해야 합니다.", file=sys.stderr)
+            return False
+        try:
+            df.to_parquet(output, index=False)
+        except ImportError as e:
+            print(f"parquet 저장 실패: {e}", file=sys.stderr)
+            return False
+    elif fmt == "json":
+        text = df.to_json(orient="records", force_ascii=False, indent=1)
+        if output in (None, "-"):
+            sys.stdout.write(text + "\n")
+        else:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(text)
+    else:
+        df.to_csv(sys.stdout if output in (None, "-") else output, index=False)
+    return True
+
+
+def guess_format(output):
+    ext = os.path.splitext(output or "")[1].lower()
+    return {".json": "json", ".parquet": "parquet"}.get(ext, "csv")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SG_ 라인/DBC 일괄 해석 (start bit, length, mask, CAN ID)")
+    parser.add_argument("input", help="입력 파일 경로 (- 이면 stdin)")
+    parser.add_argument("-o", "--output", help="출력 파일 경로 (생략 시 stdout)")
+    parser.add_argument("--format", choices=("csv", "json", "parquet"), help="출력 형식 (기본: 확장자로 추정)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="청크당 라인 수")
+    parser.add_argument("--payload-bytes", type=int, default=CANFD_PAYLOAD_BYTES, help="마스크 바이트 수 (8 또는 64)")
+    parser.add_argument("--resolve-db", action="store_true", help="DBC 문맥이 없는 라인의 CAN ID를 DB에서 조회")
+    parser.add_argument("--strict", action="store_true", help="파싱 실패 라인이 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        stream = contextlib.nullcontext(sys.stdin)  # stdin은 닫지 않습니다.
+    else:
+        stream = open(args.input, "r", encoding="cp1252", errors="replace")
+
+    with stream as lines:
+        jobs = ((chunk, bo, args.payload_bytes) for chunk, bo in iter_chunks(lines, args.chunk_size))
+        if args.workers and args.workers > 1:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                parts = list(bounded_map(pool, process_chunk, jobs, args.workers * INFLIGHT_PER_WORKER))
+        else:
+            parts = [process_chunk(job) for job in jobs]
+
+    df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=RESULT_COLUMNS)
+    for col in ("can_id", "dlc", "start_bit", "bit_length"):
+        df[col] = df[col].astype("Int64")  # 파싱 실패 행(NaN) 때문에 float가 되지 않도록
+    if args.resolve_db:
+        df = resolve_can_ids(df)
+
+    if not write_result(df, args.output, args.format or guess_format(args.output)):
+        return 1
+
+    failed = int((~df["parsed"].astype(bool)).sum())
+    print(f"처리 {len(df)}건, 파싱 실패 {failed}건", file=sys.stderr)
+    return 1 if args.strict and failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,476 @@
+# benchmark.py
+"""합성 카탈로그 + SQLite 대용 DB로 주요 경로의 처리량/지연 백분위를 측정합니다.
+
+MySQL 서버 없이도 같은 스키마(signals/messages/original_code)를 SQLite에 만들고
+analyze_logic.get_conn 을 SQLite 연결로 바꿔 끼워 실제 조회 코드를 그대로 실행합니다.
+같은 seed면 같은 카탈로그가 만들어지므로 결과를 커밋 간에 비교할 수 있습니다.
+analyze_logic(sqlalchemy, mysql.connector 필요)을 불러올 수 없으면 DB 항목만 건너뜁니다.
+
+실행)
+    python benchmark.py                         # 1k, 10k, 100k 시그널
+    python benchmark.py --sizes 1000000 --samples 500 --json bench.json
+    python benchmark.py --sizes 5000 --dbc synthetic.dbc   # 합성 DBC 파일도 저장
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bit_mask import compute_byte_masks, is_big_endian
+from decode_engine import DecodePlan, decode_frames
+from dbc_parser import iter_dbc_signals, parse_sg_bits
+from fault_rules import FaultEngine, RULE_TYPES
+from frame_compiler import CompiledDecoder
+from signal_classifier import classify_signals
+from signal_search import TrigramIndex
+
+# ============================================
+# ⚙️ 설정
+# ============================================
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_SAMPLES = 2000  # 호출 단위 측정 시 표본 수
+DEFAULT_REPEATS = 3  # 카탈로그 전체 단위 측정 반복 횟수
+DECODE_FRAMES = 200_000
+SIGNALS_PER_MESSAGE = 16
+LIKE_SAMPLES = 50  # LIKE 전체 스캔은 느리므로 표본 수를 따로 제한
+HOT_FRAME_IDS = 100  # 실시간 버스처럼 일부 frame_id만 반복되는 배치
+LIVE_BATCH_FRAMES = 100  # 실시간 수신 배치 한 번 분량 (20ms)
+FAULT_RULES = 10_000  # 고장 규칙 엔진 측정용 규칙 수
+
+# 분류 규칙에 걸리는 토큰을 섞어 실제 카탈로그와 비슷한 분포를 만듭니다.
+_PREFIXES = ("Front", "Rear", "Left", "Right", "Drvr", "Psngr", "Head", "Tail", "Eng", "Trunk",
+             "Body", "Cluster", "Seat", "Steer", "Bat", "Hvac")
+_OBJECTS = ("Door", "Lamp", "Window", "Speed", "Temp", "Press", "Angle", "Volt", "Curr", "Wiper",
+            "Mirror", "Belt", "Brake", "Torque", "Rpm", "Level")
+_SUFFIXES = ("Sts", "Val", "Req", "Cmd", "Stat", "Fail", "Err", "Warn", "Open", "Short", "Cnt", "Chk")
+_UNITS = ("", "km/h", "rpm", "V", "A", "degC", "%", "Deg", "bar")
+
+
+# ============================================
+# 🧪 합성 카탈로그 생성
+# ============================================
+def generate_catalog(n_signals, seed=0, signals_per_message=SIGNALS_PER_MESSAGE):
+    """시그널 n_signals개의 (messages, signals) DataFrame을 만듭니다.
+
+    signals에는 original_code 테이블에 들어갈 SG_ 문자열 컬럼이 함께 들어 있습니다.
+    """
+    rng = np.random.default_rng(seed)
+    n_messages = -(-n_signals // signals_per_message)
+
+    messages = pd.DataFrame({
+        "id": np.arange(1, n_messages + 1),
+        "frame_id": 0x100 + np.arange(n_messages),
+        "name": [f"MSG_{i:05d}" for i in range(n_messages)],
+        "dlc": 8,
+    })
+
+    message_idx = np.arange(n_signals) // signals_per_message
+    slot = np.arange(n_signals) % signals_per_message
+    # 한 메시지 안에서 4비트씩 겹치지 않게 배치 (16개 × 4비트 = 64비트)
+    bit_length = rng.choice([1, 2, 4], size=n_signals)
+    big = rng.random(n_signals) < 0.2
+    intel_start = slot * 4
+    # 4비트 칸은 바이트 경계를 넘지 않으므로 Motorola 시작 비트(MSB)는 같은 칸의 최상위 사용 비트
+    motorola_start = slot * 4 + bit_length - 1
+    start_bit = np.where(big, motorola_start, intel_start)
+
+    name = [
+        f"{_PREFIXES[a]}{_OBJECTS[b]}_{_SUFFIXES[c]}_{i}"
+        for i, (a, b, c) in enumerate(zip(
+            rng.integers(len(_PREFIXES), size=n_signals),
+            rng.integers(len(_OBJECTS), size=n_signals),
+            rng.integers(len(_SUFFIXES), size=n_signals),
+        ))
+    ]
+    signals = pd.DataFrame({
+        "id": np.arange(1, n_signals + 1),
+        "message_id": messages["id"].to_numpy()[message_idx],
+        "name": name,
+        "start_bit": start_bit,
+        "bit_length": bit_length,
+        "byte_order": np.where(big, "big_endian", "little_endian"),
+        "is_signed": (rng.random(n_signals) < 0.3).astype(int),
+        "factor": rng.choice([1.0, 0.1, 0.5, 0.01], size=n_signals),
+        "offset": rng.choice([0.0, -40.0], size=n_signals),
+        "min_val": 0.0,
+        "max_val": (2.0 ** bit_length) - 1,
+        "unit": rng.choice(_UNITS, size=n_signals),
+    })
+    # DB의 original_code 형식 (예: SG_ SAS_Angle : 0|16@little_endian 0.1 0.0 Deg)
+    signals["original_code"] = (
+        "SG_ " + signals["name"] + " : " + signals["start_bit"].astype(str) + "|"
+        + signals["bit_length"].astype(str) + "@" + signals["byte_order"] + " "
+        + signals["factor"].astype(str) + " " + signals["offset"].astype(str) + " " + signals["unit"]
+    ).str.rstrip()
+    return messages, signals
+
+
+def write_dbc(messages, signals, path):
+    """합성 카탈로그를 DBC 파일(BO_/SG_)로 저장합니다."""
+    frame_of = dict(zip(messages["id"], messages["frame_id"]))
+    with open(path, "w", encoding="cp1252") as f:
+        f.write('VERSION ""\n\nBU_: ECU1 ECU2\n\n')
+        for message_id, grp in signals.groupby("message_id", sort=True):
+            msg = messages.iloc[message_id - 1]
+            f.write(f"BO_ {frame_of[message_id]} {msg['name']}: {msg['dlc']} ECU1\n")
+            for s in grp.itertuples(index=False):
+                order = "0" if s.byte_order == "big_endian" else "1"
+                sign = "-" if s.is_signed else "+"
+                f.write(
+                    f' SG_ {s.name} : {s.start_bit}|{s.bit_length}@{order}{sign} '
+                    f'({s.factor},{s.offset}) [{s.min_val}|{s.max_val}] "{s.unit}" ECU2\n'
+                )
+            f.write("\n")
+
+
+# ============================================
+# 🗄️ SQLite 대용 DB
+# ============================================
+def seed_sqlite(path, messages, signals):
+    """MySQL과 같은 스키마로 SQLite DB 파일을 만들고 합성 데이터를 채웁니다."""
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE messages (id INTEGER PRIMARY KEY, frame_id INTEGER, name TEXT, dlc INTEGER);
+        CREATE TABLE signals (
+            id INTEGER PRIMARY KEY, message_id INTEGER, name TEXT, start_bit INTEGER,
+            bit_length INTEGER, byte_order TEXT, is_signed INTEGER, factor REAL, offset REAL,
+            min_val REAL, max_val REAL, unit TEXT
+        );
+        CREATE TABLE original_code (id INTEGER PRIMARY KEY, message_id INTEGER, original_code TEXT);
+        CREATE INDEX idx_signals_message ON signals(message_id);
+        CREATE INDEX idx_original_code ON original_code(original_code);
+        """
+    )
+    messages.to_sql("messages", conn, if_exists="append", index=False)
+    signals.drop(columns=["original_code"]).to_sql("signals", conn, if_exists="append", index=False)
+    signals[["message_id", "original_code"]].to_sql("original_code", conn, if_exists="append", index=False)
+    conn.commit()
+    conn.close()
+
+
+class SQLiteCursor:
+    """mysql.connector 커서처럼 %s 자리표시자와 dictionary=True 결과를 지원합니다."""
+
+    def __init__(self, cur, dictionary):
+        self._cur = cur
+        self._dictionary = dictionary
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {d[0]: v for d, v in zip(self._cur.description, row)}
+
+    def execute(self, query, params=None):
+        self._cur.execute(query.replace("%s", "?"), params or ())
+
+    def executemany(self, query, seq):
+        self._cur.executemany(query.replace("%s", "?"), seq)
+
+    def fetchone(self):
+        return self._row(self._cur.fetchone())
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cur.fetchall()]
+
+    def fetchmany(self, size):
+        return [self._row(r) for r in self._cur.fetchmany(size)]
+
+    def close(self):
+        self._cur.close()
+
+
+class SQLiteConnection:
+    """풀에서 꺼낸 연결처럼 동작합니다. close()는 실제로 닫지 않고 재사용합니다."""
+
+    def __init__(self, path, db_name):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # fetch_table_fingerprint 가 읽는 information_schema.TABLES 를 흉내 냅니다.
+        self._conn.execute("ATTACH DATABASE ':memory:' AS information_schema")
+        self._conn.execute(
+            "CREATE TABLE information_schema.TABLES (TABLE_SCHEMA TEXT, TABLE_NAME TEXT, UPDATE_TIME TEXT)"
+        )
+        self._conn.executemany(
+            "INSERT INTO information_schema.TABLES VALUES (?, ?, NULL)",
+            [(db_name, t) for t in ("signals", "messages", "original_code")],
+        )
+
+    def cursor(self, dictionary=False, buffered=True):
+        # sqlite3 커서는 원래 한 행씩 읽으므로 buffered 인자는 받기만 합니다.
+        return SQLiteCursor(self._conn.cursor(), dictionary)
+
+    def close(self):
+        pass
+
+    def dispose(self):
+        self._conn.close()
+
+
+# ============================================
+# ⏱️ 측정 도구
+# ============================================
+def summarize(op, latencies_sec, items_per_call=1):
+    lat = np.asarray(latencies_sec, dtype=np.float64)
+    total = lat.sum()
+    return {
+        "op": op,
+        "calls": int(len(lat)),
+        "items_per_sec": round(len(lat) * items_per_call / total, 1) if total > 0 else None,
+        "p50_us": round(float(np.percentile(lat, 50)) * 1e6, 2),
+        "p95_us": round(float(np.percentile(lat, 95)) * 1e6, 2),
+        "p99_us": round(float(np.percentile(lat, 99)) * 1e6, 2),
+    }
+
+
+def time_calls(op, func, args_list):
+    """args_list의 각 인자로 func를 한 번씩 호출하며 호출별 지연을 잽니다."""
+    latencies = []
+    perf = time.perf_counter
+    for args in args_list:
+        start = perf()
+        func(*args)
+        latencies.append(perf() - start)
+    return summarize(op, latencies)
+
+
+def time_batch(op, func, n_items, repeats):
+    """func() 한 번이 n_items개를 처리하는 일괄 작업을 repeats번 잽니다."""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return summarize(op, latencies, n_items)
+
+
+def make_rules(signal_names, count, rng):
+    """시그널 이름에 종류별 규칙을 고르게 섞어 count개 만듭니다 (합성 값 0~255 기준)."""
+    params = {
+        "threshold": {"op": ">", "limit": 250},
+        "range": {"low": 1, "high": 254},
+        "rate": {"max_rate": 1e6},
+        "stuck": {"duration": 5.0},
+        "timeout": {"timeout": 1.0},
+    }
+    kinds = list(RULE_TYPES)
+    picks = signal_names[rng.integers(len(signal_names), size=count)]
+    return [RULE_TYPES[kinds[i % len(kinds)]](name, **params[kinds[i % len(kinds)]]) for i, name in enumerate(picks)]
+
+
+def _sample_keywords(names, rng, count):
+    """실제 이름에서 잘라 낸 부분 문자열(2~8자)을 검색어로 씁니다."""
+    picks = names[rng.integers(len(names), size=count)]
+    keywords = []
+    for name in picks:
+        length = int(rng.integers(2, 9))
+        start = int(rng.integers(0, max(1, len(name) - length)))
+        keywords.append(name[start:start + length])
+    return keywords
+
+
+# ============================================
+# 🏁 벤치마크 실행
+# ============================================
+def time_db_lookups(analyze_logic, messages, signals, code_sample, workdir):
+    """analyze_logic.get_conn을 SQLite 연결로 바꿔 끼우고 실제 조회 코드를 측정합니다."""
+    results = []
+    db_path = os.path.join(workdir, f"bench_{len(signals)}.sqlite")
+    seed_sqlite(db_path, messages, signals)
+    conn = SQLiteConnection(db_path, analyze_logic.DB_NAME)
+    original_get_conn = analyze_logic.get_conn
+    analyze_logic.get_conn = lambda: conn
+    try:
+        analyze_logic.code_index.invalidate()
+        results.append(time_batch("OriginalCodeIndex.load", analyze_logic.code_index.load, len(signals), 1))
+        results.append(time_calls("get_can_id_by_original_code (hit)", analyze_logic.get_can_id_by_original_code, code_sample))
+        misses = [(f"SG_ NoSuch_{i} : 0|1@little_endian 1 0",) for i in range(min(len(code_sample), LIKE_SAMPLES))]
+        results.append(time_calls("get_can_id_by_original_code (miss)", analyze_logic.get_can_id_by_original_code, misses))
+        query = (
+            "SELECT s.*, m.name AS message_name, m.frame_id AS frame_id, m.dlc AS dlc "
+            "FROM signals s JOIN messages m ON s.message_id = m.id"
+        )
+        results.append(time_batch("catalog SELECT (read_sql)", lambda: pd.read_sql(query, conn._conn), len(signals), 1))
+    finally:
+        analyze_logic.get_conn = original_get_conn
+        analyze_logic.code_index.invalidate()
+        conn.dispose()
+    return results
+
+
+def load_db_module():
+    """analyze_logic을 불러옵니다. DB 드라이버가 없으면 None (DB 항목은 건너뜀)."""
+    try:
+        import analyze_logic
+    except ImportError as e:
+        print(f"⚠️ analyze_logic을 불러올 수 없어 DB 관련 항목은 건너뜁니다: {e}")
+        return None
+    return analyze_logic
+
+
+def run_size(n_signals, samples, repeats, seed, workdir, dbc_path=None, analyze_logic=None):
+    rng = np.random.default_rng(seed + 1)
+    messages, signals = generate_catalog(n_signals, seed)
+    codes = signals["original_code"].to_numpy()
+    names = signals["name"].to_numpy()
+    n_calls = min(samples, n_signals)
+    code_sample = [(c,) for c in codes[rng.integers(n_signals, size=n_calls)]]
+    results = []
+
+    # --- 파싱/마스크 ---
+    results.append(time_calls("parse_sg_bits", parse_sg_bits, code_sample))
+    if analyze_logic is not None:
+        results.append(time_calls(
+            "parse_bits_from_original_code", analyze_logic.parse_bits_from_original_code, code_sample
+        ))
+        bits = [analyze_logic.parse_bits_from_original_code(c) for (c,) in code_sample]
+        results.append(time_calls("calculate_bits", analyze_logic.calculate_bits, bits))
+    big = is_big_endian(signals["byte_order"].to_numpy())
+    results.append(time_batch(
+        "compute_byte_masks (catalog)",
+        lambda: compute_byte_masks(signals["start_bit"], signals["bit_length"], big, 8),
+        n_signals, repeats,
+    ))
+    if dbc_path:
+        write_dbc(messages, signals, dbc_path)
+        results.append(time_batch(
+            "iter_dbc_signals (file)", lambda: sum(1 for _ in iter_dbc_signals(dbc_path)), n_signals, repeats
+        ))
+
+    # --- 분류 ---
+    name_series = signals["name"]
+    results.append(time_batch("classify_signals (catalog)", lambda: classify_signals(name_series), n_signals, repeats))
+
+    # --- 검색: str.contains 전체 스캔 vs 트라이그램 색인 ---
+    keywords = _sample_keywords(names, rng, min(n_calls, 200))
+    results.append(time_calls(
+        "str.contains search",
+        lambda k: name_series.str.contains(k, case=False, regex=False).to_numpy().nonzero(),
+        [(k,) for k in keywords],
+    ))
+    index_holder = {}
+    results.append(time_batch(
+        "TrigramIndex build", lambda: index_holder.update(index=TrigramIndex(name_series)), n_signals, 1
+    ))
+    index = index_holder["index"]
+    results.append(time_calls("TrigramIndex.search", index.search, [(k,) for k in keywords]))
+    results.append(time_calls("TrigramIndex.fuzzy_search", index.fuzzy_search, [(k[::-1],) for k in keywords[:100]]))
+
+    # --- 디코딩 ---
+    df_plan = signals.merge(messages[["id", "frame_id"]], left_on="message_id", right_on="id", suffixes=("", "_m"))
+    plan = DecodePlan(df_plan)
+    n_frames = DECODE_FRAMES
+    frame_ids = messages["frame_id"].to_numpy()[rng.integers(len(messages), size=n_frames)]
+    payloads = rng.integers(0, 256, size=(n_frames, 8), dtype=np.uint8)
+    timestamps = np.arange(n_frames) * 1e-3
+    results.append(time_batch(
+        "decode_frames", lambda: decode_frames(plan, timestamps, frame_ids, payloads), n_frames, repeats
+    ))
+
+    # --- 디코딩: 코드 생성 디코더 vs 범용 경로 ---
+    compiled = CompiledDecoder(plan)
+    results.append(time_batch("CompiledDecoder.compile_all", compiled.compile_all, len(plan.frames), 1))
+    frame_sample = [(int(f), bytes(p)) for f, p in zip(frame_ids[:n_calls], payloads[:n_calls])]
+    results.append(time_calls(
+        "decode_frames (1 frame)",
+        lambda f, p: decode_frames(plan, timestamps[:1], [f], np.frombuffer(p, dtype=np.uint8)[None, :]),
+        frame_sample,
+    ))
+    results.append(time_calls("CompiledDecoder.decode (1 frame)", compiled.decode, frame_sample))
+    hot_ids = messages["frame_id"].to_numpy()[:HOT_FRAME_IDS]
+    batch_ids = hot_ids[rng.integers(len(hot_ids), size=LIVE_BATCH_FRAMES)]
+    batch_payloads = payloads[:LIVE_BATCH_FRAMES]
+    batch_ts = timestamps[:LIVE_BATCH_FRAMES]
+    results.append(time_batch(
+        f"decode_frames ({LIVE_BATCH_FRAMES}-frame batch)",
+        lambda: decode_frames(plan, batch_ts, batch_ids, batch_payloads), LIVE_BATCH_FRAMES, n_calls // 10,
+    ))
+    results.append(time_batch(
+        f"CompiledDecoder ({LIVE_BATCH_FRAMES}-frame batch)",
+        lambda: compiled.decode_frames(batch_ts, batch_ids, batch_payloads), LIVE_BATCH_FRAMES, n_calls // 10,
+    ))
+    results.append(time_batch(
+        "CompiledDecoder.decode_frames",
+        lambda: compiled.decode_frames(timestamps, frame_ids, payloads), n_frames, repeats,
+    ))
+
+    # --- 고장 규칙 엔진: 실시간 배치마다 update + poll ---
+    hot_names = df_plan.loc[df_plan["frame_id"].isin(hot_ids), "name"].to_numpy()
+    engine = FaultEngine(make_rules(hot_names, FAULT_RULES, rng), plan)
+    n_batches = max(n_calls // 10, 1)
+    decoded_batches = []
+    for b in range(n_batches):
+        ids = hot_ids[rng.integers(len(hot_ids), size=LIVE_BATCH_FRAMES)]
+        ts = b * 0.02 + np.arange(LIVE_BATCH_FRAMES) * (0.02 / LIVE_BATCH_FRAMES)
+        decoded_batches.append(decode_frames(plan, ts, ids, payloads[rng.integers(n_frames, size=LIVE_BATCH_FRAMES)]))
+    batch_iter = iter(decoded_batches)
+
+    def fault_step():
+        decoded = next(batch_iter)
+        engine.update(decoded)
+        engine.poll(max(ts[-1] for ts, _ in decoded.values()))
+
+    results.append(time_batch(
+        f"FaultEngine ({FAULT_RULES} rules, {LIVE_BATCH_FRAMES}-frame batch)",
+        fault_step, LIVE_BATCH_FRAMES, n_batches,
+    ))
+
+    # --- DB 조회 (SQLite 대용) ---
+    if analyze_logic is not None:
+        results.extend(time_db_lookups(analyze_logic, messages, signals, code_sample, workdir))
+
+    for r in results:
+        r["signals"] = n_signals
+    return results
+
+
+def print_results(results):
+    print(f"{'op':<44}{'calls':>7}{'items/s':>15}{'p50 us':>12}{'p95 us':>12}{'p99 us':>12}")
+    for r in results:
+        rate = f"{r['items_per_sec']:,.0f}" if r["items_per_sec"] else "-"
+        print(f"{r['op']:<44}{r['calls']:>7}{rate:>15}{r['p50_us']:>12,.1f}{r['p95_us']:>12,.1f}{r['p99_us']:>12,.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 카탈로그 기반 성능 측정")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="시그널 수 (1k~1M)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="호출 단위 측정 표본 수")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="일괄 작업 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--dbc", help="합성 DBC 파일 경로 (지정 시 DBC 파싱도 측정)")
+    args = parser.parse_args(argv)
+
+    analyze_logic = load_db_module()
+    all_results = []
+    with tempfile.TemporaryDirectory(prefix="can_bench_") as workdir:
+        for n in args.sizes:
+            print(f"\n=== 시그널 {n:,}개 ===")
+            results = run_size(n, args.samples, args.repeats, args.seed, workdir, args.dbc, analyze_logic)
+            print_results(results)
+            all_results.extend(results)
+
+    if args.json:
+        report = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "results": all_results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"\n결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# bit_mask.py
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# ============================================
+# ⚙️ 설정
+# ============================================
+CAN_PAYLOAD_BYTES = 8
+CANFD_PAYLOAD_BYTES = 64
+CANFD_DLC_SIZES = (8, 12, 16, 20, 24, 32, 48, 64)
+
+_BIG_ENDIAN_NAMES = {"0", "big_endian", "big", "motorola"}
+
+
+def is_big_endian(byte_order):
+    """byte_order 값(스칼라/배열)이 Motorola(@0)인지 판별합니다."""
+    if np.ndim(byte_order) == 0:
+        return str(byte_order).strip().lower() in _BIG_ENDIAN_NAMES
+    orders = np.asarray(byte_order).astype(str)
+    return np.isin(np.char.lower(np.char.strip(orders)), list(_BIG_ENDIAN_NAMES))
+
+
+def motorola_msb_position(start_bit):
+    """Motorola 시작 비트(MSB, 톱니형 번호)를 '큰 자리부터 센' 선형 위치로 바꿉니다."""
+    start_bit = np.asarray(start_bit, dtype=np.int64)
+    return (start_bit // 8) * 8 + (7 - start_bit % 8)
+
+
+# ============================================
+# 🧮 일괄 마스크 계산
+# ============================================
+def compute_byte_masks(start_bits, bit_lengths, big_endian=False, payload_bytes=CANFD_PAYLOAD_BYTES):
+    """모든 시그널의 바이트 마스크를 한 번에 계산합니다.
+
+    반환값은 (시그널 수, payload_bytes) 크기의 uint8 배열이며,
+    payload 범위를 벗어나는 비트는 잘려 나갑니다.
+    """
+    start = np.asarray(start_bits, dtype=np.int64).reshape(-1, 1)
+    length = np.asarray(bit_lengths, dtype=np.int64).reshape(-1, 1)
+    big = np.broadcast_to(np.asarray(big_endian, dtype=bool), start.shape[:1]).reshape(-1, 1)
+
+    # Intel은 LSB부터, Motorola는 MSB부터 선형으로 이어진 비트 구간 [lo, hi)
+    lo = np.where(big, motorola_msb_position(start), start)
+    hi = lo + length
+
+    byte_lo = np.arange(payload_bytes, dtype=np.int64).reshape(1, -1) * 8
+    a = np.maximum(lo, byte_lo)
+    b = np.minimum(hi, byte_lo + 8)
+    count = np.clip(b - a, 0, 8)
+
+    # 바이트 안에서의 시프트: Intel은 아래 비트부터, Motorola는 위 비트부터 채움
+    shift = np.where(big, byte_lo + 8 - b, a - byte_lo)
+    shift = np.where(count > 0, shift, 0)
+    masks = ((1 << count) - 1) << shift
+    return masks.astype(np.uint8)
+
+
+def masks_to_uint64(masks):
+    """(N, 8 이상) 바이트 마스크의 앞 8바이트를 little-endian uint64로 봅니다."""
+    head = np.ascontiguousarray(masks[:, :CAN_PAYLOAD_BYTES])
+    return head.view("<u8").reshape(-1)
+
+
+def payload_size_for(mask_bytes):
+    """마스크가 들어가는 최소 CAN/CAN FD 페이로드 크기(바이트)를 반환합니다."""
+    used = np.flatnonzero(np.asarray(mask_bytes))
+    last = int(used[-1]) + 1 if used.size else 0
+    for size in CANFD_DLC_SIZES:
+        if last <= size:
+            return size
+    return CANFD_PAYLOAD_BYTES
+
+
+# ============================================
+# 🗂️ 카탈로그 전체 마스크 테이블 (캐시)
+# ============================================
+class MaskTable:
+    def __init__(self, df_signals):
+        start = df_signals["start_bit"].to_numpy(dtype=np.int64)
+        length = df_signals["bit_length"].to_numpy(dtype=np.int64)
+        if "byte_order" in df_signals:
+            big = is_big_endian(df_signals["byte_order"].to_numpy())
+        else:
+            big = np.zeros(len(start), dtype=bool)
+
+        self.masks = compute_byte_masks(start, length, big)
+        self.row_by_id = {}
+        if "id" in df_signals:
+            self.row_by_id = {sid: i for i, sid in enumerate(df_signals["id"].tolist())}
+        self.row_by_layout = {
+            key: i
+            for i, key in enumerate(
+                zip(df_signals["name"].tolist(), start.tolist(), length.tolist())
+            )
+        }
+        self._u64 = None
+
+    def __len__(self):
+        return len(self.masks)
+
+    def get(self, signal_id):
+        """signal id로 64바이트 마스크를 반환합니다. 없으면 None."""
+        row = self.row_by_id.get(signal_id)
+        return None if row is None else self.masks[row]
+
+    def find(self, name, start_bit, bit_length):
+        """(이름, 시작 비트, 길이)가 같은 시그널의 마스크를 찾습니다. 없으면 None."""
+        row = self.row_by_layout.get((name, start_bit, bit_length))
+        return None if row is None else self.masks[row]
+
+    def as_uint64(self):
+        """클래식 CAN(8바이트) 마스크를 uint64 배열로 반환합니다."""
+        if self._u64 is None:
+            self._u64 = masks_to_uint64(self.masks)
+        return self._u64
+
+
+_MASK_CACHE = {}
+
+
+def _layout_fingerprint(df_signals):
+    """마스크 계산에 쓰이는 컬럼만으로 카탈로그 지문을 만듭니다.
+
+    MaskTable.masks는 행 위치로 찾으므로 행 순서가 바뀌어도 지문이 달라지도록
+    행 해시를 순서대로 이어 SHA-1을 냅니다.
+    """
+    cols = [c for c in ("id", "name", "start_bit", "bit_length", "byte_order") if c in df_signals]
+    row_hash = pd.util.hash_pandas_object(df_signals[cols], index=False).to_numpy()
+    h = hashlib.sha1(repr(cols).encode("utf-8"))
+    h.update(np.ascontiguousarray(row_hash).tobytes())
+    return len(df_signals), h.hexdigest()
+
+
+def get_mask_table(df_signals):
+    """df_all에 대한 MaskTable을 반환합니다. 레이아웃이 같으면 캐시를 재사용합니다."""
+    key = _layout_fingerprint(df_signals)
+    table = _MASK_CACHE.get(key)
+    if table is None:
+        _MASK_CACHE.clear()  # 카탈로그는 하나만 유지
+        table = MaskTable(df_signals)
+        _MASK_CACHE[key] = table
+    return table
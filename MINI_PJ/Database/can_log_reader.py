@@ -0,0 +1,331 @@
+# can_log_reader.py
+
+import mmap
+import re
+from collections import namedtuple
+
+import numpy as np
+
+# ============================================
+# 📦 청크 레코드 (컬럼 단위 NumPy 배열 묶음)
+# ============================================
+LogChunk = namedtuple("LogChunk", "timestamp channel frame_id is_extended dlc payload")
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024  # 16MB 단위로 잘라서 처리
+
+# 16진수 문자 → 니블 값 변환표 (그 외 문자는 0)
+_HEX_LUT = np.zeros(256, dtype=np.uint8)
+for _c in b"0123456789":
+    _HEX_LUT[_c] = _c - ord("0")
+for _c in b"abcdef":
+    _HEX_LUT[_c] = _c - ord("a") + 10
+for _c in b"ABCDEF":
+    _HEX_LUT[_c] = _c - ord("A") + 10
+
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+_LF, _CR, _SP, _TAB = ord("\n"), ord("\r"), ord(" "), ord("\t")
+_LPAREN, _RPAREN, _DOT, _HASH = ord("("), ord(")"), ord("."), ord("#")
+
+
+# ============================================
+# 🧮 바이트 배열 벡터 연산 도우미
+# ============================================
+def _gather(buf, start, length, width):
+    """각 행의 [start, start+length) 구간을 (N, width) 행렬로 모읍니다."""
+    cols = np.arange(width)
+    idx = np.minimum(start[:, None] + cols, len(buf) - 1)
+    valid = cols < length[:, None]
+    return buf[idx], valid
+
+
+def _next_pos(positions, after):
+    """각 after 이후에 처음 나오는 구분자 위치 (없으면 sentinel)."""
+    return positions[np.searchsorted(positions, after)]
+
+
+def _hex_to_int(buf, start, length):
+    width = int(length.max()) if len(length) else 0
+    chars, valid = _gather(buf, start, length, width)
+    return _hex_matrix_to_int(chars, valid, length)
+
+
+def _hex_matrix_to_int(chars, valid, length):
+    width = chars.shape[1]
+    nib = _HEX_LUT[chars].astype(np.int64)
+    shift = 4 * (length[:, None] - 1 - np.arange(width))
+    return np.where(valid, nib << np.maximum(shift, 0), 0).sum(axis=1)
+
+
+def _dec_to_int(buf, start, length):
+    width = int(length.max()) if len(length) else 0
+    chars, valid = _gather(buf, start, length, width)
+    digit = chars.astype(np.int64) - ord("0")
+    power = np.clip(length[:, None] - 1 - np.arange(width), 0, 18)
+    return np.where(valid, digit * _POW10[power], 0).sum(axis=1)
+
+
+def _hex_to_bytes(buf, start, n_chars, width=None):
+    """16진 문자열 구간을 (N, width) uint8 payload 행렬로 변환합니다 (width 없으면 8 또는 64)."""
+    if width is None:
+        width = 8 if not len(n_chars) or n_chars.max() // 2 <= 8 else 64
+    n_chars = np.minimum(n_chars, width * 2)
+    n_bytes = n_chars // 2
+    chars, valid = _gather(buf, start, n_chars, width * 2)
+    nib = np.where(valid, _HEX_LUT[chars], 0).astype(np.uint8)
+    return (nib[:, 0::2] << 4) | nib[:, 1::2], n_bytes.astype(np.uint8)
+
+
+# ============================================
+# 📜 candump -l 형식: (1436509052.249713) can0 123#DEADBEEF
+# ============================================
+def parse_candump_block(block: bytes, width=None):
+    """candump 로그 블록을 줄 단위 파이썬 객체 없이 컬럼 배열로 파싱합니다.
+
+    width를 주면 payload 행렬 폭을 고정합니다 (없으면 블록 안의 최대 길이에 따라 8 또는 64).
+    """
+    buf = np.frombuffer(block, dtype=np.uint8)
+    if not len(buf):
+        return _empty_chunk(width)
+    sentinel = np.array([len(buf)])
+
+    nl = np.flatnonzero(buf == _LF)
+    if not len(nl) or nl[-1] != len(buf) - 1:
+        nl = np.append(nl, len(buf))
+    starts = np.concatenate(([0], nl[:-1] + 1))
+    ends = nl.copy()
+    has_cr = (ends > starts) & (buf[np.maximum(ends - 1, 0)] == _CR)
+    ends -= has_cr
+
+    ok = (ends > starts) & (buf[np.minimum(starts, len(buf) - 1)] == _LPAREN)
+    starts, ends = starts[ok], ends[ok]
+
+    spaces = np.concatenate((np.flatnonzero(buf == _SP), sentinel))
+    rparen = _next_pos(np.concatenate((np.flatnonzero(buf == _RPAREN), sentinel)), starts)
+    dot = _next_pos(np.concatenate((np.flatnonzero(buf == _DOT), sentinel)), starts)
+    iface_end = _next_pos(spaces, rparen + 2)
+    hashes = np.concatenate((np.flatnonzero(buf == _HASH), sentinel))
+    hash_pos = _next_pos(hashes, iface_end)
+
+    ok = (dot < rparen) & (rparen < ends) & (iface_end < hash_pos) & (hash_pos < ends)
+    starts, ends, dot, rparen, iface_end, hash_pos = (
+        a[ok] for a in (starts, ends, dot, rparen, iface_end, hash_pos)
+    )
+
+    # 타임스탬프: 정수부 + 소수부를 각각 정수로 읽어 합칩니다.
+    sec = _dec_to_int(buf, starts + 1, dot - starts - 1)
+    frac_len = rparen - dot - 1
+    frac = _dec_to_int(buf, dot + 1, frac_len)
+    timestamp = sec + frac / _POW10[np.clip(frac_len, 0, 18)]
+
+    # 채널(인터페이스 이름)은 최대 16바이트 고정폭 문자열로 보관
+    chan_len = np.minimum(iface_end - rparen - 2, 16)
+    chars, valid = _gather(buf, rparen + 2, chan_len, 16)
+    channel = np.ascontiguousarray(np.where(valid, chars, 0)).view("S16").reshape(-1)
+
+    id_len = hash_pos - iface_end - 1
+    frame_id = _hex_to_int(buf, iface_end + 1, id_len)
+
+    # CAN FD: 123##<flags><data>
+    is_fd = buf[np.minimum(hash_pos + 1, len(buf) - 1)] == _HASH
+    data_start = hash_pos + 1 + is_fd * 2
+    data_end = np.minimum(_next_pos(spaces, data_start), ends)
+    payload, dlc = _hex_to_bytes(buf, data_start, np.maximum(data_end - data_start, 0), width)
+
+    return LogChunk(timestamp, channel, frame_id, id_len > 3, dlc, payload)
+
+
+# ============================================
+# 📜 Vector ASC 형식 (클래식 CAN + CANFD 라인)
+# ============================================
+#   클래식: 0.012345 1  1A0x  Rx  d 8 01 02 03 04 05 06 07 08  Length = ...
+#   CANFD : 0.012345 CANFD 1 Rx 1A0x [이름] <BRS> <ESI> <DLC> <길이> 01 02 ...
+_HEX_VALID = np.zeros(256, dtype=bool)
+_HEX_VALID[list(b"0123456789abcdefABCDEF")] = True
+_DIGIT_VALID = np.zeros(256, dtype=bool)
+_DIGIT_VALID[list(b"0123456789")] = True
+_NAME_START = np.zeros(256, dtype=bool)
+_NAME_START[list(b"_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")] = True
+_ASC_MAX_TOKEN = 32  # 타임스탬프/ID/채널 토큰 검사 시 보는 최대 글자 수
+
+
+def _tokenize(buf):
+    """공백/탭/CR/LF로 나뉜 토큰 위치를 구하고 줄별 첫 토큰 번호와 토큰 수를 셉니다."""
+    sep = (buf == _SP) | (buf == _TAB) | (buf == _CR) | (buf == _LF)
+    word = ~sep
+    edge = np.diff(np.concatenate(([False], word, [False])).astype(np.int8))
+    tok_start = np.flatnonzero(edge == 1)
+    tok_len = np.flatnonzero(edge == -1) - tok_start
+    nl = np.flatnonzero(buf == _LF)
+    tok_line = np.searchsorted(nl, tok_start)
+    n_lines = len(nl) + 1
+    first = np.searchsorted(tok_line, np.arange(n_lines))
+    count = np.diff(np.append(first, len(tok_start)))
+    return tok_start, tok_len, first, count
+
+
+class _Tokens:
+    """줄마다 k번째 토큰의 (시작, 길이)를 꺼내는 도우미 (없는 토큰은 길이 0)."""
+
+    def __init__(self, buf, tok_start, tok_len, first, count):
+        self.buf = buf
+        self.tok_start = np.append(tok_start, len(buf))
+        self.tok_len = np.append(tok_len, 0)
+        self.first = first
+        self.count = count
+
+    def get(self, k):
+        k = np.broadcast_to(k, self.first.shape)
+        idx = np.where(k < self.count, self.first + k, len(self.tok_start) - 1)
+        return self.tok_start[idx], self.tok_len[idx]
+
+    def chars(self, k, width=None):
+        start, length = self.get(k)
+        if width is None:
+            # 실제로 가장 긴 토큰까지만 모읍니다 (최대 _ASC_MAX_TOKEN자).
+            width = min(_ASC_MAX_TOKEN, int(length.max()) if len(length) else 0)
+        chars, valid = _gather(self.buf, start, np.minimum(length, width), width)
+        return chars, valid, start, length
+
+    def all_in(self, k, table, trim=0):
+        """k번째 토큰의 (끝 trim글자를 뺀) 모든 글자가 table에 속하는지."""
+        chars, valid, _, length = self.chars(k)
+        valid &= np.arange(chars.shape[1]) < (length - trim)[:, None]
+        return (length - trim > 0) & (length <= _ASC_MAX_TOKEN) & (table[chars] | ~valid).all(axis=1)
+
+    def equals(self, k, word):
+        word = np.frombuffer(word, dtype=np.uint8)
+        chars, _, _, length = self.chars(k, len(word))
+        return (length == len(word)) & (chars == word).all(axis=1)
+
+    def select(self, rows):
+        self.first, self.count = self.first[rows], self.count[rows]
+
+
+def parse_asc_block(block: bytes, width=None):
+    """ASC 로그 블록을 토큰 위치 배열로 나눠 줄 단위 파이썬 객체 없이 컬럼 배열로 변환합니다.
+
+    width를 주면 payload 행렬 폭을 고정합니다 (없으면 블록 안의 최대 길이에 따라 8 또는 64).
+    DLC만큼 데이터 바이트가 없는(잘린) 줄은 버립니다.
+    """
+    buf = np.frombuffer(block, dtype=np.uint8)
+    if not len(buf):
+        return _empty_chunk(width)
+    tok = _Tokens(buf, *_tokenize(buf))
+
+    # 타임스탬프(숫자.숫자)로 시작하고 클래식(채널 번호) 또는 CANFD인 줄만 남깁니다.
+    ts_chars, ts_valid, _, ts_len = tok.chars(0)
+    is_dot = (ts_chars == _DOT) & ts_valid
+    ts_ok = ((ts_len > 2) & (ts_len <= _ASC_MAX_TOKEN) & (is_dot.sum(axis=1) == 1)
+             & (_DIGIT_VALID[ts_chars] | is_dot | ~ts_valid).all(axis=1))
+    is_fd = tok.equals(1, b"CANFD")
+    ok = ts_ok & (tok.count >= 6) & (is_fd | tok.all_in(1, _DIGIT_VALID))
+    rows = np.flatnonzero(ok)
+    tok.select(rows)
+    is_fd = is_fd[rows]
+
+    # CANFD 줄은 채널/방향/ID가 한 칸씩 밀리고, ID 뒤에 심볼 이름이 올 수 있습니다.
+    chan_k = np.where(is_fd, 2, 1)
+    id_k = np.where(is_fd, 4, 2)
+    name_start, _ = tok.get(id_k + 1)
+    has_name = is_fd & _NAME_START[buf[np.minimum(name_start, len(buf) - 1)]]
+    len_k = np.where(is_fd, 8 + has_name, 5)  # 데이터 바이트 수 (클래식은 DLC)
+    data_k = len_k + 1
+
+    len_start, len_len = tok.get(len_k)
+    ok = (tok.equals(3, b"Rx") | tok.equals(3, b"Tx")) & tok.all_in(len_k, _DIGIT_VALID) & (len_len <= 3)
+    ok &= np.where(is_fd, tok.all_in(chan_k, _DIGIT_VALID) & tok.all_in(len_k - 1, _HEX_VALID),
+                   tok.equals(4, b"d"))
+    id_start, id_len = tok.get(id_k)
+    id_x = (id_len > 0) & (buf[np.minimum(id_start + id_len - 1, len(buf) - 1)] == ord("x"))
+    ok &= tok.all_in(id_k, _HEX_VALID, trim=id_x.astype(np.int64))
+
+    counts = np.where(ok, _dec_to_int(buf, len_start, np.where(ok, len_len, 0)), 0)
+    ok &= tok.count >= data_k + counts  # 잘린 줄 (DLC보다 데이터가 적음)
+    rows = np.flatnonzero(ok)
+    tok.select(rows)
+    if not len(rows):
+        return _empty_chunk(width)
+    is_fd, chan_k, id_k, data_k, counts = (a[rows] for a in (is_fd, chan_k, id_k, data_k, counts))
+    id_start, id_len, id_x = id_start[rows], id_len[rows], id_x[rows]
+
+    # 데이터 바이트 토큰(2자리 16진)을 한 번에 모아 변환합니다.
+    offsets = np.cumsum(counts) - counts
+    flat_row = np.repeat(np.arange(len(rows)), counts)
+    flat_col = np.arange(int(counts.sum())) - np.repeat(offsets, counts)
+    flat_tok = tok.first[flat_row] + data_k[flat_row] + flat_col
+    d_start, d_len = tok.tok_start[flat_tok], tok.tok_len[flat_tok]
+    hi, lo = buf[d_start], buf[np.minimum(d_start + 1, len(buf) - 1)]
+    bad = (d_len != 2) | ~_HEX_VALID[hi] | ~_HEX_VALID[lo]
+    good_row = np.bincount(flat_row[bad], minlength=len(rows)) == 0
+
+    if width is None:
+        width = 8 if counts.max() <= 8 else 64
+    keep = good_row[flat_row] & (flat_col < width)
+    payload = np.zeros((len(rows), width), dtype=np.uint8)
+    payload[flat_row[keep], flat_col[keep]] = (_HEX_LUT[hi[keep]] << 4) | _HEX_LUT[lo[keep]]
+
+    ts_start, ts_len = tok.get(0)
+    dot = _next_pos(np.flatnonzero(buf == _DOT), ts_start)
+    frac_len = ts_start + ts_len - dot - 1
+    timestamp = (_dec_to_int(buf, ts_start, dot - ts_start)
+                 + _dec_to_int(buf, dot + 1, frac_len) / _POW10[np.clip(frac_len, 0, 18)])
+
+    chan_start, chan_len = tok.get(chan_k)
+    chars, valid = _gather(buf, chan_start, np.minimum(chan_len, 16), 16)
+    channel = np.ascontiguousarray(np.where(valid, chars, 0)).view("S16").reshape(-1)
+    frame_id = _hex_to_int(buf, id_start, id_len - id_x)
+    dlc = np.minimum(counts, width).astype(np.uint8)
+
+    return LogChunk(*(a[good_row] for a in (timestamp, channel, frame_id, id_x, dlc, payload)))
+
+
+def _empty_chunk(width=None):
+    return LogChunk(
+        np.empty(0, np.float64), np.empty(0, "S16"), np.empty(0, np.int64),
+        np.empty(0, bool), np.empty(0, np.uint8), np.empty((0, width or 8), np.uint8),
+    )
+
+
+# ============================================
+# 🚀 mmap 기반 청크 반복자
+# ============================================
+def detect_log_format(path):
+    """파일 앞부분으로 candump/asc 형식을 판별합니다."""
+    with open(path, "rb") as f:
+        head = f.read(4096)
+    if re.search(rb"^\(\d+\.\d+\)", head, re.M):
+        return "candump"
+    return "asc"
+
+
+def iter_log_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, fmt=None):
+    """로그 파일을 mmap 한 뒤 chunk_size 단위(줄 경계 정렬)로 파싱해 LogChunk를 yield 합니다.
+
+    파일 전체를 메모리에 올리지 않으므로 RAM보다 큰 로그도 스트리밍할 수 있습니다.
+    payload 폭은 8로 시작해, 8바이트를 넘는 CAN FD 프레임이 처음 나온 청크부터 64로 넓어지며
+    다시 좁아지지 않습니다 (파일을 미리 훑지 않고 청크마다 판단).
+    """
+    fmt = fmt or detect_log_format(path)
+    parse_block = parse_candump_block if fmt == "candump" else parse_asc_block
+
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # 빈 파일
+        with mm:
+            width = 8
+            size = len(mm)
+            pos = 0
+            while pos < size:
+                end = min(pos + chunk_size, size)
+                if end < size:
+                    nl = mm.find(b"\n", end)
+                    end = size if nl < 0 else nl + 1
+                # 64로 넓어진 뒤에는 고정, 그 전에는 블록 내용으로 8/64를 정합니다.
+                chunk = parse_block(mm[pos:end], width if width == 64 else None)
+                width = max(width, chunk.payload.shape[1])
+                pos = end
+                if len(chunk.timestamp):
+                    yield chunk
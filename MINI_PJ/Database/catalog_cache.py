@@ -0,0 +1,135 @@
+# catalog_cache.py
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+import pandas as pd
+
+from analyze_logic import get_catalog_fingerprint, load_and_process_data
+from signal_classifier import CATEGORY_RULES, DEFAULT_CATEGORY, ERROR_STATUS, NORMAL_STATUS, STATUS_RULES
+
+# ============================================
+# ⚙️ 스냅샷 경로 설정
+# ============================================
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+META_PATH = os.path.join(CACHE_DIR, "catalog_meta.json")
+
+try:
+    import pyarrow  # noqa: F401  (Feather 저장에 필요)
+
+    SNAPSHOT_FORMAT = "feather"
+except ImportError:
+    SNAPSHOT_FORMAT = "pickle"  # pyarrow가 없으면 표준 pickle로 대체
+
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, f"catalog.{SNAPSHOT_FORMAT}")
+SNAPSHOT_VERSION = 2  # 카탈로그 쿼리의 컬럼 구성이 바뀌면 올립니다 (2: messages.dlc 추가)
+
+# 잘린 파일/다른 버전 pandas로 만든 pickle 등에서 나는 예외 (스냅샷을 버리고 다시 만듭니다)
+SNAPSHOT_READ_ERRORS = (OSError, ValueError, EOFError, pickle.UnpicklingError,
+                        AttributeError, ImportError, KeyError, TypeError)
+
+
+def rules_signature():
+    """분류 규칙 테이블의 해시. 규칙이 바뀌면 저장된 Category/Status가 틀리므로 스냅샷을 다시 만듭니다."""
+    rules = (CATEGORY_RULES, STATUS_RULES, DEFAULT_CATEGORY, NORMAL_STATUS, ERROR_STATUS)
+    return hashlib.sha1(repr(rules).encode("utf-8")).hexdigest()
+
+
+# ============================================
+# 💾 스냅샷 저장/로드
+# ============================================
+def save_snapshot(df_all, fingerprint):
+    """분류까지 끝난 df_all을 로컬 파일로 저장합니다 (임시 파일 → 교체로 원자적 저장)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = SNAPSHOT_PATH + ".tmp"
+    if SNAPSHOT_FORMAT == "feather":
+        df_all.reset_index(drop=True).to_feather(tmp_path)
+    else:
+        df_all.to_pickle(tmp_path)
+    os.replace(tmp_path, SNAPSHOT_PATH)
+
+    meta = {
+        "fingerprint": fingerprint,
+        "version": SNAPSHOT_VERSION,
+        "rules": rules_signature(),
+        "format": SNAPSHOT_FORMAT,
+        "rows": len(df_all),
+        "rule_hits": df_all.attrs.get("rule_hits", {}),
+    }
+    with open(META_PATH, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def load_snapshot():
+    """저장된 스냅샷과 지문을 반환합니다. 없거나 읽을 수 없거나 분류 규칙이 바뀌었으면 (None, None)."""
+    try:
+        with open(META_PATH, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if (meta.get("format") != SNAPSHOT_FORMAT or meta.get("version") != SNAPSHOT_VERSION
+                or meta.get("rules") != rules_signature()):
+            return None, None
+        if SNAPSHOT_FORMAT == "feather":
+            df_all = pd.read_feather(SNAPSHOT_PATH)
+        else:
+            df_all = pd.read_pickle(SNAPSHOT_PATH)
+    except FileNotFoundError:
+        return None, None
+    except SNAPSHOT_READ_ERRORS as e:
+        print(f"스냅샷 로드 실패, DB에서 다시 만듭니다: {e}")
+        return None, None
+
+    df_all.attrs["rule_hits"] = meta.get("rule_hits", {})
+    return df_all, meta.get("fingerprint")
+
+
+# ============================================
+# 🚀 카탈로그 로드 (스냅샷 우선)
+# ============================================
+def _reload_from_db(df_cached=None):
+    """DB에서 다시 읽어 스냅샷을 저장합니다. 실패하면 df_cached(없으면 빈 DataFrame)."""
+    fingerprint = get_catalog_fingerprint()
+    df_all = load_and_process_data()
+    if df_all.empty:
+        # DB 로드 실패 시 오래된 스냅샷이라도 사용
+        return df_cached if df_cached is not None else df_all
+
+    if fingerprint is not None:
+        save_snapshot(df_all, fingerprint)
+    return df_all
+
+
+def _validate_snapshot(df_cached, cached_fingerprint, on_update):
+    """(검증 스레드) DB 지문을 스냅샷과 비교해 바뀌었으면 다시 읽고 on_update로 알립니다."""
+    refreshed = None
+    try:
+        fingerprint = get_catalog_fingerprint()
+        if fingerprint is not None and fingerprint != cached_fingerprint:
+            df_all = _reload_from_db(df_cached)
+            if df_all is not df_cached:
+                refreshed = df_all
+    finally:
+        if on_update is not None:
+            on_update(refreshed)
+
+
+def load_catalog(force_refresh=False, on_update=None):
+    """로컬 스냅샷이 있으면 DB에 접속하지 않고 바로 반환하고, 지문 확인은 백그라운드에서 합니다.
+
+    DB가 바뀌었으면 새 카탈로그를 읽어 스냅샷을 갱신한 뒤 on_update(df_all)을 부릅니다.
+    on_update는 검증이 끝나면 항상 한 번 불리며, 바뀐 것이 없으면(오프라인 포함) 인자는 None입니다.
+    스냅샷이 없거나 force_refresh면 DB에서 바로 읽습니다.
+    """
+    df_cached, cached_fingerprint = (None, None) if force_refresh else load_snapshot()
+    if df_cached is None:
+        df_all = _reload_from_db()
+        if on_update is not None:
+            on_update(None)
+        return df_all
+
+    threading.Thread(
+        target=_validate_snapshot, args=(df_cached, cached_fingerprint, on_update), daemon=True
+    ).start()
+    return df_cached
@@ -0,0 +1,350 @@
+# dbc_parser.py
+
+import re
+from collections import namedtuple
+
+# ============================================
+# 📦 레코드 정의 (가벼운 namedtuple)
+# ============================================
+Message = namedtuple("Message", "frame_id name dlc transmitter is_extended")
+Signal = namedtuple(
+    "Signal",
+    "frame_id name start_bit bit_length byte_order is_signed "
+    "factor offset min_val max_val unit receivers multiplexer",
+)
+ValueTable = namedtuple("ValueTable", "frame_id signal values")
+Attribute = namedtuple("Attribute", "name scope frame_id signal value")
+Comment = namedtuple("Comment", "scope frame_id signal text")
+
+# DB(signals.byte_order)와 같은 표기로 통일
+BYTE_ORDER_MAP = {
+    "1": "little_endian",
+    "0": "big_endian",
+    "little_endian": "little_endian",
+    "big_endian": "big_endian",
+}
+DEFAULT_BYTE_ORDER = "little_endian"  # '@' 표기가 없는 줄 (기존 split 파서와 같은 기본값)
+
+# DBC의 BO_ id는 29비트 확장 ID에 최상위 비트(0x80000000)를 붙여 씁니다.
+EXTENDED_ID_FLAG = 0x80000000
+CAN_ID_MASK = 0x1FFFFFFF
+
+# ============================================
+# 🔍 정규식 (모듈 로드 시 한 번만 컴파일)
+# ============================================
+_BO_RE = re.compile(r"BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)\s*(\S*)")
+
+# 표준 DBC('(0.1,0) [0|100] "unit" RX')와
+# DB 저장 형식('0|16@little_endian 0.1 0.0 Deg')을 모두 허용합니다.
+# '@바이트순서' 가 없는 줄('Name : 0|16')도 예전처럼 Intel(little_endian)으로 읽습니다.
+_SG_RE = re.compile(
+    r"""
+    (?:SG_\s+)?(?P<name>[^\s:]+)\s*(?P<mux>[Mm]\d*)?\s*:\s*
+    (?P<start>\d+)\s*\|\s*(?P<length>\d+)\s*
+    (?:@\s*(?P<order>little_endian|big_endian|[01])(?P<sign>[+-])?)?\s*
+    (?:\(\s*(?P<factor>[^,\s]+)\s*,\s*(?P<offset>[^)\s]+)\s*\)
+      |(?P<factor2>[-+.\deE]+)\s+(?P<offset2>[-+.\deE]+))?\s*
+    (?:\[\s*(?P<min>[^|\]]+)\|(?P<max>[^\]]+)\])?\s*
+    (?:"(?P<unit>[^"]*)"|(?P<unit2>[^\s,]+))?\s*
+    (?P<receivers>.*)$
+    """,
+    re.X,
+)
+# 표준 DBC 형식 전용 고속 경로 ('(factor,offset)'이 있는 줄)
+_SG_FAST_RE = re.compile(
+    r'SG_ +(\w+) *([Mm]\d*)? *: *(\d+)\|(\d+)@([01])([+-]) *'
+    r'\(([^,)]+),([^)]+)\) *\[([^|]+)\|([^\]]+)\] *"([^"]*)" *(.*)'
+)
+_MUX_RE = re.compile(r"[Mm]\d*")
+_VAL_RE = re.compile(r'VAL_\s+(\d+)\s+(\w+)\s+(.*?)\s*;', re.S)
+_VAL_PAIR_RE = re.compile(r'(-?\d+)\s+"([^"]*)"')
+_BA_RE = re.compile(
+    r'BA_\s+"([^"]+)"\s+(?:(BU_|BO_|SG_|EV_)\s+(\S+)\s+(?:(\w+)\s+)?)?(.*?)\s*;',
+    re.S,
+)
+_CM_RE = re.compile(
+    r'CM_\s+(?:(BU_|BO_|SG_|EV_)\s+(\S+)\s+(?:(\w+)\s+)?)?"(.*)"\s*;', re.S
+)
+
+
+def _to_float(text, default=0.0):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return default
+
+
+def _split_id(raw_id):
+    """DBC id → (frame_id, is_extended). 확장 ID 표시 비트를 떼어 로그의 29비트 ID와 맞춥니다."""
+    return raw_id & CAN_ID_MASK, bool(raw_id & EXTENDED_ID_FLAG)
+
+
+# ============================================
+# 🛠️ 단일 라인 파서
+# ============================================
+def parse_sg_bits(line: str):
+    """SG_ 한 줄에서 (start_bit, bit_length)만 꺼냅니다. 형식이 맞지 않으면 None을 반환합니다.
+
+    코드 분석 탭처럼 비트 위치만 필요할 때 쓰는 split 경로이며,
+    공백이 섞인 '0 | 16'이나 '@'가 없는 줄은 parse_sg_line으로 넘깁니다.
+    """
+    head, sep, rest = line.partition(":")
+    if sep and head and not head.isspace():
+        start, sep, length = rest.partition("@")[0].strip().partition("|")
+        if sep and start.isdecimal() and length.isdecimal():
+            return int(start), int(length)
+    sig = parse_sg_line(line)
+    return None if sig is None else (sig.start_bit, sig.bit_length)
+
+
+def _split_sg(line: str, frame_id):
+    """DB 저장 형식('Name : 0|16@little_endian 0.1 0.0 Deg')을 공백 기준 split으로 파싱합니다.
+
+    모양이 다른 줄(따옴표 단위, '0 | 16' 등)은 None을 반환해 정규식 경로로 넘깁니다.
+    """
+    head, sep, rest = line.partition(":")
+    if not sep:
+        return None
+    names = head.split()
+    if names and names[0] == "SG_":
+        del names[0]
+    if len(names) == 1:
+        name, mux = names[0], None
+    elif len(names) == 2 and _MUX_RE.fullmatch(names[1]):
+        name, mux = names
+    else:
+        return None
+
+    parts = rest.split()
+    if not parts:
+        return None
+    bits, at, order = parts[0].partition("@")
+    start, bar, length = bits.partition("|")
+    if not (bar and start.isdecimal() and length.isdecimal()):
+        return None
+    sign = None
+    if at:
+        if order[-1:] in ("+", "-"):
+            order, sign = order[:-1], order[-1]
+        byte_order = BYTE_ORDER_MAP.get(order)
+        if byte_order is None:
+            return None
+    else:
+        byte_order = DEFAULT_BYTE_ORDER
+
+    i, n = 1, len(parts)
+    factor, offset = 1.0, 0.0
+    min_val = max_val = None
+    unit = ""
+    try:
+        if i + 1 < n:
+            factor, offset = float(parts[i]), float(parts[i + 1])
+            i += 2
+        if i < n and parts[i][0] == "[":
+            if parts[i][-1] != "]":
+                return None
+            min_val, bar, max_val = parts[i][1:-1].partition("|")
+            if not bar:
+                return None
+            min_val, max_val = float(min_val), float(max_val)
+            i += 1
+    except ValueError:
+        return None
+    if i < n:
+        unit = parts[i]
+        if "," in unit or '"' in unit:
+            return None
+        i += 1
+    receivers = parts[i:]
+    if any("," in r for r in receivers):
+        receivers = " ".join(receivers).replace(",", " ").split()
+    return Signal(frame_id, name, int(start), int(length), byte_order, sign == "-",
+                  factor, offset, min_val, max_val, unit, tuple(receivers), mux)
+
+
+def parse_sg_line(line: str, frame_id=None):
+    """SG_ 한 줄을 Signal 레코드로 파싱합니다. 형식이 맞지 않으면 None을 반환합니다."""
+    if "(" in line:
+        m = _SG_FAST_RE.match(line)
+        if m is not None:
+            name, mux, start, length, order, sign, factor, offset, mn, mx, unit, rx = m.groups()
+            try:
+                return Signal(
+                    frame_id, name, int(start), int(length),
+                    "little_endian" if order == "1" else "big_endian", sign == "-",
+                    float(factor), float(offset), float(mn), float(mx), unit,
+                    tuple(rx.replace(",", " ").split()), mux,
+                )
+            except ValueError:
+                pass  # 숫자 형식이 특이한 경우 아래의 일반 경로로 처리
+    else:
+        sig = _split_sg(line, frame_id)
+        if sig is not None:
+            return sig
+
+    m = _SG_RE.search(line)
+    if m is None:
+        return None
+
+    # group()을 여러 번 호출하지 않고 한 번에 언패킹
+    (name, mux, start, length, order, sign, factor, offset,
+     factor2, offset2, min_val, max_val, unit, unit2, receivers) = m.groups()
+    return Signal(
+        frame_id,
+        name,
+        int(start),
+        int(length),
+        BYTE_ORDER_MAP[order] if order else DEFAULT_BYTE_ORDER,
+        sign == "-",
+        _to_float(factor or factor2, 1.0),
+        _to_float(offset or offset2, 0.0),
+        _to_float(min_val, None),
+        _to_float(max_val, None),
+        unit if unit is not None else (unit2 or ""),
+        tuple(receivers.replace(",", " ").split()),
+        mux,
+    )
+
+
+def parse_bo_line(line: str):
+    """BO_ 한 줄을 Message 레코드로 파싱합니다. 형식이 맞지 않으면 None을 반환합니다."""
+    m = _BO_RE.match(line.strip())
+    if m is None:
+        return None
+    frame_id, is_extended = _split_id(int(m.group(1)))
+    return Message(frame_id, m.group(2), int(m.group(3)), m.group(4), is_extended)
+
+
+def _parse_statement(stmt: str, frame_id):
+    """여러 줄에 걸칠 수 있는 VAL_/BA_/CM_ 구문을 레코드로 변환합니다."""
+    if stmt.startswith("VAL_"):
+        m = _VAL_RE.match(stmt)
+        if m:
+            values = {int(k): v for k, v in _VAL_PAIR_RE.findall(m.group(3))}
+            return ValueTable(_split_id(int(m.group(1)))[0], m.group(2), values)
+    elif stmt.startswith("BA_"):
+        m = _BA_RE.match(stmt)
+        if m:
+            name, scope, target, signal, value = m.groups()
+            fid = _split_id(int(target))[0] if scope in ("BO_", "SG_") else None
+            return Attribute(name, scope or "", fid, signal, value.strip('"'))
+    elif stmt.startswith("CM_"):
+        m = _CM_RE.match(stmt)
+        if m:
+            scope, target, signal, text = m.groups()
+            fid = _split_id(int(target))[0] if scope in ("BO_", "SG_") else None
+            return Comment(scope or "", fid, signal, text)
+    return None
+
+
+def _is_complete(stmt: str):
+    """따옴표 밖에서 ';'로 끝나면 구문이 완료된 것으로 봅니다."""
+    return stmt.rstrip().endswith(";") and stmt.count('"') % 2 == 0
+
+
+# ============================================
+# 🚀 스트리밍 파서 (파일 전체를 메모리에 올리지 않음)
+# ============================================
+def iter_dbc_records(source, encoding="cp1252", stats=None):
+    """DBC 파일 경로 또는 라인 iterable을 한 번만 순회하며 레코드를 yield 합니다.
+
+    BO_ → Message, SG_ → Signal, VAL_ → ValueTable, BA_ → Attribute, CM_ → Comment
+    그 밖의 구문(BA_DEF_, VAL_TABLE_, NS_ 등)은 건너뜁니다.
+    stats(dict)를 주면 파싱하지 못한 SG_/BO_ 줄 수와 줄 번호를 기록합니다.
+    """
+    if isinstance(source, str):
+        with open(source, "r", encoding=encoding, errors="replace") as f:
+            yield from iter_dbc_records(f, stats=stats)
+        return
+    if stats is not None:
+        stats.setdefault("skipped", 0)
+        stats.setdefault("skipped_lines", [])
+
+    frame_id = None
+    pending = None  # 여러 줄짜리 구문 누적 버퍼
+
+    for line_no, raw in enumerate(source, 1):
+        if pending is not None:
+            pending += "\n" + raw.rstrip("\r\n")
+            if _is_complete(pending):
+                rec = _parse_statement(pending, frame_id)
+                pending = None
+                if rec is not None:
+                    yield rec
+            continue
+
+        line = raw.strip()
+        if not line:
+            continue
+
+        # 첫 토큰으로 분기 (정규식 시도 전에 빠르게 걸러냄)
+        head = line[:4]
+        if head == "SG_ ":
+            rec = parse_sg_line(line, frame_id)
+            if rec is not None:
+                yield rec
+            elif stats is not None:
+                _record_skip(stats, line_no)
+        elif head == "BO_ ":
+            rec = parse_bo_line(line)
+            if rec is not None:
+                frame_id = rec.frame_id
+                yield rec
+            elif stats is not None:
+                _record_skip(stats, line_no)
+        elif head in ("VAL_", "BA_ ", "CM_ "):
+            if line.startswith("VAL_TABLE_"):
+                continue
+            if _is_complete(line):
+                rec = _parse_statement(line, frame_id)
+                if rec is not None:
+                    yield rec
+            else:
+                pending = line
+
+
+MAX_SKIPPED_LINES = 100  # stats에 줄 번호를 남길 최대 개수
+
+
+def _record_skip(stats, line_no):
+    stats["skipped"] += 1
+    if len(stats["skipped_lines"]) < MAX_SKIPPED_LINES:
+        stats["skipped_lines"].append(line_no)
+
+
+def iter_dbc_signals(source):
+    """DBC에서 Signal 레코드만 골라 yield 합니다 (대량 임포트용)."""
+    for rec in iter_dbc_records(source):
+        if type(rec) is Signal:
+            yield rec
+
+
+def load_dbc_dataframe(source):
+    """DBC 전체를 df_all과 같은 컬럼 구성의 DataFrame으로 변환합니다.
+
+    message_id는 DB의 messages.id처럼 BO_ 등장 순서대로 1부터 매기며,
+    frame_id/message_name/dlc도 df_all처럼 함께 넣고, frame_id는 확장 ID 표시 비트를 뗀 값이며
+    확장 여부는 is_extended 컬럼에 따로 둡니다.
+    파싱하지 못한 SG_/BO_ 줄 수는 df.attrs["skipped"]에 남깁니다.
+    """
+    import pandas as pd
+
+    messages = {}  # frame_id → (message_id, name, dlc, is_extended)
+    rows = []
+    stats = {}
+    for rec in iter_dbc_records(source, stats=stats):
+        if type(rec) is Message:
+            messages[rec.frame_id] = (len(messages) + 1, rec.name, rec.dlc, rec.is_extended)
+        elif type(rec) is Signal:
+            rows.append(rec)
+
+    df = pd.DataFrame(rows, columns=Signal._fields)
+    info = df["frame_id"].map(messages)
+    df.insert(0, "id", range(1, len(df) + 1))
+    df.insert(1, "message_id", info.map(lambda m: m[0] if isinstance(m, tuple) else None).astype("Int64"))
+    df["message_name"] = info.map(lambda m: m[1] if isinstance(m, tuple) else None)
+    df["dlc"] = info.map(lambda m: m[2] if isinstance(m, tuple) else None).astype("Int64")
+    df["is_extended"] = info.map(lambda m: m[3] if isinstance(m, tuple) else False).astype(bool)
+    df.attrs["skipped"] = stats["skipped"]
+    df.attrs["skipped_lines"] = stats["skipped_lines"]
+    return df
@@ -0,0 +1,205 @@
+# decode_engine.py
+
+import numpy as np
+
+from bit_mask import is_big_endian, motorola_msb_position
+
+# ============================================
+# 📐 디코딩 계획 (시그널 메타데이터 → 배열)
+# ============================================
+_PLAN_COLUMNS = ("start_bit", "bit_length", "byte_order", "is_signed", "factor", "offset")
+
+
+class FramePlan:
+    """하나의 frame_id에 속한 시그널들의 디코딩 파라미터 묶음."""
+
+    def __init__(self, frame_id, keys, start, length, big, signed, factor, offset, names=None):
+        self.frame_id = frame_id
+        self.keys = keys
+        self.names = names  # 키와 같은 순서의 시그널 이름 (표시용)
+        self.length = length
+        self.big = big
+        self.signed = signed
+        self.factor = factor
+        self.offset = offset
+        # Intel은 LSB 선형 위치, Motorola는 MSB 선형 위치를 기준으로 계산
+        self.lo = np.where(big, motorola_msb_position(start), start)
+
+
+class DecodePlan:
+    """df_all(또는 DBC DataFrame)에서 frame_id별 디코딩 계획을 미리 만들어 둡니다.
+
+    디코딩 결과는 key 컬럼(기본: 시그널 id) 값으로 구분합니다. 시그널 이름은
+    CRC/Counter처럼 여러 메시지에 반복되므로 이름만으로는 키가 겹칩니다.
+    """
+
+    def __init__(self, df_signals, key="id"):
+        missing = [c for c in ("frame_id", key) + _PLAN_COLUMNS if c not in df_signals]
+        if missing:
+            raise ValueError(f"디코딩에 필요한 컬럼이 없습니다: {missing}")
+
+        df = df_signals.dropna(subset=["frame_id", "start_bit", "bit_length"])
+        if df[key].duplicated().any():
+            raise ValueError(f"'{key}' 값이 겹치는 시그널이 있어 디코딩 키로 쓸 수 없습니다.")
+        self.frames = {}
+        self.signals = {}  # 키 → (frame_id, 메시지 이름, 시그널 이름)
+        self.keys_by_name = {}  # 시그널 이름 → 키 목록 (같은 이름이 여러 메시지에 있을 수 있음)
+        for frame_id, grp in df.groupby("frame_id", sort=False):
+            keys = grp[key].tolist()
+            names = grp["name"].tolist() if "name" in grp else [str(k) for k in keys]
+            message = grp["message_name"].iloc[0] if "message_name" in grp else None
+            if not isinstance(message, str):
+                message = None
+            for k, name in zip(keys, names):
+                self.signals[k] = (int(frame_id), message, name)
+                self.keys_by_name.setdefault(name, []).append(k)
+            self.frames[int(frame_id)] = FramePlan(
+                int(frame_id),
+                keys,
+                grp["start_bit"].to_numpy(dtype=np.int64),
+                grp["bit_length"].to_numpy(dtype=np.int64),
+                np.asarray(is_big_endian(grp["byte_order"].to_numpy()), dtype=bool),
+                grp["is_signed"].fillna(0).to_numpy().astype(bool),
+                grp["factor"].fillna(1.0).to_numpy(dtype=np.float64),
+                grp["offset"].fillna(0.0).to_numpy(dtype=np.float64),
+                names,
+            )
+
+    def __contains__(self, frame_id):
+        return frame_id in self.frames
+
+    def label(self, key):
+        """화면/JSON 표시용 이름 '메시지.시그널' (메시지 이름이 없으면 '0x1A0.시그널')."""
+        info = self.signals.get(key)
+        if info is None:
+            return str(key)
+        frame_id, message, name = info
+        return f"{message or f'{frame_id:#x}'}.{name}"
+
+    def find_keys(self, name, message=None, frame_id=None):
+        """시그널 이름(과 메시지 이름/frame_id)에 해당하는 디코딩 키 목록."""
+        keys = self.keys_by_name.get(name, [])
+        return [
+            k for k in keys
+            if (message is None or self.signals[k][1] == message)
+            and (frame_id is None or self.signals[k][0] == frame_id)
+        ]
+
+
+# ============================================
+# ⚡ 벡터화 비트 추출
+# ============================================
+def _length_mask(length):
+    # 64비트 시그널은 1 << 64가 넘치므로 별도 처리
+    if length >= 64:
+        return np.uint64(0xFFFFFFFFFFFFFFFF)
+    return np.uint64((1 << length) - 1)
+
+
+def _window_u64(padded, byte_pos, big, cache):
+    """payload의 byte_pos부터 8바이트를 uint64로 읽습니다 (같은 창은 재사용)."""
+    key = (byte_pos, big)
+    win = cache.get(key)
+    if win is None:
+        raw = np.ascontiguousarray(padded[:, byte_pos:byte_pos + 8])
+        win = raw.view(">u8" if big else "<u8").reshape(-1).astype(np.uint64)
+        cache[key] = win
+    return win
+
+
+def extract_raw(payloads, lo, length, big, cache=None):
+    """(N, P) uint8 payload에서 한 시그널의 raw 정수값(uint64)을 벡터로 추출합니다."""
+    if cache is None:
+        cache = {}
+    padded = cache.get("padded")
+    if padded is None:
+        # 창(8바이트) + 넘침 바이트(1)를 항상 읽을 수 있도록 0으로 패딩
+        padded = np.pad(payloads, ((0, 0), (0, 9)))
+        cache["padded"] = padded
+
+    byte_pos, rel = divmod(int(lo), 8)
+    end = rel + int(length)
+    if byte_pos + 9 > padded.shape[1]:
+        # payload 범위를 벗어난 시그널은 0으로 채움
+        return np.zeros(len(padded), dtype=np.uint64)
+    win = _window_u64(padded, byte_pos, big, cache)
+    mask = _length_mask(int(length))
+
+    if not big:
+        raw = win >> np.uint64(rel)
+        if end > 64:
+            extra = padded[:, byte_pos + 8].astype(np.uint64)
+            raw |= extra << np.uint64(64 - rel)
+    else:
+        if end <= 64:
+            raw = win >> np.uint64(64 - end)
+        else:
+            extra = padded[:, byte_pos + 8].astype(np.uint64)
+            raw = (win << np.uint64(end - 64)) | (extra >> np.uint64(72 - end))
+    return raw & mask
+
+
+def to_physical(raw, length, signed, factor, offset):
+    """raw 값에 부호 확장과 factor/offset 스케일을 적용합니다."""
+    if signed:
+        if length >= 64:
+            values = raw.view(np.int64)
+        else:
+            values = raw.astype(np.int64)
+            sign_bit = np.int64(1) << np.int64(length - 1)
+            values = (values ^ sign_bit) - sign_bit
+    else:
+        values = raw
+    return values * factor + offset
+
+
+def decode_frame_group(plan: FramePlan, payloads):
+    """같은 frame_id의 payload 묶음을 시그널별 물리값 배열 dict로 디코딩합니다."""
+    cache = {}
+    out = {}
+    for i, key in enumerate(plan.keys):
+        raw = extract_raw(payloads, plan.lo[i], plan.length[i], plan.big[i], cache)
+        out[key] = to_physical(
+            raw, int(plan.length[i]), plan.signed[i], plan.factor[i], plan.offset[i]
+        )
+    return out
+
+
+# ============================================
+# 🚀 배치 디코딩 (타임스탬프, frame_id, payload)
+# ============================================
+def as_payload_matrix(payloads):
+    """payload를 (N, 8 이상) uint8 행렬로 맞춥니다."""
+    payloads = np.asarray(payloads, dtype=np.uint8)
+    if payloads.ndim != 2:
+        raise ValueError("payloads는 (프레임 수, 바이트 수) 2차원 배열이어야 합니다.")
+    if payloads.shape[1] < 8:
+        payloads = np.pad(payloads, ((0, 0), (0, 8 - payloads.shape[1])))
+    return payloads
+
+
+def decode_frames(plan: DecodePlan, timestamps, frame_ids, payloads):
+    """프레임 배치를 시그널별 (timestamps, values)로 디코딩합니다.
+
+    frame_id로 한 번 정렬한 뒤 메시지 단위로 잘라서 처리하므로
+    프레임 단위 파이썬 루프가 없습니다. 카탈로그에 없는 frame_id는 무시합니다.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    frame_ids = np.asarray(frame_ids, dtype=np.int64)
+    payloads = as_payload_matrix(payloads)
+
+    order = np.argsort(frame_ids, kind="stable")
+    sorted_ids = frame_ids[order]
+    uniq, starts = np.unique(sorted_ids, return_index=True)
+    ends = np.append(starts[1:], len(sorted_ids))
+
+    result = {}
+    for frame_id, s, e in zip(uniq.tolist(), starts.tolist(), ends.tolist()):
+        frame_plan = plan.frames.get(frame_id)
+        if frame_plan is None:
+            continue
+        rows = order[s:e]
+        ts = timestamps[rows]
+        for key, values in decode_frame_group(frame_plan, payloads[rows]).items():
+            result[key] = (ts, values)
+    return result
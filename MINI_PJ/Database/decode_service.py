@@ -0,0 +1,505 @@
+# decode_service.py
+"""car_skill 카탈로그 조회/디코딩을 로컬 HTTP(JSON)로 제공하는 asyncio 서비스.
+
+GUI를 여러 개 띄워 DB에 각각 붙는 대신, 이 프로세스 하나가 카탈로그를
+메모리에 올려 두고 여러 도구의 요청을 처리합니다.
+
+실행)
+    python decode_service.py --port 8765
+
+엔드포인트
+    GET  /health
+    GET  /lookup?code=<SG_ 라인>          POST /lookup  {"codes": [...]}
+    GET  /search?q=<검색어>&k=50&fuzzy=1&field=name
+    GET  /mask?start_bit=&bit_length=&byte_order=&payload_bytes=
+    POST /mask    {"signals": [{"start_bit", "bit_length", "byte_order"}, ...], "payload_bytes": 8}
+    POST /decode  {"frames": [[timestamp, frame_id, "hex payload"], ...]}
+    GET  /stats   (엔드포인트별 지연 히스토그램 + DB 통계)
+    POST /reload  (카탈로그 다시 로드)
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from bit_mask import CANFD_PAYLOAD_BYTES, compute_byte_masks, is_big_endian, masks_to_uint64
+from decode_engine import DecodePlan, decode_frames
+from signal_search import SignalSearchIndex
+
+# ============================================
+# ⚙️ 서비스 설정
+# ============================================
+DEFAULT_HOST = "127.0.0.1"  # 로컬 전용
+DEFAULT_PORT = 8765
+WORKER_THREADS = 4
+MAX_BODY_BYTES = 8 * 1024 * 1024
+LOOKUP_BATCH_WINDOW_SEC = 0.005  # 이 시간 동안 들어온 lookup 요청을 한 번에 조회
+LOOKUP_BATCH_MAX = 500
+SEARCH_RESULT_COLUMNS = ("name", "message_name", "frame_id", "start_bit", "bit_length",
+                         "byte_order", "Category", "Status")
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _query_int(query, name, default):
+    """쿼리 문자열의 정수 값. 정수가 아니면 400."""
+    value = query.get(name, [str(default)])[0]
+    try:
+        return int(value)
+    except ValueError:
+        raise HttpError(400, f"{name} 값은 정수여야 합니다: {value}")
+
+
+def _content_length(headers):
+    """Content-Length 헤더 값. 숫자가 아니거나 음수면 400."""
+    value = headers.get("content-length", "") or "0"
+    try:
+        length = int(value)
+    except ValueError:
+        raise HttpError(400, f"Content-Length 값이 올바르지 않습니다: {value}")
+    if length < 0:
+        raise HttpError(400, f"Content-Length 값이 올바르지 않습니다: {value}")
+    return length
+
+
+def _require_object(body):
+    """POST 본문이 JSON 객체인지 확인합니다 (비었거나 배열/문자열이면 400)."""
+    if not isinstance(body, dict):
+        raise HttpError(400, "본문은 JSON 객체여야 합니다.")
+    return body
+
+
+# ============================================
+# 📊 지연 시간 히스토그램
+# ============================================
+class LatencyHistogram:
+    """고정 버킷(ms) 히스토그램. 버킷 경계로 p50/p95/p99를 근사합니다."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # 마지막 칸은 상한 초과
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms):
+        self.counts[bisect.bisect_left(self.buckets_ms, elapsed_ms)] += 1
+        self.total += 1
+        self.sum_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, q):
+        if not self.total:
+            return None
+        target = q / 100.0 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        labels = [f"<={b}ms" for b in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 3) if self.total else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+# ============================================
+# 🗂️ 공유 카탈로그 (프로세스 내 캐시)
+# ============================================
+class ServiceCatalog:
+    """df_all과 그로부터 만든 검색 색인/디코딩 계획을 한 번만 만들어 공유합니다."""
+
+    def __init__(self):
+        self.df_all = None
+        self.search_index = None
+        self.decode_plan = None
+        self.loaded_at = None
+        self._version = 0  # 마지막으로 반영한 로드 순번 (늦게 끝난 옛 로드가 덮어쓰지 않게)
+        self._next_version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.df_all is not None
+
+    def _take_version(self):
+        with self._lock:
+            self._next_version += 1
+            return self._next_version
+
+    def load(self, force_refresh=False):
+        """(워커 스레드) 스냅샷/DB에서 카탈로그를 읽고 색인을 다시 만듭니다.
+
+        스냅샷을 쓴 경우 DB 지문 확인은 백그라운드에서 하고, 바뀌었으면 다시 읽은 카탈로그로 교체합니다.
+        """
+        from catalog_cache import load_catalog  # DB 모듈은 실제로 로드할 때만 import
+
+        version = self._take_version()
+        df_all = load_catalog(force_refresh=force_refresh, on_update=self._on_validated)
+        return self._install(df_all, version)
+
+    def _on_validated(self, df_all):
+        if df_all is not None:
+            self._install(df_all, self._take_version())
+
+    def _install(self, df_all, version):
+        if df_all.empty:
+            print("카탈로그 로드 실패: 빈 데이터")
+            return False
+
+        search_index = SignalSearchIndex(df_all)
+        try:
+            decode_plan = DecodePlan(df_all)
+        except ValueError as e:
+            print(f"디코딩 계획 생성 실패: {e}")
+            decode_plan = None
+
+        # 새 객체를 다 만든 뒤 한 번에 교체해 요청 처리 중에도 일관된 상태를 보게 합니다.
+        with self._lock:
+            if version < self._version:
+                return True  # 더 새 카탈로그가 이미 반영됨
+            self.df_all = df_all
+            self.search_index = search_index
+            self.decode_plan = decode_plan
+            self.loaded_at = time.time()
+            self._version = version
+        return True
+
+
+# ============================================
+# 📦 lookup 요청 모으기
+# ============================================
+def resolve_codes(codes):
+    """(워커 스레드) original_code 목록의 frame_id를 한 번에 조회합니다."""
+    from analyze_logic import code_index, resolve_original_codes
+
+    if code_index.complete:
+        # 전체가 메모리에 적재되어 있으면 DB 왕복 없이 해시맵에서 바로 찾습니다.
+        return [code_index.lookup(c) for c in codes]
+    resolved = resolve_original_codes(codes)
+    # frame_id는 Int64라 미일치 값이 pd.NA (v != v 비교는 TypeError)
+    return [None if pd.isna(v) else int(v) for v in resolved["frame_id"].tolist()]
+
+
+class LookupBatcher:
+    """짧은 시간 창 안에 들어온 lookup 요청을 모아 DB 조회 한 번으로 처리합니다."""
+
+    def __init__(self, executor, window_sec=LOOKUP_BATCH_WINDOW_SEC, max_batch=LOOKUP_BATCH_MAX):
+        self.executor = executor
+        self.window_sec = window_sec
+        self.max_batch = max_batch
+        self._pending = []  # (code, future)
+        self._timer = None
+        self._tasks = set()  # 실행 중인 조회 태스크 (참조가 없으면 도중에 GC될 수 있음)
+        self.batches = 0
+
+    async def lookup(self, code):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((code, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_sec, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            self.batches += 1
+            task = asyncio.ensure_future(self._resolve(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, pending):
+        loop = asyncio.get_running_loop()
+        try:
+            # 같은 코드가 여러 요청에 있으면 한 번만 조회합니다.
+            codes = list(dict.fromkeys(c for c, _ in pending))
+            frame_ids = await loop.run_in_executor(self.executor, resolve_codes, codes)
+            found = dict(zip(codes, frame_ids))
+        except asyncio.CancelledError:
+            for _, future in pending:
+                future.cancel()
+            raise
+        except Exception as e:
+            # 조회 실패는 기다리는 요청마다 그대로 전달합니다 (handle_connection에서 500).
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for code, future in pending:
+            if not future.done():
+                future.set_result(found.get(code))
+
+
+# ============================================
+# 🧮 요청 처리 (CPU 작업은 워커 스레드에서)
+# ============================================
+def _records(df):
+    # NaN/NumPy 스칼라를 JSON 호환 값으로 바꾸는 데 pandas 직렬화를 그대로 씁니다.
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def compute_masks(signals, payload_bytes):
+    start = [int(s["start_bit"]) for s in signals]
+    length = [int(s["bit_length"]) for s in signals]
+    big = is_big_endian(np.array([str(s.get("byte_order", "little_endian")) for s in signals]))
+    masks = compute_byte_masks(start, length, big, payload_bytes)
+    result = []
+    u64 = masks_to_uint64(masks) if payload_bytes >= 8 else None
+    for i, m in enumerate(masks):
+        item = {"mask": [int(b) for b in m], "mask_hex": m.tobytes().hex(" ").upper()}
+        if u64 is not None and not m[8:].any():
+            item["mask_u64"] = int(u64[i])
+        result.append(item)
+    return result
+
+
+def decode_batch(plan, frames):
+    """[[timestamp, frame_id, hex payload], ...]를 시그널 id별 {frame_id, message, name, t, v}로 디코딩합니다."""
+    if not frames:
+        return {}
+    payload_bytes = [bytes.fromhex(str(f[2])) for f in frames]
+    width = max(8, max(len(p) for p in payload_bytes))
+    payloads = np.zeros((len(frames), width), dtype=np.uint8)
+    for i, p in enumerate(payload_bytes):
+        payloads[i, :len(p)] = np.frombuffer(p, dtype=np.uint8)
+    timestamps = [float(f[0]) for f in frames]
+    frame_ids = [int(f[1], 0) if isinstance(f[1], str) else int(f[1]) for f in frames]
+    decoded = decode_frames(plan, timestamps, frame_ids, payloads)
+    result = {}
+    for key, (ts, values) in decoded.items():
+        frame_id, message, name = plan.signals[key]
+        result[str(key)] = {"frame_id": frame_id, "message": message, "name": name,
+                            "t": ts.tolist(), "v": values.tolist()}
+    return result
+
+
+# ============================================
+# 🌐 HTTP 서비스
+# ============================================
+class DecodeService:
+    def __init__(self, workers=WORKER_THREADS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decode-svc")
+        self.catalog = ServiceCatalog()
+        self.batcher = LookupBatcher(self.executor)
+        self.latency = {}
+        self.routes = {
+            ("GET", "/health"): self.handle_health,
+            ("GET", "/lookup"): self.handle_lookup,
+            ("POST", "/lookup"): self.handle_lookup,
+            ("GET", "/search"): self.handle_search,
+            ("GET", "/mask"): self.handle_mask,
+            ("POST", "/mask"): self.handle_mask,
+            ("POST", "/decode"): self.handle_decode,
+            ("GET", "/stats"): self.handle_stats,
+            ("POST", "/reload"): self.handle_reload,
+        }
+
+    async def run_blocking(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _require_catalog(self):
+        if not self.catalog.ready:
+            raise HttpError(503, "카탈로그를 아직 불러오지 못했습니다.")
+        return self.catalog
+
+    # ---------- 핸들러 ----------
+    async def handle_health(self, query, body):
+        return {"status": "ok", "catalog_rows": len(self.catalog.df_all) if self.catalog.ready else 0,
+                "loaded_at": self.catalog.loaded_at}
+
+    async def handle_lookup(self, query, body):
+        codes = _require_object(body).get("codes") if body is not None else query.get("code", [])
+        if not codes or not isinstance(codes, list) or not all(isinstance(c, str) for c in codes):
+            raise HttpError(400, "code(또는 codes) 값이 필요합니다.")
+        frame_ids = await asyncio.gather(*(self.batcher.lookup(c) for c in codes))
+        return {"results": [{"original_code": c, "frame_id": f} for c, f in zip(codes, frame_ids)]}
+
+    async def handle_search(self, query, body):
+        catalog = self._require_catalog()
+        keyword = query.get("q", [""])[0].strip()
+        if not keyword:
+            raise HttpError(400, "q 값이 필요합니다.")
+        k = _query_int(query, "k", 50)
+        if k <= 0:
+            raise HttpError(400, "k 값은 1 이상이어야 합니다.")
+        field = query.get("field", ["name"])[0]
+        if field not in catalog.search_index.indexes:
+            raise HttpError(400, f"검색할 수 없는 필드입니다: {field}")
+        columns = [c for c in SEARCH_RESULT_COLUMNS if c in catalog.df_all]
+
+        def run():
+            if query.get("fuzzy", ["0"])[0] in ("1", "true"):
+                found = catalog.search_index.fuzzy_search(keyword, k, field)
+                return _records(found[columns + ["score"]])
+            rows = catalog.search_index.search_rows(keyword, (field,))
+            return _records(catalog.df_all.iloc[rows[:k]][columns])
+
+        return {"results": await self.run_blocking(run)}
+
+    async def handle_mask(self, query, body):
+        try:
+            if body is not None:
+                signals = _require_object(body).get("signals") or [body]
+                payload_bytes = int(body.get("payload_bytes", CANFD_PAYLOAD_BYTES))
+            else:
+                signals = [{k: v[0] for k, v in query.items()}]
+                payload_bytes = _query_int(query, "payload_bytes", CANFD_PAYLOAD_BYTES)
+            return {"results": compute_masks(signals, payload_bytes)}
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            raise HttpError(400, f"start_bit/bit_length 값이 올바르지 않습니다: {e}")
+
+    async def handle_decode(self, query, body):
+        catalog = self._require_catalog()
+        if catalog.decode_plan is None:
+            raise HttpError(503, "카탈로그에 frame_id 정보가 없어 디코딩할 수 없습니다.")
+        frames = _require_object(body).get("frames", [])
+        if not isinstance(frames, list):
+            raise HttpError(400, "frames는 [[timestamp, frame_id, hex payload], ...] 배열이어야 합니다.")
+        try:
+            signals = await self.run_blocking(decode_batch, catalog.decode_plan, frames)
+        except (IndexError, TypeError, ValueError) as e:
+            raise HttpError(400, f"frames 형식이 올바르지 않습니다: {e}")
+        return {"signals": signals}
+
+    async def handle_stats(self, query, body):
+        from analyze_logic import get_db_stats
+
+        return {
+            "latency": {path: h.snapshot() for path, h in sorted(self.latency.items())},
+            "lookup_batches": self.batcher.batches,
+            "db": get_db_stats(),
+        }
+
+    async def handle_reload(self, query, body):
+        ok = await self.run_blocking(self.catalog.load, True)
+        if not ok:
+            raise HttpError(503, "카탈로그를 다시 불러오지 못했습니다.")
+        return await self.handle_health(query, body)
+
+    # ---------- HTTP 처리 ----------
+    async def dispatch(self, method, target, body_bytes):
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            known = any(path == url.path for _, path in self.routes)
+            raise HttpError(405 if known else 404, f"{method} {url.path}")
+        try:
+            body = json.loads(body_bytes) if body_bytes else None
+        except ValueError:
+            raise HttpError(400, "본문이 올바른 JSON이 아닙니다.")
+        return await handler(parse_qs(url.query), body)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                start = time.perf_counter()
+                length = None  # 본문 길이를 모르면 다음 요청 경계도 모르므로 연결을 닫습니다.
+                try:
+                    length = _content_length(headers)
+                    if length > MAX_BODY_BYTES:
+                        raise HttpError(413, f"본문은 {MAX_BODY_BYTES}바이트 이하여야 합니다.")
+                    body_bytes = await reader.readexactly(length) if length else b""
+                    status, payload = 200, await self.dispatch(method, target, body_bytes)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    print(f"요청 처리 에러 ({method} {target}): {e}")
+                    status, payload = 500, {"error": str(e)}
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                              and length is not None and status != 413)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"{version} {status} {HTTP_REASONS.get(status, '')}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+
+                path = urlsplit(target).path
+                self.latency.setdefault(path, LatencyHistogram()).observe((time.perf_counter() - start) * 1000)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, preload=True):
+        if preload:
+            # 카탈로그 로드를 기다리지 않고 바로 요청을 받습니다 (로드 전에는 503).
+            asyncio.get_running_loop().run_in_executor(self.executor, self.catalog.load)
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"디코드 서비스 시작: http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CAN 카탈로그 조회/디코딩 로컬 HTTP 서비스")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=WORKER_THREADS, help="CPU/DB 작업 스레드 수")
+    parser.add_argument("--no-preload", action="store_true", help="시작 시 카탈로그를 불러오지 않음")
+    args = parser.parse_args(argv)
+
+    service = DecodeService(args.workers)
+    try:
+        asyncio.run(service.serve(args.host, args.port, preload=not args.no_preload))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    main()
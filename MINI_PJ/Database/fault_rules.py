@@ -0,0 +1,394 @@
+# fault_rules.py
+"""디코딩된 시그널 스트림에 고장 규칙(임계값/범위/고착/변화율/타임아웃)을 적용합니다.
+
+- 규칙은 시그널 하나를 참조하며(DecodePlan으로 시그널 id 키로 바꿔 둠), 시그널 → 규칙 의존성 색인으로
+  들어온 시그널의 규칙만 평가합니다. 규칙이 없는 시그널은 dict 조회 한 번으로 건너뜁니다.
+- 샘플마다 직전 값과 같으면 임계값/범위/변화율 규칙을 평가하지 않습니다
+  (변화율 규칙은 고장 중일 때만 해제 여부를 봅니다).
+- 고착(stuck)/타임아웃 규칙은 시간이 흘러야 판정되므로 poll()에서 배열 한 번으로 검사합니다.
+
+실시간 배치에서는 시그널당 샘플이 한두 개뿐이라 numpy 호출보다 스칼라 비교가 빠르므로
+샘플 단위로 평가합니다. 규칙 하나는 시그널 하나만 보므로 시그널별 시간순으로 평가하면
+프레임 순서대로 평가한 것과 발생/해제 시점이 같습니다.
+
+규칙 파일(JSON) 예)
+    [
+      {"type": "threshold", "signal": "VehicleSpeed", "op": ">", "limit": 180, "point": "Front_L"},
+      {"type": "range", "signal": "BatVolt", "low": 9.0, "high": 16.0},
+      {"type": "rate", "signal": "SteerAngle", "max_rate": 720},
+      {"type": "stuck", "signal": "EngRpm", "duration": 2.0, "tolerance": 0},
+      {"type": "timeout", "signal": "DoorSts_FL", "timeout": 1.0},
+      {"type": "range", "signal": "Temp", "message": "BMS_Status", "low": -20, "high": 60},
+      {"type": "threshold", "signal": "Temp", "frame_id": "0x3A0", "op": ">", "limit": 110}
+    ]
+
+같은 이름의 시그널이 여러 메시지에 있으면 message(메시지 이름)나 frame_id(정수 또는 "0x.." 문자열)로
+하나를 지정합니다. 지정하지 않아 하나로 정할 수 없는 규칙은 평가하지 않습니다.
+"""
+
+import json
+import operator
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# ============================================
+# ⚙️ 설정
+# ============================================
+MAX_EVENTS = 1000  # 보관하는 최근 발생/해제 이벤트 수
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+# ============================================
+# 📏 규칙 정의
+# ============================================
+def _parse_frame_id(frame_id):
+    """JSON의 frame_id (정수 또는 "0x1A0" 같은 문자열)를 정수로 바꿉니다."""
+    if frame_id is None:
+        return None
+    return int(frame_id, 0) if isinstance(frame_id, str) else int(frame_id)
+
+
+class FaultRule:
+    """규칙 공통 속성. point는 고장 시 표시할 CarPoint id (없으면 시그널 Category로 찾음).
+
+    message/frame_id는 같은 이름의 시그널이 여러 메시지에 있을 때 하나를 고르는 조건입니다.
+    """
+
+    kind = None
+    time_based = False  # True면 poll()에서 시간으로 판정
+
+    def __init__(self, signal, name=None, point=None, message=None, frame_id=None):
+        self.signal = signal
+        self.message = message
+        self.frame_id = _parse_frame_id(frame_id)
+        self.name = name or f"{self.target} {self.kind}"
+        self.point = point
+
+    @property
+    def target(self):
+        """표시용 시그널 이름 (메시지/frame_id를 지정했으면 "메시지.시그널")."""
+        if self.message is not None:
+            return f"{self.message}.{self.signal}"
+        if self.frame_id is not None:
+            return f"{self.frame_id:#x}.{self.signal}"
+        return self.signal
+
+    def check(self, value, prev_value, dt):
+        """샘플 하나의 고장 여부. prev_value/dt는 같은 시그널의 직전 샘플 기준 (없으면 NaN)."""
+        raise NotImplementedError
+
+    def describe(self):
+        return self.name
+
+
+class ThresholdRule(FaultRule):
+    kind = "threshold"
+
+    def __init__(self, signal, op, limit, **kwargs):
+        super().__init__(signal, **kwargs)
+        if op not in _OPERATORS:
+            raise ValueError(f"지원하지 않는 비교 연산자: {op}")
+        self.op = op
+        self.limit = float(limit)
+        self._compare = _OPERATORS[op]
+
+    def check(self, value, prev_value, dt):
+        return self._compare(value, self.limit)
+
+    def describe(self):
+        return f"{self.target} {self.op} {self.limit:g}"
+
+
+class RangeRule(FaultRule):
+    kind = "range"
+
+    def __init__(self, signal, low, high, **kwargs):
+        super().__init__(signal, **kwargs)
+        self.low = float(low)
+        self.high = float(high)
+
+    def check(self, value, prev_value, dt):
+        return value < self.low or value > self.high
+
+    def describe(self):
+        return f"{self.target} ∉ [{self.low:g}, {self.high:g}]"
+
+
+class RateRule(FaultRule):
+    """직전 샘플 대비 |Δ값/Δt| 가 max_rate(단위/초)를 넘으면 고장."""
+
+    kind = "rate"
+
+    def __init__(self, signal, max_rate, **kwargs):
+        super().__init__(signal, **kwargs)
+        self.max_rate = float(max_rate)
+
+    def check(self, value, prev_value, dt):
+        # 첫 샘플은 prev_value가 NaN이라 비교 결과가 False
+        return dt > 0 and abs(value - prev_value) > self.max_rate * dt
+
+    def describe(self):
+        return f"|d{self.target}/dt| > {self.max_rate:g}"
+
+
+class StuckRule(FaultRule):
+    """값의 변동 폭(max - min)이 tolerance 이하인 채로 duration초가 지나면 고장."""
+
+    kind = "stuck"
+    time_based = True
+
+    def __init__(self, signal, duration, tolerance=0.0, **kwargs):
+        super().__init__(signal, **kwargs)
+        self.duration = float(duration)
+        self.tolerance = float(tolerance)
+
+    def check(self, value, prev_value, dt):
+        return False  # 샘플 하나로는 판정하지 않음 (poll()에서 시간으로 판정)
+
+    def describe(self):
+        return f"{self.target} 고착 {self.duration:g}s"
+
+
+class TimeoutRule(FaultRule):
+    """timeout초 동안 샘플이 들어오지 않으면 고장."""
+
+    kind = "timeout"
+    time_based = True
+
+    def __init__(self, signal, timeout, **kwargs):
+        super().__init__(signal, **kwargs)
+        self.timeout = float(timeout)
+
+    def check(self, value, prev_value, dt):
+        return False  # 샘플이 들어왔다는 것 자체가 정상 (poll()에서 시간으로 판정)
+
+    def describe(self):
+        return f"{self.target} 수신 없음 {self.timeout:g}s"
+
+
+RULE_TYPES = {cls.kind: cls for cls in (ThresholdRule, RangeRule, RateRule, StuckRule, TimeoutRule)}
+
+
+def rule_from_dict(spec):
+    """{"type": ..., "signal": ..., 파라미터...} 한 개를 규칙 객체로 만듭니다."""
+    spec = dict(spec)
+    kind = spec.pop("type", None)
+    cls = RULE_TYPES.get(kind)
+    if cls is None:
+        raise ValueError(f"알 수 없는 규칙 종류: {kind}")
+    return cls(**spec)
+
+
+def resolve_rule_key(rule, plan):
+    """규칙이 가리키는 디코딩 키. plan이 없으면 시그널 이름 그대로, 못 찾거나 여러 개면 None."""
+    if plan is None:
+        return rule.signal
+    keys = plan.find_keys(rule.signal, rule.message, rule.frame_id)
+    return keys[0] if len(keys) == 1 else None
+
+
+def load_rules(path):
+    """JSON 규칙 파일을 읽어 규칙 목록을 반환합니다."""
+    with open(path, "r", encoding="utf-8") as f:
+        specs = json.load(f)
+    return [rule_from_dict(spec) for spec in specs]
+
+
+# ============================================
+# 🚨 증분 평가 엔진
+# ============================================
+class _SignalRules:
+    """시그널 하나의 상태와 그 시그널을 참조하는 규칙 번호들."""
+
+    __slots__ = ("index", "value_rules", "rate_rules", "stuck_rules")
+
+    def __init__(self, index):
+        self.index = index
+        self.value_rules = []  # 임계값/범위: 값이 바뀔 때만 평가
+        self.rate_rules = []  # 변화율: 값이 바뀌었거나 고장 중일 때 평가
+        self.stuck_rules = []  # 고착: 값이 바뀔 때 머무른 구간만 갱신, 판정은 poll()
+
+
+class FaultEngine:
+    """규칙 목록을 시그널별로 색인해 두고 디코딩 배치마다 해당 규칙만 평가합니다.
+
+    update()는 수신 스레드, pop_changes()/active_faults()는 GUI 스레드에서 불러도 됩니다.
+    plan(DecodePlan)을 주면 규칙의 시그널을 디코딩 키(시그널 id)로 찾아 둡니다.
+    카탈로그에 없거나 여러 메시지에 있어 하나로 정할 수 없는 규칙(message/frame_id 미지정)은
+    unresolved에 남기고 평가하지 않습니다.
+    """
+
+    def __init__(self, rules, plan=None):
+        self.rules = list(rules)
+        self.rule_keys = [resolve_rule_key(rule, plan) for rule in self.rules]  # 규칙 번호 → 디코딩 키
+        self.unresolved = [rule for rule, key in zip(self.rules, self.rule_keys) if key is None]
+        self.by_signal = {}  # 디코딩 키 → _SignalRules (의존성 색인)
+        for i, (rule, key) in enumerate(zip(self.rules, self.rule_keys)):
+            if key is None:
+                continue
+            entry = self.by_signal.get(key)
+            if entry is None:
+                entry = self.by_signal[key] = _SignalRules(len(self.by_signal))
+            if isinstance(rule, RateRule):
+                entry.rate_rules.append(i)
+            elif isinstance(rule, StuckRule):
+                entry.stuck_rules.append(i)
+            elif not rule.time_based:
+                entry.value_rules.append(i)
+
+        n_signals = len(self.by_signal)
+        self.last_value = np.full(n_signals, np.nan)
+        self.last_ts = np.full(n_signals, np.nan)  # 마지막 샘플 시각 (타임아웃 기준)
+        self.is_active = np.zeros(len(self.rules), dtype=bool)  # active의 배열판 (poll 비교용)
+
+        # poll()에서 한 번에 검사할 시간 기반 규칙 배열
+        resolved = [(i, r) for i, (r, key) in enumerate(zip(self.rules, self.rule_keys)) if key is not None]
+        self.stuck_ids = np.array([i for i, r in resolved if isinstance(r, StuckRule)], dtype=np.int64)
+        self.stuck_pos = {rule_id: pos for pos, rule_id in enumerate(self.stuck_ids.tolist())}
+        # 고착 규칙별 현재 머무른 구간의 시작 시각과 값 범위 (tolerance가 규칙마다 다름)
+        self.stuck_since = np.full(len(self.stuck_ids), np.nan)
+        self.stuck_low = [np.nan] * len(self.stuck_ids)
+        self.stuck_high = [np.nan] * len(self.stuck_ids)
+        self.stuck_duration = np.array([self.rules[i].duration for i in self.stuck_ids], dtype=np.float64)
+        self.timeout_ids = np.array([i for i, r in resolved if isinstance(r, TimeoutRule)], dtype=np.int64)
+        self.timeout_signal = np.array(
+            [self.by_signal[self.rule_keys[i]].index for i in self.timeout_ids], dtype=np.int64
+        )
+        self.timeout_limit = np.array([self.rules[i].timeout for i in self.timeout_ids], dtype=np.float64)
+
+        self.active = {}  # 규칙 번호 → (발생 시각, 발생 값)
+        self.events = deque(maxlen=MAX_EVENTS)  # (시각, 규칙 번호, 발생 여부, 값)
+        self.evaluations = 0  # 평가한 규칙 수 (성능 확인용)
+        self.clock = None  # 스트림 시각 (마지막 샘플 기준)
+        self.start_clock = None  # 첫 샘플 시각 (한 번도 안 들어온 시그널의 타임아웃 기준)
+        self._clock_wall = None
+        self._changed = set()  # pop_changes() 이후 상태가 바뀐 규칙
+        self._lock = threading.Lock()
+
+    @property
+    def signals(self):
+        return self.by_signal.keys()
+
+    # ---------- 상태 전이 ----------
+    def _set_state(self, rule_id, faulted, ts, value):
+        """규칙 상태를 바꾸고 이벤트를 남깁니다 (호출 전에 상태가 다른지 확인)."""
+        if faulted:
+            self.active[rule_id] = (ts, value)
+        else:
+            del self.active[rule_id]
+        self.is_active[rule_id] = faulted
+        self.events.append((ts, rule_id, faulted, value))
+        self._changed.add(rule_id)
+
+    # ---------- 입력 ----------
+    def update(self, decoded):
+        """decode_frames() 결과 {키: (ts, values)} 한 배치를 반영합니다."""
+        by_signal = self.by_signal
+        rules = self.rules
+        active = self.active
+        evaluations = 0
+        with self._lock:
+            for key, (ts, values) in decoded.items():
+                entry = by_signal.get(key)
+                if entry is None or not len(ts):
+                    continue
+                idx = entry.index
+                prev_ts, prev_value = float(self.last_ts[idx]), float(self.last_value[idx])
+                evaluated = entry.value_rules + entry.rate_rules
+                for t, v in zip(np.asarray(ts).tolist(), np.asarray(values).tolist()):
+                    if v != prev_value:  # 첫 샘플(prev NaN)도 변경으로 봅니다.
+                        dt = t - prev_ts
+                        for rule_id in evaluated:
+                            faulted = rules[rule_id].check(v, prev_value, dt)
+                            if faulted != (rule_id in active):
+                                self._set_state(rule_id, faulted, t, v)
+                        for rule_id in entry.stuck_rules:
+                            self._update_stuck(rule_id, t, v)
+                        evaluations += len(evaluated)
+                    else:
+                        # 값이 그대로면 변화율은 0 → 고장 중인 변화율 규칙만 해제 여부 확인
+                        for rule_id in entry.rate_rules:
+                            if rule_id in active and not rules[rule_id].check(v, prev_value, t - prev_ts):
+                                self._set_state(rule_id, False, t, v)
+                    prev_ts, prev_value = t, v
+
+                self.last_ts[idx] = prev_ts
+                self.last_value[idx] = prev_value
+                if self.start_clock is None:
+                    self.start_clock = float(ts[0])
+                if self.clock is None or prev_ts > self.clock:
+                    self.clock = prev_ts
+                    self._clock_wall = time.monotonic()
+            self.evaluations += evaluations
+
+    def _update_stuck(self, rule_id, t, v):
+        """값 범위가 tolerance를 넘으면 머무른 구간을 새로 시작합니다 (고착 중이었다면 해제)."""
+        pos = self.stuck_pos[rule_id]
+        low, high = min(self.stuck_low[pos], v), max(self.stuck_high[pos], v)
+        if high - low <= self.rules[rule_id].tolerance:  # 첫 샘플은 NaN 비교라 False
+            self.stuck_low[pos], self.stuck_high[pos] = low, high
+            return
+        self.stuck_low[pos] = self.stuck_high[pos] = v
+        self.stuck_since[pos] = t
+        if rule_id in self.active:
+            self._set_state(rule_id, False, t, v)
+
+    def now(self):
+        """스트림 시각 + 마지막 샘플 이후 흐른 실제 시간 (버스가 조용해져도 시간이 흐름)."""
+        if self.clock is None:
+            return None
+        return self.clock + (time.monotonic() - self._clock_wall)
+
+    def poll(self, now=None):
+        """고착/타임아웃 규칙을 now(기본: 스트림 시각) 기준으로 한 번에 검사합니다."""
+        with self._lock:
+            now = self.now() if now is None else now
+            if now is None:
+                return
+            with np.errstate(invalid="ignore"):
+                stuck = now - self.stuck_since >= self.stuck_duration  # 아직 샘플이 없으면 NaN → False
+            last = self.last_ts[self.timeout_signal]
+            # 한 번도 안 들어온 시그널은 첫 샘플(스트림 시작) 시각부터 셉니다.
+            timed_out = now - np.where(np.isnan(last), self.start_clock, last) >= self.timeout_limit
+            # 상태가 바뀐 규칙만 파이썬으로 처리 (시간 기반 고장은 값 없음)
+            for ids, faulted in ((self.stuck_ids, stuck), (self.timeout_ids, timed_out)):
+                for k in np.flatnonzero(faulted != self.is_active[ids]).tolist():
+                    self._set_state(int(ids[k]), bool(faulted[k]), now, float("nan"))
+            self.evaluations += len(self.stuck_ids) + len(self.timeout_ids)
+
+    # ---------- 조회 ----------
+    def pop_changes(self):
+        """마지막 호출 이후 발생/해제된 규칙 번호 집합을 반환합니다."""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            return changed
+
+    def active_faults(self):
+        """현재 고장 중인 [(규칙, 디코딩 키, 발생 시각, 발생 값)] (발생 시각순)."""
+        with self._lock:
+            items = sorted(self.active.items(), key=lambda kv: kv[1][0])
+        return [(self.rules[i], self.rule_keys[i], ts, value) for i, (ts, value) in items]
+
+    def reset(self):
+        with self._lock:
+            self.last_value[:] = np.nan
+            self.last_ts[:] = np.nan
+            self.is_active[:] = False
+            self.stuck_since[:] = np.nan
+            self.stuck_low = [np.nan] * len(self.stuck_ids)
+            self.stuck_high = [np.nan] * len(self.stuck_ids)
+            self.active.clear()
+            self.events.clear()
+            self._changed.clear()
+            self.clock = self.start_clock = self._clock_wall = None
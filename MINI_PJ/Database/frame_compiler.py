@@ -0,0 +1,213 @@
+# frame_compiler.py
+"""frame_id별 전용 디코더 함수를 소스 코드로 생성해 컴파일합니다.
+
+DecodePlan의 FramePlan 하나마다 아래와 같은 함수를 만들어 두고,
+수신 프레임은 {frame_id: 함수} dict 조회 한 번으로 바로 디코딩합니다.
+
+    def decode_0x1A0(data):
+        if len(data) != 8:
+            data = bytes(data[:8]).ljust(8, b"\\x00")
+        le = int.from_bytes(data, "little")
+        return {
+            1201: ((le >> 0) & 0xffff) * 0.25 + 0.0,  # EngRpm
+            ...
+        }
+
+시그널 위치/길이/스케일이 모두 상수로 풀려 있어 프레임 한 개씩 처리할 때
+numpy 배치 디코딩(decode_engine.decode_frames)의 호출 오버헤드가 없습니다.
+컴파일 결과는 카탈로그 해시(plan_hash)로 캐시합니다.
+"""
+
+import hashlib
+import math
+
+import numpy as np
+
+# ============================================
+# ⚙️ 설정
+# ============================================
+MIN_PAYLOAD_BYTES = 8  # 디코더가 읽는 최소 바이트 수 (짧은 프레임은 0으로 채움)
+MAX_SIGNAL_BITS = 64  # decode_engine과 같은 64비트 마스크 한계
+
+
+# ============================================
+# 🔑 카탈로그 해시
+# ============================================
+def plan_hash(plan):
+    """DecodePlan의 디코딩 파라미터만으로 만든 SHA-1 해시 (같은 카탈로그면 같은 값)."""
+    h = hashlib.sha1()
+    for frame_id in sorted(plan.frames):
+        fp = plan.frames[frame_id]
+        h.update(repr((frame_id, fp.keys)).encode("utf-8"))
+        for arr in (fp.lo, fp.length, fp.big, fp.signed, fp.factor, fp.offset):
+            h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()
+
+
+# ============================================
+# 🛠️ 소스 생성
+# ============================================
+def _payload_width(frame_plan):
+    """시그널이 닿는 마지막 바이트까지 포함하는 바이트 수."""
+    ends = frame_plan.lo.astype(np.int64) + frame_plan.length.astype(np.int64)
+    last = int(ends.max()) if len(ends) else 0
+    return max(MIN_PAYLOAD_BYTES, -(-last // 8))
+
+
+def _raw_expr(lo, length, big, width):
+    """raw 정수값을 꺼내는 식. Motorola는 big-endian 정수에서 LSB 위치를 계산합니다."""
+    mask = (1 << min(length, MAX_SIGNAL_BITS)) - 1
+    if lo < 0 or length <= 0:
+        return "0"
+    if big:
+        shift = width * 8 - lo - length  # 선형 MSB 위치 lo → big-endian 정수의 LSB 쪽 시프트
+        if shift < 0:
+            return "0"
+        return f"((be >> {shift}) & {mask:#x})"
+    return f"((le >> {lo}) & {mask:#x})"
+
+
+def _float_literal(value):
+    """float 상수를 소스 식으로. repr(inf)/repr(nan)은 이름이 되어 NameError가 나므로 float('...')로 씁니다."""
+    if math.isfinite(value):
+        return repr(value)
+    return f"float({str(value)!r})"
+
+
+def _comment_text(name):
+    """시그널 이름을 주석에 넣을 수 있게 개행 등 제어 문자를 이스케이프합니다."""
+    return repr(str(name))[1:-1]
+
+
+def _signal_expr(lo, length, big, signed, factor, offset, width):
+    expr = _raw_expr(lo, length, big, width)
+    if signed and expr != "0":
+        sign_bit = 1 << (min(length, MAX_SIGNAL_BITS) - 1)
+        expr = f"(({expr} ^ {sign_bit:#x}) - {sign_bit:#x})"
+    return f"{expr} * {_float_literal(factor)} + {_float_literal(offset)}"
+
+
+def generate_source(frame_plan, func_name=None):
+    """FramePlan 하나의 전용 디코더 함수 소스를 만듭니다."""
+    func_name = func_name or f"decode_{frame_plan.frame_id:#x}"
+    width = _payload_width(frame_plan)
+    big = frame_plan.big.tolist()
+
+    lines = [
+        f"def {func_name}(data):",
+        f"    if len(data) != {width}:",
+        f"        data = bytes(data[:{width}]).ljust({width}, b'\\x00')",
+    ]
+    if not all(big):
+        lines.append("    le = int.from_bytes(data, 'little')")
+    if any(big):
+        lines.append("    be = int.from_bytes(data, 'big')")
+    lines.append("    return {")
+    for i, key in enumerate(frame_plan.keys):
+        expr = _signal_expr(
+            int(frame_plan.lo[i]), int(frame_plan.length[i]), big[i], bool(frame_plan.signed[i]),
+            float(frame_plan.factor[i]), float(frame_plan.offset[i]), width,
+        )
+        comment = f"  # {_comment_text(frame_plan.names[i])}" if frame_plan.names else ""
+        lines.append(f"        {key!r}: {expr},{comment}")
+    lines.append("    }")
+    return "\n".join(lines) + "\n"
+
+
+def compile_frame(frame_plan):
+    """FramePlan 하나를 함수 객체로 컴파일합니다."""
+    func_name = f"decode_{frame_plan.frame_id:#x}"
+    source = generate_source(frame_plan, func_name)
+    namespace = {}
+    exec(compile(source, f"<frame_compiler {frame_plan.frame_id:#x}>", "exec"), namespace)
+    return namespace[func_name]
+
+
+# ============================================
+# 🚀 컴파일된 디코더 묶음
+# ============================================
+class CompiledDecoder:
+    """frame_id → 전용 디코더 함수 dict.
+
+    함수는 해당 frame_id가 처음 들어올 때 컴파일합니다 (실제 버스에는 카탈로그 일부만 흐르므로).
+    카탈로그에 없는 frame_id는 None으로 기록해 두고 건너뜁니다.
+    """
+
+    def __init__(self, plan, catalog_hash=None):
+        self.plan = plan
+        self.catalog_hash = catalog_hash or plan_hash(plan)
+        self.functions = {}
+
+    def __contains__(self, frame_id):
+        return frame_id in self.plan.frames
+
+    def function_for(self, frame_id):
+        try:
+            return self.functions[frame_id]
+        except KeyError:
+            frame_plan = self.plan.frames.get(frame_id)
+            func = compile_frame(frame_plan) if frame_plan is not None else None
+            self.functions[frame_id] = func
+            return func
+
+    def compile_all(self):
+        """모든 frame_id를 미리 컴파일합니다."""
+        for frame_id in self.plan.frames:
+            self.function_for(frame_id)
+        return self
+
+    def decode(self, frame_id, data):
+        """프레임 한 개를 {시그널 키: 물리값}으로 디코딩합니다. 모르는 frame_id면 None."""
+        func = self.function_for(frame_id)
+        return func(data) if func is not None else None
+
+    def decode_frames(self, timestamps, frame_ids, payloads):
+        """decode_engine.decode_frames와 같은 {키: (timestamps, values)} 형식으로 디코딩합니다.
+
+        프레임마다 함수 하나를 부르므로 작은 배치(실시간 수신)에 적합합니다.
+        """
+        functions = self.functions
+        columns = {}
+        for ts, frame_id, data in zip(np.asarray(timestamps, dtype=np.float64).tolist(),
+                                      np.asarray(frame_ids, dtype=np.int64).tolist(),
+                                      _iter_payload_bytes(payloads)):
+            try:
+                func = functions[frame_id]
+            except KeyError:
+                func = self.function_for(frame_id)
+            if func is None:
+                continue
+            for key, value in func(data).items():
+                col = columns.get(key)
+                if col is None:
+                    col = columns[key] = ([], [])
+                col[0].append(ts)
+                col[1].append(value)
+        return {
+            key: (np.asarray(ts, dtype=np.float64), np.asarray(values, dtype=np.float64))
+            for key, (ts, values) in columns.items()
+        }
+
+
+def _iter_payload_bytes(payloads):
+    """(N, P) uint8 행렬이면 행별 bytes로, 아니면 그대로 순회합니다."""
+    if isinstance(payloads, np.ndarray):
+        matrix = np.ascontiguousarray(payloads, dtype=np.uint8)
+        raw = matrix.tobytes()
+        width = matrix.shape[1]
+        return (raw[i:i + width] for i in range(0, len(raw), width))
+    return iter(payloads)
+
+
+_COMPILED_CACHE = {}
+
+
+def get_compiled_decoder(plan):
+    """plan에 대한 CompiledDecoder를 반환합니다. 카탈로그 해시가 같으면 캐시를 재사용합니다."""
+    key = plan_hash(plan)
+    decoder = _COMPILED_CACHE.get(key)
+    if decoder is None:
+        _COMPILED_CACHE.clear()  # 카탈로그는 하나만 유지
+        decoder = CompiledDecoder(plan, key)
+        _COMPILED_CACHE[key] = decoder
+    return decoder
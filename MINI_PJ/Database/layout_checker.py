@@ -0,0 +1,124 @@
+# layout_checker.py
+"""메시지별 시그널 비트 배치 검사 (겹침 / 범위 초과 / 빈 비트).
+
+카탈로그 전체 마스크((시그널 수, 64) uint8)를 message_id로 정렬한 뒤
+np.bitwise_or.reduceat 으로 메시지별 합집합을 한 번에 구하고, popcount 합과 비교해
+겹침이 있는 메시지만 골라냅니다. 시그널 쌍 비교는 겹침이 있는 메시지에서만 합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bit_mask import CANFD_PAYLOAD_BYTES, get_mask_table
+
+# ============================================
+# ⚙️ 설정
+# ============================================
+MAX_SIGNAL_BITS = 64  # 디코더가 다룰 수 있는 시그널 최대 길이
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+_HIGHEST_BIT = np.array([max(i.bit_length() - 1, 0) for i in range(256)], dtype=np.int64)
+
+REPORT_COLUMNS = [
+    "message_id", "message_name", "frame_id", "n_signals", "payload_bytes", "used_bits",
+    "overlap_bits", "overlaps", "out_of_range", "gap_bits",
+]
+
+
+def popcount_rows(masks):
+    """(N, 바이트 수) uint8 마스크의 행별 1 비트 개수."""
+    return _POPCOUNT[masks].sum(axis=1, dtype=np.int64)
+
+
+def _payload_bytes(df):
+    """메시지 길이(바이트). dlc 컬럼이 없으면 CAN FD 최대 길이로 봅니다."""
+    if "dlc" in df:
+        dlc = pd.to_numeric(df["dlc"], errors="coerce").fillna(CANFD_PAYLOAD_BYTES)
+        return np.clip(dlc.to_numpy(dtype=np.int64), 0, CANFD_PAYLOAD_BYTES)
+    return np.full(len(df), CANFD_PAYLOAD_BYTES, dtype=np.int64)
+
+
+# ============================================
+# 🔍 카탈로그 전체 검사
+# ============================================
+def check_layouts(df_all, mask_table=None, key="message_id"):
+    """메시지마다 겹침/범위 초과/빈 비트를 계산한 DataFrame을 반환합니다.
+
+    - overlap_bits: 두 개 이상의 시그널이 함께 쓰는 비트 수 (중복 포함)
+    - overlaps: 겹치는 시그널 쌍 ["A & B", ...]
+    - out_of_range: 메시지 길이(dlc) 밖이거나 64바이트/64비트 한계를 넘는 시그널 이름
+    - gap_bits: 마지막으로 사용한 비트까지 중 어느 시그널도 쓰지 않는 비트 수
+    """
+    if df_all.empty:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    if mask_table is None:
+        mask_table = get_mask_table(df_all)
+    masks = mask_table.masks  # df_all 행 순서와 같음
+
+    group_key = df_all[key].to_numpy()
+    order = np.argsort(group_key, kind="stable")
+    sorted_key = group_key[order]
+    starts = np.flatnonzero(np.r_[True, sorted_key[1:] != sorted_key[:-1]])
+    sorted_masks = masks[order]
+
+    # 1) 메시지별 합집합과 비트 수 합 → 합이 더 크면 겹침
+    union = np.bitwise_or.reduceat(sorted_masks, starts, axis=0)
+    bits = popcount_rows(sorted_masks)
+    union_bits = popcount_rows(union)
+    overlap_bits = np.add.reduceat(bits, starts) - union_bits
+
+    # 2) 범위 초과: 잘려 나간 비트가 있거나(64바이트 밖/음수 위치) dlc 밖 바이트를 쓰는 시그널
+    length = df_all["bit_length"].to_numpy(dtype=np.int64)[order]
+    payload = _payload_bytes(df_all)[order]
+    byte_idx = np.arange(masks.shape[1])
+    beyond_dlc = ((sorted_masks != 0) & (byte_idx >= payload[:, None])).any(axis=1)
+    bad = (bits != length) | (length <= 0) | (length > MAX_SIGNAL_BITS) | beyond_dlc
+
+    # 3) 빈 비트: 0번 비트부터 가장 높은 사용 비트까지 중 어느 시그널도 쓰지 않는 비트
+    used_bytes = np.where(union.any(axis=1), masks.shape[1] - np.argmax(union[:, ::-1] != 0, axis=1), 0)
+    top_byte = union[np.arange(len(union)), np.maximum(used_bytes - 1, 0)]
+    highest_bit = (used_bytes - 1) * 8 + _HIGHEST_BIT[top_byte]
+    gap_bits = np.where(used_bytes > 0, highest_bit + 1 - union_bits, 0)
+
+    names = df_all["name"].to_numpy()[order]
+    ends = np.r_[starts[1:], len(order)]
+    first_rows = df_all.iloc[order[starts]]
+
+    overlaps = [[] for _ in starts]
+    for g in np.flatnonzero(overlap_bits > 0):
+        s, e = starts[g], ends[g]
+        group = sorted_masks[s:e]
+        # 겹침이 있는 메시지에서만 시그널 쌍 AND 비교
+        pair = (group[:, None, :] & group[None, :, :]).any(axis=2)
+        i, j = np.nonzero(np.triu(pair, k=1))
+        overlaps[g] = [f"{names[s + a]} & {names[s + b]}" for a, b in zip(i.tolist(), j.tolist())]
+
+    out_of_range = [names[s:e][bad[s:e]].tolist() for s, e in zip(starts, ends)]
+
+    return pd.DataFrame({
+        "message_id": sorted_key[starts],
+        "message_name": first_rows["message_name"].to_numpy() if "message_name" in df_all else None,
+        "frame_id": first_rows["frame_id"].to_numpy() if "frame_id" in df_all else None,
+        "n_signals": ends - starts,
+        "payload_bytes": payload[starts],
+        "used_bits": union_bits,
+        "overlap_bits": overlap_bits,
+        "overlaps": overlaps,
+        "out_of_range": out_of_range,
+        "gap_bits": gap_bits,
+    }, columns=REPORT_COLUMNS)
+
+
+def layout_issues(report):
+    """겹침 또는 범위 초과가 있는 메시지만 남깁니다."""
+    has_range = report["out_of_range"].map(len) > 0
+    return report[(report["overlap_bits"] > 0) | has_range]
+
+
+def summarize_layout(report):
+    """상태 표시줄용 한 줄 요약."""
+    n_overlap = int((report["overlap_bits"] > 0).sum())
+    n_range = int((report["out_of_range"].map(len) > 0).sum())
+    if not n_overlap and not n_range:
+        return f"레이아웃 검사: 메시지 {len(report)}개 이상 없음"
+    return f"레이아웃 경고: 비트 겹침 {n_overlap}개, 범위 초과 {n_range}개 메시지 (총 {len(report)}개)"
@@ -0,0 +1,281 @@
+# live_stream.py
+"""실시간 CAN 스트림을 카탈로그 기준으로 디코딩해 시그널별 링 버퍼에 쌓습니다.
+
+프레임 수신과 디코딩은 워커 스레드에서 배치 단위로 처리하고,
+GUI는 pop_updates()로 마지막 호출 이후 바뀐 시그널만 모아서 가져갑니다.
+"""
+
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+from can_log_reader import parse_candump_block
+from decode_engine import decode_frames
+from frame_compiler import get_compiled_decoder
+
+# ============================================
+# ⚙️ 설정
+# ============================================
+DEFAULT_RING_CAPACITY = 4096  # 시그널별로 보관하는 최근 샘플 수
+BATCH_MAX_FRAMES = 2000  # 한 번에 디코딩할 최대 프레임 수
+BATCH_TIMEOUT_SEC = 0.02  # 프레임이 적을 때도 이 시간마다 배치를 끊어서 디코딩
+COMPILED_MAX_FRAMES = 1000  # 이보다 작은 배치는 frame_id별 생성 디코더로, 큰 배치는 numpy 일괄 디코딩으로
+
+
+# ============================================
+# 🔄 시그널별 링 버퍼
+# ============================================
+class RingBuffer:
+    """고정 크기 (timestamp, value) 링 버퍼. 오래된 샘플부터 덮어씁니다."""
+
+    def __init__(self, capacity=DEFAULT_RING_CAPACITY):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.head = 0  # 다음에 쓸 위치
+        self.total = 0  # 지금까지 들어온 샘플 수
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def extend(self, ts, values):
+        n = len(ts)
+        if n >= self.capacity:
+            # 용량보다 많이 들어오면 마지막 capacity개만 남깁니다.
+            self.ts[:] = ts[-self.capacity:]
+            self.values[:] = values[-self.capacity:]
+            self.head = 0
+        else:
+            end = self.head + n
+            if end <= self.capacity:
+                self.ts[self.head:end] = ts
+                self.values[self.head:end] = values
+            else:
+                split = self.capacity - self.head
+                self.ts[self.head:] = ts[:split]
+                self.values[self.head:] = values[:split]
+                self.ts[:end - self.capacity] = ts[split:]
+                self.values[:end - self.capacity] = values[split:]
+            self.head = end % self.capacity
+        self.total += n
+
+    def latest(self):
+        if not self.total:
+            return None, None
+        i = (self.head - 1) % self.capacity
+        return self.ts[i], self.values[i]
+
+    def snapshot(self):
+        """오래된 것부터 시간순으로 정렬된 (ts, values) 복사본을 반환합니다."""
+        if self.total < self.capacity:
+            return self.ts[:self.head].copy(), self.values[:self.head].copy()
+        order = np.r_[self.head:self.capacity, 0:self.head]
+        return self.ts[order], self.values[order]
+
+
+# ============================================
+# 📡 프레임 소스
+# ============================================
+class CanBusSource:
+    """python-can 버스(기본: 같은 프로세스 안의 virtual 버스)에서 프레임을 읽습니다."""
+
+    def __init__(self, channel="vcan0", interface="virtual", **kwargs):
+        try:
+            import can
+        except ImportError:
+            raise RuntimeError("python-can 패키지가 필요합니다: pip install python-can")
+        self.bus = can.Bus(channel=channel, interface=interface, **kwargs)
+
+    def read_batch(self, max_frames, timeout):
+        deadline = time.monotonic() + timeout
+        ts, ids, payloads = [], [], []
+        msg = self.bus.recv(timeout)
+        while msg is not None:
+            if not msg.is_error_frame and not msg.is_remote_frame:
+                ts.append(msg.timestamp)
+                ids.append(msg.arbitration_id)
+                payloads.append(bytes(msg.data))
+            if len(ts) >= max_frames:
+                break
+            remaining = deadline - time.monotonic()
+            msg = self.bus.recv(remaining if remaining > 0 else 0.0)
+        return _frames_from_lists(ts, ids, payloads)
+
+    def close(self):
+        self.bus.shutdown()
+
+
+class CandumpStreamSource:
+    """candump -l 형식 텍스트를 내보내는 스트림(TCP 소켓/파이프/stdin)에서 프레임을 읽습니다.
+
+    예) candump -L can0 | nc -l 29536  →  CandumpStreamSource.connect("127.0.0.1", 29536)
+    """
+
+    def __init__(self, raw_stream, closer=None):
+        self.stream = raw_stream  # read(n)을 지원하는 바이너리 스트림
+        self.closer = closer
+        self.pending = bytearray()  # 받은 바이트 (뒤에 붙이고 앞에서 잘라 내므로 bytes 재할당이 없음)
+        self.reader_thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.lock = threading.Lock()
+        self.data_ready = threading.Event()
+        self.eof = False
+        self.reader_thread.start()
+
+    @classmethod
+    def connect(cls, host, port):
+        sock = socket.create_connection((host, port))
+        return cls(sock.makefile("rb", buffering=0), closer=sock.close)
+
+    @classmethod
+    def stdin(cls):
+        return cls(sys.stdin.buffer)
+
+    def _read_loop(self):
+        # 블로킹 read는 별도 스레드에서 하고, 받은 바이트만 모아 둡니다.
+        read = getattr(self.stream, "read1", self.stream.read)
+        try:
+            while True:
+                data = read(65536)
+                if not data:
+                    break
+                with self.lock:
+                    self.pending += data
+                self.data_ready.set()
+        except (OSError, ValueError):
+            pass
+        self.eof = True
+        self.data_ready.set()
+
+    def read_batch(self, max_frames, timeout):
+        self.data_ready.wait(timeout)
+        with self.lock:
+            # 완성된 줄을 최대 max_frames개까지만 잘라 냅니다.
+            cut = 0
+            for _ in range(max_frames):
+                nl = self.pending.find(b"\n", cut)
+                if nl < 0:
+                    break
+                cut = nl + 1
+            if self.eof and cut == 0:
+                cut = len(self.pending)  # 스트림이 끝났으면 줄바꿈 없는 마지막 줄도 처리
+            block = bytes(self.pending[:cut])
+            del self.pending[:cut]
+            if self.pending.find(b"\n") < 0 and not self.eof:
+                # 남은 것이 없거나 미완성 줄뿐이면 다음 수신까지 기다립니다 (busy-spin 방지).
+                self.data_ready.clear()
+        if not block:
+            if self.eof:
+                raise EOFError("스트림이 닫혔습니다.")
+            return None
+        chunk = parse_candump_block(block)
+        return chunk.timestamp, chunk.frame_id, chunk.payload
+
+    def close(self):
+        if self.closer is not None:
+            self.closer()
+
+
+def _frames_from_lists(ts, ids, payloads):
+    if not ts:
+        return None
+    matrix = np.zeros((len(payloads), max(8, max(len(p) for p in payloads))), dtype=np.uint8)
+    for i, p in enumerate(payloads):
+        matrix[i, :len(p)] = np.frombuffer(p, dtype=np.uint8)
+    return np.asarray(ts, dtype=np.float64), np.asarray(ids, dtype=np.int64), matrix
+
+
+# ============================================
+# ⚙️ 워커 스레드 디코더
+# ============================================
+class LiveDecoder:
+    """소스에서 프레임을 배치로 읽어 디코딩하고 시그널별 링 버퍼에 넣습니다."""
+
+    def __init__(self, plan, source, capacity=DEFAULT_RING_CAPACITY, store=None, faults=None):
+        self.plan = plan
+        self.compiled = get_compiled_decoder(plan)
+        self.source = source
+        self.capacity = capacity
+        self.store = store  # TimeSeriesStore를 주면 전체 이력도 함께 보관합니다.
+        self.faults = faults  # FaultEngine을 주면 배치마다 고장 규칙을 평가합니다.
+        self.buffers = {}  # 시그널 키 → RingBuffer
+        self.frames = 0
+        self.unknown_frames = 0
+        self.error = None
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._rate = (time.monotonic(), 0)  # (기준 시각, 기준 프레임 수)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.source.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                batch = self.source.read_batch(BATCH_MAX_FRAMES, BATCH_TIMEOUT_SEC)
+            except EOFError:
+                break
+            except Exception as e:
+                self.error = e
+                print(f"실시간 수신 에러: {e}")
+                break
+            if batch is not None and len(batch[0]):
+                self.feed(*batch)
+            if self.faults is not None:
+                self.faults.poll()  # 수신이 끊겨도 고착/타임아웃은 판정
+
+    def feed(self, timestamps, frame_ids, payloads):
+        """프레임 배치 하나를 디코딩해 링 버퍼에 추가합니다 (테스트/재생용으로도 직접 호출 가능)."""
+        if len(frame_ids) <= COMPILED_MAX_FRAMES:
+            decoded = self.compiled.decode_frames(timestamps, frame_ids, payloads)
+        else:
+            decoded = decode_frames(self.plan, timestamps, frame_ids, payloads)
+        known = np.isin(frame_ids, list(self.plan.frames))
+        with self._lock:
+            for key, (ts, values) in decoded.items():
+                buf = self.buffers.get(key)
+                if buf is None:
+                    buf = self.buffers[key] = RingBuffer(self.capacity)
+                buf.extend(ts, values.astype(np.float64, copy=False))
+            self._dirty.update(decoded)
+            self.frames += len(frame_ids)
+            self.unknown_frames += int((~known).sum())
+        if self.store is not None:
+            self.store.append_decoded(decoded)
+        if self.faults is not None:
+            self.faults.update(decoded)
+
+    def pop_updates(self):
+        """마지막 호출 이후 값이 바뀐 시그널의 {키: (마지막 ts, 마지막 값, 누적 샘플 수)}를 반환합니다."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return {key: (*self.buffers[key].latest(), self.buffers[key].total) for key in dirty}
+
+    def history(self, key):
+        with self._lock:
+            buf = self.buffers.get(key)
+            return buf.snapshot() if buf is not None else (np.empty(0), np.empty(0))
+
+    def frame_rate(self):
+        """직전 호출 이후의 초당 프레임 수."""
+        now = time.monotonic()
+        last_time, last_frames = self._rate
+        frames = self.frames
+        self._rate = (now, frames)
+        return (frames - last_frames) / max(now - last_time, 1e-6)
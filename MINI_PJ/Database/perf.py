@@ -0,0 +1,157 @@
+# perf.py
+"""핫패스 시간/횟수 계측.
+
+꺼져 있을 때는 timer()가 공용 빈 컨텍스트를, timed()가 원래 함수를 바로 호출하므로
+계측 코드를 남겨 두어도 비용이 거의 없습니다. 환경 변수 CAN_PERF=1 로 시작 시 켜거나
+enable()로 실행 중에 켤 수 있습니다.
+
+    with perf.timer("search.rows"):
+        ...
+
+    @perf.timed("lookup.can_id")
+    def get_can_id(...): ...
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# ============================================
+# ⚙️ 설정
+# ============================================
+WINDOW = 500  # 이름별로 보관하는 최근 측정값 개수 (rolling p50/p95 계산용)
+
+_enabled = os.environ.get("CAN_PERF", "") == "1"
+_lock = threading.Lock()
+_samples = {}  # 이름 → 최근 WINDOW개 소요 시간(초)
+_totals = {}  # 이름 → [누적 횟수, 누적 시간]
+_counters = {}  # 이름 → 횟수
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def is_enabled():
+    return _enabled
+
+
+# ============================================
+# ⏱️ 기록
+# ============================================
+def record(name, elapsed):
+    """name 구간에 elapsed초를 기록합니다. 꺼져 있으면 아무것도 하지 않습니다."""
+    if not _enabled:
+        return
+    with _lock:
+        samples = _samples.get(name)
+        if samples is None:
+            samples = _samples[name] = deque(maxlen=WINDOW)
+            _totals[name] = [0, 0.0]
+        samples.append(elapsed)
+        total = _totals[name]
+        total[0] += 1
+        total[1] += elapsed
+
+
+def count(name, n=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """with 문으로 감싼 구간의 소요 시간을 기록합니다."""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def timed(name):
+    """함수 호출 시간을 기록하는 데코레이터입니다."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# ============================================
+# 📊 조회/내보내기
+# ============================================
+def snapshot():
+    """이름별 통계(최근 WINDOW개 기준 p50/p95/max, 누적 횟수/평균)와 카운터를 반환합니다."""
+    with _lock:
+        samples = {name: np.fromiter(s, dtype=np.float64) for name, s in _samples.items()}
+        totals = {name: tuple(t) for name, t in _totals.items()}
+        counters = dict(_counters)
+
+    timings = []
+    for name in sorted(samples):
+        ms = samples[name] * 1000
+        n, total = totals[name]
+        timings.append({
+            "name": name,
+            "count": n,
+            "mean_ms": total * 1000 / n,
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+            "max_ms": float(ms.max()),
+        })
+    return {"timings": timings, "counters": counters}
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+        _counters.clear()
+
+
+def export_json(path, extra=None):
+    """현재 통계를 JSON 파일로 저장합니다. extra(예: DB 통계)는 그대로 함께 저장합니다."""
+    report = {"exported_at": time.strftime("%Y-%m-%d %H:%M:%S"), "window": WINDOW, **snapshot()}
+    if extra:
+        report.update(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
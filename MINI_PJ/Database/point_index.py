@@ -0,0 +1,50 @@
+# point_index.py
+
+import math
+from collections import defaultdict
+
+
+# ============================================
+# 🧭 캔버스 포인트 격자 공간 색인
+# ============================================
+class PointGrid:
+    """CarPoint들을 cell_size 크기 격자 칸에 나눠 담아 클릭 판정 시 주변 칸만 검사합니다.
+
+    cell_size를 클릭 반경 이상으로 잡으면 3x3 칸만 보면 되므로
+    포인트가 수백 개로 늘어나도 클릭 한 번의 비용은 거의 일정합니다.
+    """
+
+    def __init__(self, points=(), cell_size=40):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        for p in points:
+            self.add(p)
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def add(self, point):
+        self.cells[self._cell(point.x, point.y)].append(point)
+
+    def remove(self, point):
+        cell = self.cells.get(self._cell(point.x, point.y))
+        if cell and point in cell:
+            cell.remove(point)
+
+    def move(self, point, x, y):
+        self.remove(point)
+        point.x, point.y = x, y
+        self.add(point)
+
+    def nearest(self, x, y, radius):
+        """(x, y)에서 radius 미만 거리에 있는 가장 가까운 포인트를 반환합니다. 없으면 None."""
+        cx, cy = self._cell(x, y)
+        reach = max(1, math.ceil(radius / self.cell_size))
+        best, best_dist = None, radius
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                for p in self.cells.get((gx, gy), ()):
+                    dist = math.hypot(p.x - x, p.y - y)
+                    if dist < best_dist:
+                        best, best_dist = p, dist
+        return best
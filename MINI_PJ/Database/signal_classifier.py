@@ -0,0 +1,88 @@
+# signal_classifier.py
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# ============================================
+# ⚙️ 분류 규칙 테이블 (위에서부터 우선 적용)
+# ============================================
+DEFAULT_CATEGORY = "Other"
+NORMAL_STATUS = "작동(Normal)"
+ERROR_STATUS = "고장(Error)"
+
+CATEGORY_RULES = [
+    ("Front", r"Front|Head|Bonnet|Engine|F_|Hood|Wiper"),
+    ("Rear", r"Rear|Tail|Trunk|Back|R_Fog|Brake"),
+    ("Left", r"Left|_L_|Drvr|Driver|LH"),
+    ("Right", r"Right|_R_|Psngr|Pass|RH"),
+]
+
+STATUS_RULES = [
+    (ERROR_STATUS, r"Fail|Error|Open|Short|Fault|Warn|Abnormal|Err"),
+]
+
+
+def _apply_rules(names, rules, default):
+    """규칙을 순서대로 적용해 처음 일치한 라벨을 붙이고, 규칙별 적용 건수를 셉니다.
+
+    이미 라벨이 붙은 행은 다음 규칙에서 제외하므로 뒤 규칙일수록 검사 대상이 줄어듭니다.
+    """
+    labels = np.full(len(names), default, dtype=object)
+    remaining = np.arange(len(names))
+    hits = {}
+    for label, pattern in rules:
+        regex = re.compile(pattern, re.IGNORECASE)
+        matched = names.iloc[remaining].str.contains(regex, na=False).to_numpy(dtype=bool)
+        labels[remaining[matched]] = label
+        hits[label] = remaining[matched]
+        remaining = remaining[~matched]
+    return labels, hits
+
+
+def classify_signals(names, category_rules=CATEGORY_RULES, status_rules=STATUS_RULES):
+    """시그널 이름 전체를 한 번에 Category/Status로 분류합니다.
+
+    중복 이름은 한 번만 검사하며, 반환값은 (category, status, 규칙별 적용 건수) 입니다.
+    """
+    names = pd.Series(names, copy=False).fillna("").astype(str)
+    codes, uniques = pd.factorize(names)
+    uniques = pd.Series(uniques, dtype=object)
+
+    category, cat_hits = _apply_rules(uniques, category_rules, DEFAULT_CATEGORY)
+    status, status_hits = _apply_rules(uniques, status_rules, NORMAL_STATUS)
+
+    # 고유 이름 기준 결과를 원래 행으로 펼치고, 적용 건수도 행 기준으로 환산
+    rows_per_unique = np.bincount(codes, minlength=len(uniques))
+    hit_counts = {
+        label: int(rows_per_unique[idx].sum())
+        for hits in (cat_hits, status_hits)
+        for label, idx in hits.items()
+    }
+
+    index = names.index
+    return (
+        pd.Series(category[codes], index=index, name="Category"),
+        pd.Series(status[codes], index=index, name="Status"),
+        hit_counts,
+    )
+
+
+# ============================================
+# 🗂️ Category → Status → 이름 배열 그룹 색인
+# ============================================
+def group_names_by_status(df):
+    """Status별 시그널 이름 배열(원래 순서 유지) dict를 만듭니다."""
+    return {status: grp["name"].to_numpy() for status, grp in df.groupby("Status", sort=False)}
+
+
+def build_category_index(df_all):
+    """분류가 끝난 df_all을 Category → Status → 이름 배열로 한 번만 묶어 둡니다.
+
+    위치 분석 탭에서는 클릭할 때마다 DataFrame을 거르지 않고 이 dict를 조회만 합니다.
+    """
+    index = {}
+    for (category, status), grp in df_all.groupby(["Category", "Status"], sort=False):
+        index.setdefault(category, {})[status] = grp["name"].to_numpy()
+    return index
@@ -0,0 +1,213 @@
+# signal_search.py
+
+import heapq
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+# ============================================
+# 🔤 트라이그램 역색인
+# ============================================
+NGRAM = 3
+
+
+def _trigram_codes(buf):
+    """uint8 바이트 배열의 연속 3바이트를 24비트 정수 코드로 만듭니다."""
+    b = buf.astype(np.int32)
+    return (b[:-2] << 16) | (b[1:-1] << 8) | b[2:]
+
+
+def _first_of_run(sorted_values):
+    """정렬된 배열에서 같은 값이 연속된 구간의 첫 원소 위치를 True로 표시합니다."""
+    first = np.ones(len(sorted_values), dtype=bool)
+    first[1:] = sorted_values[1:] != sorted_values[:-1]
+    return first
+
+
+class TrigramIndex:
+    """문자열 컬럼 하나에 대한 대소문자 무시 부분 문자열 검색용 트라이그램 역색인.
+
+    모든 문자열을 소문자 UTF-8로 이어 붙인 뒤 트라이그램 코드를 NumPy로 한 번에
+    계산하므로, 행마다 파이썬 루프를 돌지 않고 색인을 만듭니다.
+    """
+
+    def __init__(self, texts):
+        lowered = pd.Series(texts, copy=False).fillna("").astype(str).str.lower()
+        self.texts = lowered.to_numpy(dtype=object)
+        self.lowered = lowered.reset_index(drop=True)
+
+        encoded = [t.encode("utf-8") for t in self.texts]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        # 행 사이에 구분자(0x00)를 넣어 행 경계를 넘는 트라이그램을 걸러냅니다.
+        buf = np.frombuffer(b"\x00".join(encoded) + b"\x00\x00\x00", dtype=np.uint8)
+        starts = np.cumsum(lengths + 1) - (lengths + 1)
+
+        # 각 행의 시작 위치마다 (길이 + 1)개의 코드가 대응하도록 잘라 씁니다.
+        row = np.repeat(np.arange(len(lengths)), lengths + 1)
+        codes = _trigram_codes(buf)[:len(row)]
+        valid = np.arange(len(codes)) - starts[row] + NGRAM <= lengths[row]
+        codes, row = codes[valid], row[valid]
+
+        # (코드, 행) 쌍을 정렬·중복 제거해 코드별 posting list 구간을 만듭니다.
+        pairs = np.sort((codes.astype(np.int64) << 32) | row)
+        pairs = pairs[_first_of_run(pairs)]
+        self.rows = (pairs & 0xFFFFFFFF).astype(np.int32)
+        pair_codes = pairs >> 32
+        offsets = np.flatnonzero(_first_of_run(pair_codes))
+        self.keys = pair_codes[offsets]
+        self.offsets = np.append(offsets, len(pairs))
+        # 행별 고유 트라이그램 개수 (유사도 정규화용)
+        self.trigram_counts = np.bincount(self.rows, minlength=len(self.texts))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def postings(self, code):
+        i = np.searchsorted(self.keys, code)
+        if i >= len(self.keys) or self.keys[i] != code:
+            return np.empty(0, dtype=np.int32)
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+    def search(self, keyword):
+        """keyword를 (대소문자 무시) 포함하는 행 번호 배열을 오름차순으로 반환합니다."""
+        needle = keyword.lower()
+        query = np.frombuffer(needle.encode("utf-8"), dtype=np.uint8)
+        if len(query) < NGRAM:
+            # 1~2바이트 검색어는 트라이그램이 없으므로 전체 스캔
+            mask = self.lowered.str.contains(needle, regex=False).to_numpy(dtype=bool)
+            return np.flatnonzero(mask)
+
+        lists = sorted((self.postings(c) for c in np.unique(_trigram_codes(query))), key=len)
+        candidates = lists[0]
+        for plist in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, plist, assume_unique=True)
+
+        # 트라이그램이 모두 있어도 순서가 다를 수 있으므로 실제 포함 여부를 확인
+        return self.filter(candidates, needle)
+
+    def fuzzy_search(self, query, k=20, max_candidates=300):
+        """오타/축약을 허용하는 유사도 검색으로 상위 k개의 (행 번호, 점수)를 반환합니다.
+
+        1) 공유 트라이그램 수(Dice 계수)로 후보를 max_candidates개까지 추리고
+        2) 후보만 SequenceMatcher로 재채점해 크기 k의 힙으로 상위 결과를 고릅니다.
+        """
+        needle = query.lower()
+        query_bytes = np.frombuffer(needle.encode("utf-8"), dtype=np.uint8)
+        if len(query_bytes) < NGRAM:
+            candidates = self.search(needle)[:max_candidates]
+        else:
+            q_codes = np.unique(_trigram_codes(query_bytes))
+            hits = [self.postings(c) for c in q_codes]
+            hits = np.concatenate(hits) if hits else np.empty(0, np.int32)
+            if not len(hits):
+                return []
+            shared = np.bincount(hits, minlength=len(self.texts))
+            touched = np.flatnonzero(shared)
+            dice = 2.0 * shared[touched] / (len(q_codes) + self.trigram_counts[touched])
+            if len(touched) > max_candidates:
+                top = np.argpartition(dice, -max_candidates)[-max_candidates:]
+                touched = touched[top]
+            candidates = touched
+
+        texts = self.texts
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(needle)
+
+        def score(i):
+            text = texts[i]
+            matcher.set_seq1(text)
+            ratio = matcher.ratio()
+            # 부분 문자열로 포함되면 가산점 (짧은 검색어가 긴 이름에 들어있는 경우), 0~1로 정규화
+            return (ratio + (0.5 if needle in text else 0.0)) / 1.5
+
+        scored = ((score(i), i) for i in candidates.tolist())
+        return [(i, sc) for sc, i in heapq.nlargest(k, scored)]
+
+    def filter(self, rows, keyword):
+        """rows 중 keyword를 (대소문자 무시) 포함하는 행만 남깁니다."""
+        needle = keyword.lower()
+        texts = self.texts
+        keep = [i for i in np.asarray(rows).tolist() if needle in texts[i]]
+        return np.asarray(keep, dtype=np.int64)
+
+
+# ============================================
+# 🔍 시그널/메시지 이름 검색
+# ============================================
+class SignalSearchIndex:
+    """df_all의 시그널 이름과 메시지 이름에 대한 트라이그램 색인 묶음."""
+
+    def __init__(self, df_all, fields=("name", "message_name")):
+        self.df_all = df_all
+        self.indexes = {f: TrigramIndex(df_all[f]) for f in fields if f in df_all}
+
+    def search_rows(self, keyword, fields=("name",)):
+        """keyword를 포함하는 행 위치(iloc) 배열을 반환합니다."""
+        found = [self.indexes[f].search(keyword) for f in fields if f in self.indexes]
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return found[0] if len(found) == 1 else np.unique(np.concatenate(found))
+
+    def search(self, keyword, fields=("name",)):
+        """keyword를 포함하는 df_all 부분 DataFrame을 반환합니다."""
+        return self.df_all.iloc[self.search_rows(keyword, fields)]
+
+    def fuzzy_rows(self, query, k=20, field="name"):
+        """유사도 상위 k개의 행 위치 배열과 점수 배열을 점수 내림차순으로 반환합니다."""
+        found = self.indexes[field].fuzzy_search(query, k)
+        rows = np.array([i for i, _ in found], dtype=np.int64)
+        scores = np.array([sc for _, sc in found], dtype=np.float64)
+        return rows, scores
+
+    def fuzzy_search(self, query, k=20, field="name"):
+        """유사도 상위 k개 시그널을 score 컬럼과 함께 DataFrame으로 반환합니다."""
+        rows, scores = self.fuzzy_rows(query, k, field)
+        result = self.df_all.iloc[rows].copy()
+        result["score"] = scores
+        return result
+
+
+# ============================================
+# ⌨️ 입력 중 검색 (점진적 좁히기 + 최근 결과 LRU)
+# ============================================
+class SearchSession:
+    """검색어가 이전 검색어를 포함하면 이전 결과 안에서만 다시 거르고,
+    최근 검색 결과는 LRU로 보관해 백스페이스 시 바로 돌려줍니다.
+    """
+
+    # 이전 결과가 이보다 많으면 거르기보다 색인 조회가 더 빠릅니다.
+    REFINE_LIMIT = 20_000
+
+    def __init__(self, index: SignalSearchIndex, field="name", cache_size=32):
+        self.index = index.indexes[field]
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # 소문자 검색어 → 행 위치 배열
+        self._last_key = None
+        self._lock = threading.Lock()
+
+    def search_rows(self, keyword):
+        key = keyword.lower()
+        with self._lock:
+            rows = self._cache.get(key)
+            if rows is not None:
+                self._cache.move_to_end(key)
+                self._last_key = key
+                return rows
+            base = self._cache.get(self._last_key) if self._last_key else None
+
+        if base is not None and self._last_key in key and len(base) <= self.REFINE_LIMIT:
+            rows = self.index.filter(base, key)
+        else:
+            rows = self.index.search(key)
+
+        with self._lock:
+            self._cache[key] = rows
+            self._last_key = key
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rows
@@ -0,0 +1,104 @@
+# test_bit_mask.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from bit_mask import (
+    compute_byte_masks, get_mask_table, is_big_endian, masks_to_uint64, motorola_msb_position,
+    payload_size_for,
+)
+
+
+def _reference_mask(start, length, big, payload_bytes):
+    """비트를 하나씩 따라가며 만든 기준 마스크 (Motorola는 DBC 톱니형 번호)."""
+    mask = [0] * payload_bytes
+    bit = start
+    for _ in range(length):
+        byte, pos = divmod(bit, 8)
+        if 0 <= byte < payload_bytes:
+            mask[byte] |= 1 << pos
+        if big:
+            bit = bit - 1 if pos else bit + 15
+        else:
+            bit += 1
+    return mask
+
+
+def test_intel_mask():
+    masks = compute_byte_masks([4], [12], False, 8)
+    assert masks[0].tolist() == [0xF0, 0xFF, 0, 0, 0, 0, 0, 0]
+
+
+def test_motorola_mask():
+    # start 7(MSB) 16비트 → 0, 1번 바이트 전체
+    assert compute_byte_masks([7], [16], True, 8)[0].tolist() == [0xFF, 0xFF, 0, 0, 0, 0, 0, 0]
+    # start 3 길이 6 → 0번 바이트 하위 4비트 + 1번 바이트 상위 2비트
+    assert compute_byte_masks([3], [6], True, 8)[0].tolist() == [0x0F, 0xC0, 0, 0, 0, 0, 0, 0]
+
+
+def test_masks_match_bitwise_reference():
+    rng = np.random.default_rng(1)
+    n = 500
+    start = rng.integers(0, 512, n)
+    length = rng.integers(1, 65, n)
+    big = rng.random(n) < 0.5
+    masks = compute_byte_masks(start, length, big, 64)
+    for i in range(n):
+        expected = _reference_mask(int(start[i]), int(length[i]), bool(big[i]), 64)
+        assert masks[i].tolist() == expected, (start[i], length[i], big[i])
+
+
+def test_canfd_payload_and_truncation():
+    masks = compute_byte_masks([500, 60 * 8], [16, 8], False, 64)
+    assert masks[0, 62:].tolist() == [0xF0, 0xFF]  # 512비트를 넘는 부분은 잘림
+    assert masks[1, 60] == 0xFF
+    assert compute_byte_masks([60], [8], False, 8)[0].tolist() == [0] * 7 + [0xF0]
+
+
+def test_is_big_endian():
+    assert is_big_endian("big_endian") and is_big_endian("0") and not is_big_endian("little_endian")
+    assert is_big_endian(np.array(["1", " Motorola ", "big_endian"])).tolist() == [False, True, True]
+
+
+def test_motorola_msb_position():
+    assert motorola_msb_position([7, 0, 15, 8]).tolist() == [0, 7, 8, 15]
+
+
+def test_masks_to_uint64_and_payload_size():
+    masks = compute_byte_masks([0, 56], [8, 8], False, 64)
+    assert masks_to_uint64(masks).tolist() == [0xFF, 0xFF << 56]
+    assert payload_size_for(compute_byte_masks([100], [8], False, 64)[0]) == 16
+    assert payload_size_for(np.zeros(64, np.uint8)) == 8
+
+
+@pytest.fixture
+def catalog():
+    return pd.DataFrame({
+        "id": [10, 11, 12],
+        "name": ["A", "B", "C"],
+        "start_bit": [0, 8, 7],
+        "bit_length": [8, 4, 16],
+        "byte_order": ["little_endian", "little_endian", "big_endian"],
+    })
+
+
+def test_mask_table_lookup(catalog):
+    table = get_mask_table(catalog)
+    assert len(table) == 3
+    assert table.get(11)[:2].tolist() == [0x00, 0x0F]
+    assert table.find("C", 7, 16)[:2].tolist() == [0xFF, 0xFF]
+    assert table.get(99) is None
+    assert table.as_uint64()[0] == 0xFF
+
+
+def test_mask_table_cache_is_order_sensitive(catalog):
+    table = get_mask_table(catalog)
+    assert get_mask_table(catalog.copy()) is table
+    reordered = catalog.iloc[::-1].reset_index(drop=True)
+    other = get_mask_table(reordered)
+    assert other is not table
+    assert other.masks[0].tolist() == table.masks[2].tolist()  # 행 위치가 df 순서를 따름
+    # 중복 행 쌍이 서로 상쇄되는 키면 [A, B, B, C]와 [A, C, C, C]가 같아짐
+    abbc = catalog.iloc[[0, 1, 1, 2]].reset_index(drop=True)
+    accc = catalog.iloc[[0, 2, 2, 2]].reset_index(drop=True)
+    assert get_mask_table(abbc) is not get_mask_table(accc)
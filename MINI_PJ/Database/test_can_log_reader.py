@@ -0,0 +1,61 @@
+# test_can_log_reader.py
+import numpy as np
+
+from can_log_reader import iter_log_chunks, parse_asc_block, parse_candump_block
+
+
+def test_parse_candump_classic_and_fd():
+    block = (
+        b"(1.000000) can0 123#1122334455667788\n"
+        b"(1.500000) can1 1ABCDEF0##1" + b"AB" * 12 + b"\n"
+        b"(2.000000) can0 7FF#\n"
+    )
+    chunk = parse_candump_block(block)
+    np.testing.assert_allclose(chunk.timestamp, [1.0, 1.5, 2.0])
+    assert chunk.frame_id.tolist() == [0x123, 0x1ABCDEF0, 0x7FF]
+    assert chunk.is_extended.tolist() == [False, True, False]
+    assert chunk.dlc.tolist() == [8, 12, 0]
+    assert chunk.payload.shape == (3, 64)
+    assert chunk.payload[0, :8].tolist() == [0x11, 0x22, 0x33, 0x44, 0x55, 0x66, 0x77, 0x88]
+    assert chunk.payload[1, :12].tolist() == [0xAB] * 12
+
+
+def test_parse_asc_drops_malformed_lines():
+    block = (
+        b"   0.010000 1  123             Rx   d 2 0A 0B\n"
+        b"   0.020000 1  Statistic: D 0 R 0\n"
+        b"   0.030000 2  1A0x            Tx   d 1 FF\n"
+        b"   0.040000 1  12              Rx   d 8 01 02 03\n"  # dlc보다 짧게 잘린 줄
+    )
+    chunk = parse_asc_block(block, width=8)
+    np.testing.assert_allclose(chunk.timestamp, [0.01, 0.03])
+    assert chunk.frame_id.tolist() == [0x123, 0x1A0]
+    assert chunk.is_extended.tolist() == [False, True]
+    assert chunk.payload[0, :2].tolist() == [0x0A, 0x0B]
+
+
+def test_iter_log_chunks_widens_lazily(tmp_path):
+    path = tmp_path / "bus.log"
+    with open(path, "w") as f:
+        for i in range(2000):
+            f.write(f"({i * 0.001:.6f}) can0 123#1122334455667788\n")
+        for i in range(2000):
+            f.write(f"({2 + i * 0.001:.6f}) can0 1ABCDEF0##1{'11' * 12}\n")
+        for i in range(2000):
+            f.write(f"({4 + i * 0.001:.6f}) can0 123#11\n")
+    chunks = list(iter_log_chunks(str(path), chunk_size=40_000))
+    widths = [c.payload.shape[1] for c in chunks]
+    assert widths[0] == 8  # FD 프레임이 나오기 전 청크는 8바이트 폭
+    assert widths[-1] == 64  # 한 번 넓어지면 유지
+    assert widths == sorted(widths)
+    assert sum(len(c.timestamp) for c in chunks) == 6000
+
+
+def test_asc_header_mentioning_canfd_keeps_classic_width(tmp_path):
+    path = tmp_path / "bus.asc"
+    with open(path, "w") as f:
+        f.write("date Mon Jan 1 00:00:00 2024\nbase hex  timestamps absolute\n// CANFD logger\n")
+        for i in range(5):
+            f.write(f"   {i * 0.01:.6f} 1  123             Rx   d 8 11 22 33 44 55 66 77 88\n")
+    chunks = list(iter_log_chunks(str(path)))
+    assert [c.payload.shape[1] for c in chunks] == [8]
@@ -0,0 +1,124 @@
+# test_dbc_parser.py
+import pytest
+
+from dbc_parser import (
+    Attribute, Comment, Message, Signal, ValueTable,
+    iter_dbc_records, load_dbc_dataframe, parse_bo_line, parse_sg_bits, parse_sg_line,
+)
+
+DBC_TEXT = """VERSION ""
+
+BU_: ECU1 ECU2
+
+BO_ 416 EngineData: 8 ECU1
+ SG_ EngRpm : 0|16@1+ (0.25,0) [0|16383.75] "rpm" ECU2
+ SG_ EngTemp : 23|8@0- (1,-40) [-40|215] "degC" ECU2,ECU3
+ SG_ Mode M : 32|4@1+ (1,0) [0|15] "" ECU2
+ SG_ ModeVal m1 : 36|4@1+ (1,0) [0|15] "" ECU2
+
+BO_ 2566834430 BodyExt: 64 ECU2
+ SG_ DoorSts : 0|2@1+ (1,0) [0|3] "" ECU1
+ SG_ Broken line without bits
+
+CM_ SG_ 416 EngRpm "Engine speed
+in rpm";
+VAL_ 2566834430 DoorSts 0 "Closed" 1 "Open" 2 "Ajar" ;
+BA_ "GenMsgCycleTime" BO_ 416 100;
+"""
+
+
+@pytest.fixture
+def dbc_path(tmp_path):
+    path = tmp_path / "sample.dbc"
+    path.write_text(DBC_TEXT, encoding="cp1252")
+    return str(path)
+
+
+def test_parse_sg_line_standard_dbc():
+    sig = parse_sg_line(' SG_ EngTemp : 23|8@0- (1,-40) [-40|215] "degC" ECU2,ECU3'.strip(), 416)
+    assert sig == Signal(416, "EngTemp", 23, 8, "big_endian", True, 1.0, -40.0, -40.0, 215.0,
+                         "degC", ("ECU2", "ECU3"), None)
+
+
+def test_parse_sg_line_db_format():
+    sig = parse_sg_line("SG_ SAS_Angle : 0|16@little_endian 0.1 0.0 Deg")
+    assert (sig.name, sig.start_bit, sig.bit_length, sig.byte_order) == ("SAS_Angle", 0, 16, "little_endian")
+    assert (sig.factor, sig.offset, sig.unit, sig.is_signed) == (0.1, 0.0, "Deg", False)
+    assert sig.min_val is None and sig.max_val is None
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("SG_ A : 0|16", (0, 16, "little_endian", 1.0)),  # '@' 없는 줄은 Intel
+    ("SG_ A M : 8|8@big_endian 2 1 V", (8, 8, "big_endian", 2.0)),
+    ('SG_ A : 0 | 16@1+ (0.5,0) [0|1] "km h" X', (0, 16, "little_endian", 0.5)),  # 정규식 경로
+])
+def test_parse_sg_line_variants(line, expected):
+    sig = parse_sg_line(line)
+    assert (sig.start_bit, sig.bit_length, sig.byte_order, sig.factor) == expected
+
+
+def test_parse_sg_line_quoted_unit_with_space():
+    sig = parse_sg_line('SG_ Speed : 0|16@1+ (0.5,0) [0|100] "km h" ECU1')
+    assert sig.unit == "km h" and sig.receivers == ("ECU1",)
+
+
+def test_parse_sg_line_multiplexer():
+    assert parse_sg_line("SG_ ModeVal m1 : 36|4@1+ (1,0) [0|15] \"\" ECU2").multiplexer == "m1"
+    assert parse_sg_line("SG_ Mode M : 32|4@1+ 1 0").multiplexer == "M"
+
+
+@pytest.mark.parametrize("line", ["", "SG_ Broken line without bits", "BO_ 1 X: 8 E", "SG_ A : x|y@1+"])
+def test_parse_sg_line_rejects_garbage(line):
+    assert parse_sg_line(line) is None
+    assert parse_sg_bits(line) is None
+
+
+@pytest.mark.parametrize("line", [
+    "SG_ SAS_Angle : 0|16@little_endian 0.1 0.0 Deg",
+    'SG_ EngRpm : 7|12@0+ (0.25,0) [0|1] "rpm" ECU2',
+    "SG_ A : 3|5",
+    "SG_ A : 3 | 5@1+ 1 0",
+])
+def test_parse_sg_bits_matches_full_parse(line):
+    sig = parse_sg_line(line)
+    assert parse_sg_bits(line) == (sig.start_bit, sig.bit_length)
+
+
+def test_parse_bo_line_masks_extended_flag():
+    assert parse_bo_line("BO_ 2566834430 BodyExt: 64 ECU2") == Message(0x18FEC8FE, "BodyExt", 64, "ECU2", True)
+    assert parse_bo_line("BO_ 416 EngineData: 8 ECU1") == Message(416, "EngineData", 8, "ECU1", False)
+    assert parse_bo_line("BO_ nope") is None
+
+
+def test_iter_dbc_records(dbc_path):
+    stats = {}
+    records = list(iter_dbc_records(dbc_path, stats=stats))
+    kinds = [type(r).__name__ for r in records]
+    assert kinds.count("Message") == 2 and kinds.count("Signal") == 5
+    assert stats["skipped"] == 1 and stats["skipped_lines"] == [13]
+
+    signals = [r for r in records if type(r) is Signal]
+    assert {s.frame_id for s in signals} == {416, 0x18FEC8FE}  # SG_는 마스크한 frame_id를 물려받음
+
+    comment = next(r for r in records if type(r) is Comment)
+    assert comment == Comment("SG_", 416, "EngRpm", "Engine speed\nin rpm")
+    values = next(r for r in records if type(r) is ValueTable)
+    assert values == ValueTable(0x18FEC8FE, "DoorSts", {0: "Closed", 1: "Open", 2: "Ajar"})
+    attr = next(r for r in records if type(r) is Attribute)
+    assert (attr.name, attr.scope, attr.frame_id, attr.value) == ("GenMsgCycleTime", "BO_", 416, "100")
+
+
+def test_iter_dbc_records_accepts_line_iterable():
+    records = list(iter_dbc_records(iter(["BO_ 1 M: 8 E\n", " SG_ S : 0|8@1+ (1,0) [0|1] \"\" E\n"])))
+    assert [type(r) for r in records] == [Message, Signal]
+
+
+def test_load_dbc_dataframe(dbc_path):
+    df = load_dbc_dataframe(dbc_path)
+    assert len(df) == 5
+    assert df["id"].tolist() == [1, 2, 3, 4, 5]
+    assert df["message_id"].tolist() == [1, 1, 1, 1, 2]
+    assert df["message_name"].tolist()[-1] == "BodyExt"
+    assert df["dlc"].tolist() == [8, 8, 8, 8, 64]
+    assert df["is_extended"].tolist() == [False, False, False, False, True]
+    assert df.attrs["skipped"] == 1
@@ -0,0 +1,124 @@
+# test_decode_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from decode_engine import DecodePlan, decode_frames
+
+
+def _reference_raw(data, start, length, big):
+    """비트를 하나씩 따라가며 읽은 raw 값 (Intel은 LSB부터, Motorola는 톱니형 MSB부터)."""
+    value = 0
+    bit = start
+    bits = []
+    for _ in range(length):
+        byte, pos = divmod(bit, 8)
+        bits.append((data[byte] >> pos) & 1 if byte < len(data) else 0)
+        if big:
+            bit = bit - 1 if pos else bit + 15
+        else:
+            bit += 1
+    if big:
+        for b in bits:  # 첫 비트가 MSB
+            value = (value << 1) | b
+    else:
+        for b in reversed(bits):  # 첫 비트가 LSB
+            value = (value << 1) | b
+    return value
+
+
+def _reference_physical(data, row):
+    raw = _reference_raw(data, int(row.start_bit), int(row.bit_length), row.byte_order == "big_endian")
+    if row.is_signed and raw >> (row.bit_length - 1):
+        raw -= 1 << row.bit_length
+    return raw * row.factor + row.offset
+
+
+def _catalog(rows):
+    df = pd.DataFrame(rows, columns=["frame_id", "name", "start_bit", "bit_length", "byte_order",
+                                     "is_signed", "factor", "offset"])
+    df.insert(0, "id", range(1, len(df) + 1))
+    df["message_name"] = df["frame_id"].map(lambda f: f"Msg{f:X}")
+    return df
+
+
+def test_intel_motorola_signed():
+    df = _catalog([
+        (0x100, "U16", 0, 16, "little_endian", 0, 0.25, 0.0),
+        (0x100, "S12", 20, 12, "little_endian", 1, 1.0, -10.0),
+        (0x100, "M16", 39, 16, "big_endian", 0, 1.0, 0.0),
+        (0x100, "MS6", 51, 6, "big_endian", 1, 0.5, 0.0),
+    ])
+    data = bytes([0x34, 0x12, 0x00, 0x80, 0xAB, 0xCD, 0x3C, 0x00])
+    decoded = decode_frames(DecodePlan(df), [1.5], [0x100], np.frombuffer(data, np.uint8)[None, :])
+    values = {df["name"][k - 1]: v[0] for k, (_, v) in decoded.items()}
+    assert values["U16"] == 0x1234 * 0.25
+    assert values["S12"] == -2048 - 10.0  # 0x800 → -2048
+    assert values["M16"] == 0xABCD
+    for row in df.itertuples():
+        assert values[row.name] == pytest.approx(_reference_physical(data, row))
+
+
+def test_random_signals_match_reference():
+    rng = np.random.default_rng(7)
+    rows = []
+    for i in range(300):
+        big = bool(rng.random() < 0.5)
+        length = int(rng.integers(1, 33))
+        start = int(rng.integers(0, 64 * 8 - length))
+        if big:
+            start = (start // 8) * 8 + 7 - (start % 8)  # 선형 MSB 위치 → 톱니형 시작 비트
+        rows.append((0x200 + i % 3, f"S{i}", start, length, "big_endian" if big else "little_endian",
+                     int(rng.random() < 0.5), 0.5, 1.0))
+    df = _catalog(rows)
+    plan = DecodePlan(df)
+    payloads = rng.integers(0, 256, size=(20, 64), dtype=np.uint8)
+    frame_ids = 0x200 + np.arange(20) % 3
+    decoded = decode_frames(plan, np.arange(20.0), frame_ids, payloads)
+    for row in df.itertuples():
+        ts, values = decoded[row.id]
+        hit = np.flatnonzero(frame_ids == row.frame_id)
+        np.testing.assert_array_equal(ts, hit.astype(float))
+        expected = [_reference_physical(bytes(payloads[j]), row) for j in hit]
+        np.testing.assert_allclose(values, expected)
+
+
+def test_canfd_payload_and_short_frames():
+    df = _catalog([
+        (0x300, "Tail", 60 * 8, 16, "little_endian", 0, 1.0, 0.0),
+        (0x300, "Head", 0, 8, "little_endian", 0, 1.0, 0.0),
+    ])
+    payloads = np.zeros((2, 64), np.uint8)
+    payloads[0, 60:62] = [0x01, 0x02]
+    payloads[:, 0] = [5, 6]
+    decoded = decode_frames(DecodePlan(df), [0.0, 1.0], [0x300, 0x300], payloads)
+    assert decoded[1][1].tolist() == [0x0201, 0]
+    # 8바이트 payload면 FD 영역 시그널은 0, 짧은 payload는 0으로 채움
+    decoded = decode_frames(DecodePlan(df), [0.0], [0x300], np.array([[9, 1, 2]], np.uint8))
+    assert decoded[1][1].tolist() == [0] and decoded[2][1].tolist() == [9]
+
+
+def test_unknown_frames_are_skipped_and_grouped():
+    df = _catalog([(0x10, "A", 0, 8, "little_endian", 0, 1.0, 0.0)])
+    payloads = np.arange(4, dtype=np.uint8).reshape(4, 1).repeat(8, axis=1)
+    decoded = decode_frames(DecodePlan(df), [0.0, 0.1, 0.2, 0.3], [0x10, 0x99, 0x10, 0x99], payloads)
+    assert list(decoded) == [1]
+    ts, values = decoded[1]
+    assert ts.tolist() == [0.0, 0.2] and values.tolist() == [0, 2]
+
+
+def test_plan_keys_labels_and_errors():
+    df = _catalog([
+        (0x10, "CRC", 0, 8, "little_endian", 0, 1.0, 0.0),
+        (0x20, "CRC", 0, 8, "little_endian", 0, 1.0, 0.0),
+    ])
+    plan = DecodePlan(df)
+    assert plan.find_keys("CRC") == [1, 2]
+    assert plan.find_keys("CRC", message="Msg20") == [2]
+    assert plan.find_keys("CRC", frame_id=0x10) == [1]
+    assert plan.label(2) == "Msg20.CRC"
+    assert plan.label(99) == "99"
+    with pytest.raises(ValueError):
+        DecodePlan(df.drop(columns=["factor"]))
+    with pytest.raises(ValueError):
+        DecodePlan(df.assign(id=[1, 1]))
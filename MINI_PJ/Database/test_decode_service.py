@@ -0,0 +1,90 @@
+# test_decode_service.py
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import decode_service
+from decode_service import DecodeService, LookupBatcher
+
+
+async def _request(service, raw):
+    """서비스를 임시 포트에 띄우고 raw 요청 하나를 보낸 뒤 (상태 코드, 본문, 연결 종료 여부)를 반환합니다."""
+    server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        status_line = await reader.readline()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers["content-length"]))
+        writer.close()
+        return int(status_line.split()[1]), json.loads(body), headers["connection"]
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.fixture
+def service():
+    svc = DecodeService(workers=1)
+    yield svc
+    svc.executor.shutdown(wait=False)
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_bad_content_length_is_400(service, length):
+    raw = f"POST /mask HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("latin-1")
+    status, body, connection = asyncio.run(_request(service, raw))
+    assert status == 400
+    assert "Content-Length" in body["error"]
+    assert connection == "close"  # 본문 경계를 모르므로 연결을 닫음
+
+
+def test_mask_request_still_works(service):
+    payload = json.dumps({"signals": [{"start_bit": 0, "bit_length": 4}], "payload_bytes": 8}).encode()
+    raw = b"POST /mask HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(payload), payload)
+    status, body, _ = asyncio.run(_request(service, raw))
+    assert status == 200
+
+
+def test_lookup_batcher_propagates_failure(monkeypatch):
+    def fail(codes):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(decode_service, "resolve_codes", fail)
+
+    async def run():
+        batcher = LookupBatcher(ThreadPoolExecutor(max_workers=1), window_sec=0.001)
+        results = await asyncio.gather(batcher.lookup("a"), batcher.lookup("b"), return_exceptions=True)
+        return batcher, results
+
+    batcher, results = asyncio.run(run())
+    assert [str(r) for r in results] == ["db down", "db down"]
+    assert batcher.batches == 1
+    assert not batcher._tasks  # 끝난 태스크는 참조를 놓음
+
+
+def test_lookup_batcher_dedupes_codes(monkeypatch):
+    calls = []
+
+    def resolve(codes):
+        calls.append(list(codes))
+        return [len(c) for c in codes]
+
+    monkeypatch.setattr(decode_service, "resolve_codes", resolve)
+
+    async def run():
+        batcher = LookupBatcher(ThreadPoolExecutor(max_workers=1), window_sec=0.001)
+        return await asyncio.gather(batcher.lookup("ab"), batcher.lookup("ab"), batcher.lookup("c"))
+
+    assert asyncio.run(run()) == [2, 2, 1]
+    assert calls == [["ab", "c"]]
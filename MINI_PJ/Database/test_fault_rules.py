@@ -0,0 +1,131 @@
+# test_fault_rules.py
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from decode_engine import DecodePlan
+from fault_rules import (
+    FaultEngine, RangeRule, RateRule, StuckRule, ThresholdRule, TimeoutRule, load_rules, rule_from_dict,
+)
+
+
+def _batch(**series):
+    """{키: [(ts, value), ...]} → decode_frames() 결과 형식."""
+    return {key: (np.array([t for t, _ in samples]), np.array([v for _, v in samples], dtype=float))
+            for key, samples in series.items()}
+
+
+def _changes(engine):
+    return sorted(engine.pop_changes())
+
+
+def test_rule_checks():
+    assert ThresholdRule("S", ">", 10).check(11, math.nan, math.nan)
+    assert not ThresholdRule("S", "<=", 10).check(11, math.nan, math.nan)
+    assert RangeRule("S", 0, 5).check(-1, 0, 1) and not RangeRule("S", 0, 5).check(5, 0, 1)
+    rate = RateRule("S", max_rate=10)
+    assert rate.check(30, 0, 2.0) and not rate.check(10, 0, 2.0)
+    assert not rate.check(5, math.nan, math.nan)  # 첫 샘플
+    assert not StuckRule("S", 1).check(1, 1, 1) and not TimeoutRule("S", 1).check(1, 1, 1)
+
+
+def test_rule_from_dict_and_load(tmp_path):
+    rule = rule_from_dict({"type": "threshold", "signal": "Temp", "frame_id": "0x3A0", "op": ">", "limit": 110})
+    assert isinstance(rule, ThresholdRule) and rule.frame_id == 0x3A0
+    assert rule.describe() == "0x3a0.Temp > 110"
+    assert rule_from_dict({"type": "range", "signal": "V", "message": "BMS", "low": 9, "high": 16}).target == "BMS.V"
+    with pytest.raises(ValueError):
+        rule_from_dict({"type": "nope", "signal": "S"})
+    with pytest.raises(ValueError):
+        rule_from_dict({"type": "threshold", "signal": "S", "op": "=>", "limit": 1})
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"type": "timeout", "signal": "S", "timeout": 1.0}]), encoding="utf-8")
+    assert [type(r) for r in load_rules(str(path))] == [TimeoutRule]
+
+
+def test_threshold_range_rate_events():
+    engine = FaultEngine([
+        ThresholdRule("Speed", ">", 100),
+        RangeRule("Volt", 9, 16),
+        RateRule("Speed", max_rate=50),
+    ])
+    engine.update(_batch(Speed=[(0.0, 50), (1.0, 120), (2.0, 120)], Volt=[(0.0, 12), (0.5, 20)]))
+    assert _changes(engine) == [0, 1, 2]
+    assert [(r.kind, key, ts, v) for r, key, ts, v in engine.active_faults()] == [
+        ("range", "Volt", 0.5, 20.0), ("threshold", "Speed", 1.0, 120.0),
+    ]  # 변화율 규칙은 같은 값이 다시 들어와 해제됨
+    assert [e[:3] for e in engine.events] == [(1.0, 0, True), (1.0, 2, True), (2.0, 2, False), (0.5, 1, True)]
+
+    engine.update(_batch(Speed=[(3.0, 90)], Other=[(3.0, 1)]))
+    assert _changes(engine) == [0] and 0 not in engine.active
+    assert _changes(engine) == []
+
+
+def test_unchanged_values_skip_evaluation():
+    engine = FaultEngine([ThresholdRule("S", ">", 1), RangeRule("S", 0, 5)])
+    engine.update(_batch(S=[(float(t), 3.0) for t in range(100)]))
+    assert engine.evaluations == 2  # 첫 샘플에서만 평가
+
+
+def test_stuck_and_timeout_poll():
+    engine = FaultEngine([
+        StuckRule("Rpm", duration=2.0, tolerance=1.0),
+        TimeoutRule("Door", timeout=1.0),
+        TimeoutRule("Never", timeout=5.0),
+    ])
+    engine.poll()  # 샘플이 없으면 아무것도 하지 않음
+    engine.update(_batch(Rpm=[(0.0, 800), (0.5, 800.5), (1.0, 800)], Door=[(0.0, 1)]))
+    engine.poll(now=1.5)
+    assert _changes(engine) == [1]  # Door 1.5초 수신 없음
+    engine.poll(now=2.0)
+    assert _changes(engine) == [0]  # Rpm이 0초부터 tolerance 안에 머묾
+    engine.poll(now=5.0)
+    assert _changes(engine) == [2]  # 한 번도 안 들어온 시그널은 스트림 시작부터 셈
+
+    engine.update(_batch(Rpm=[(5.1, 900)], Door=[(5.1, 0)]))
+    assert 0 not in engine.active  # 값이 벗어나면 즉시 해제
+    engine.poll(now=5.2)
+    assert _changes(engine) == [0, 1]
+    assert [r.kind for r, *_ in engine.active_faults()] == ["timeout"]
+    assert math.isnan(engine.active_faults()[0][3])
+
+
+def test_resolution_by_message_and_frame_id():
+    df = pd.DataFrame({
+        "id": [1, 2, 3],
+        "name": ["Temp", "Temp", "Volt"],
+        "message_name": ["BMS_Status", "Motor", "BMS_Status"],
+        "frame_id": [0x3A0, 0x3B0, 0x3A0],
+        "start_bit": [0, 0, 8], "bit_length": [8, 8, 8], "byte_order": ["little_endian"] * 3,
+        "is_signed": [0, 0, 0], "factor": [1.0] * 3, "offset": [0.0] * 3,
+    })
+    rules = [
+        rule_from_dict({"type": "threshold", "signal": "Temp", "message": "BMS_Status", "op": ">", "limit": 60}),
+        rule_from_dict({"type": "threshold", "signal": "Temp", "frame_id": "0x3B0", "op": ">", "limit": 110}),
+        rule_from_dict({"type": "threshold", "signal": "Temp", "op": ">", "limit": 0}),  # 어느 Temp인지 모름
+        rule_from_dict({"type": "range", "signal": "Volt", "low": 9, "high": 16}),
+        rule_from_dict({"type": "range", "signal": "Missing", "low": 0, "high": 1}),
+    ]
+    engine = FaultEngine(rules, DecodePlan(df))
+    assert engine.rule_keys == [1, 2, None, 3, None]
+    assert engine.unresolved == [rules[2], rules[4]]
+    assert sorted(engine.signals) == [1, 2, 3]
+
+    engine.update({1: (np.array([0.0]), np.array([70.0])), 2: (np.array([0.0]), np.array([100.0]))})
+    assert [(r.target, key) for r, key, *_ in engine.active_faults()] == [("BMS_Status.Temp", 1)]
+
+
+def test_reset():
+    engine = FaultEngine([ThresholdRule("S", ">", 1), TimeoutRule("S", 1.0)])
+    engine.update(_batch(S=[(0.0, 5)]))
+    engine.poll(now=2.0)
+    assert len(engine.active) == 2
+    engine.reset()
+    assert engine.active == {} and not engine.is_active.any() and engine.now() is None
+    assert engine.pop_changes() == set() and not engine.events
+    engine.update(_batch(S=[(10.0, 5)]))
+    assert _changes(engine) == [0]  # 초기 상태에서 다시 평가
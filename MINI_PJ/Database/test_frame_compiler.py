@@ -0,0 +1,84 @@
+# test_frame_compiler.py
+import numpy as np
+import pandas as pd
+
+from decode_engine import DecodePlan, decode_frames
+from frame_compiler import CompiledDecoder, generate_source, get_compiled_decoder, plan_hash
+
+
+def _random_catalog(rng, n_signals=400, n_frames=8):
+    big = rng.random(n_signals) < 0.5
+    length = rng.integers(1, 65, n_signals)
+    linear = np.array([rng.integers(0, 64 * 8 - n) for n in length])
+    start = np.where(big, (linear // 8) * 8 + 7 - linear % 8, linear)
+    return pd.DataFrame({
+        "id": np.arange(1, n_signals + 1),
+        "name": [f"S{i}" for i in range(n_signals)],
+        "message_name": None,
+        "frame_id": 0x100 + np.arange(n_signals) % n_frames,
+        "start_bit": start,
+        "bit_length": length,
+        "byte_order": np.where(big, "big_endian", "little_endian"),
+        "is_signed": rng.random(n_signals) < 0.5,
+        "factor": rng.choice([1.0, 0.1, 0.25, -2.0], n_signals),
+        "offset": rng.choice([0.0, -40.0, 3.5], n_signals),
+    })
+
+
+def test_compiled_matches_vectorized():
+    rng = np.random.default_rng(3)
+    plan = DecodePlan(_random_catalog(rng))
+    n = 200
+    frame_ids = 0x100 + rng.integers(0, 10, n)  # 0x108, 0x109는 카탈로그에 없음
+    payloads = rng.integers(0, 256, size=(n, 64), dtype=np.uint8)
+    ts = np.arange(n) * 0.01
+
+    expected = decode_frames(plan, ts, frame_ids, payloads)
+    actual = CompiledDecoder(plan).decode_frames(ts, frame_ids, payloads)
+    assert set(actual) == set(expected)
+    for key, (exp_ts, exp_values) in expected.items():
+        np.testing.assert_array_equal(actual[key][0], exp_ts)
+        np.testing.assert_allclose(actual[key][1], exp_values, rtol=1e-12)
+
+
+def test_compiled_short_payloads_match():
+    rng = np.random.default_rng(4)
+    plan = DecodePlan(_random_catalog(rng, 60, 2))
+    decoder = CompiledDecoder(plan).compile_all()
+    for frame_id in (0x100, 0x101):
+        data = bytes(rng.integers(0, 256, 5, dtype=np.uint8))
+        padded = np.frombuffer(data.ljust(64, b"\x00"), np.uint8)[None, :]
+        expected = decode_frames(plan, [0.0], [frame_id], padded)
+        for key, value in decoder.decode(frame_id, data).items():
+            assert value == expected[key][1][0]
+    assert decoder.decode(0x999, b"\x00" * 8) is None
+
+
+def _one_signal(name="Sig", factor=1.0, offset=0.0):
+    return DecodePlan(pd.DataFrame({
+        "id": [1], "name": [name], "message_name": ["M"], "frame_id": [0x10], "start_bit": [0],
+        "bit_length": [8], "byte_order": ["little_endian"], "is_signed": [0],
+        "factor": [factor], "offset": [offset],
+    }))
+
+
+def test_signal_name_cannot_inject_code():
+    plan = _one_signal(name="x\nraise SystemExit('injected')")
+    source = generate_source(plan.frames[0x10])
+    assert "\nraise" not in source
+    assert CompiledDecoder(plan).decode(0x10, b"\x05") == {1: 5.0}
+
+
+def test_non_finite_constants_compile():
+    assert CompiledDecoder(_one_signal(factor=float("inf"))).decode(0x10, b"\x01") == {1: float("inf")}
+    assert CompiledDecoder(_one_signal(factor=float("-inf"))).decode(0x10, b"\x01") == {1: float("-inf")}
+
+
+def test_cache_reuses_decoder_for_same_catalog():
+    rng = np.random.default_rng(5)
+    df = _random_catalog(rng, 20, 2)
+    first = get_compiled_decoder(DecodePlan(df))
+    assert get_compiled_decoder(DecodePlan(df.copy())) is first
+    changed = df.assign(factor=df["factor"] * 2)
+    assert plan_hash(DecodePlan(changed)) != first.catalog_hash
+    assert get_compiled_decoder(DecodePlan(changed)) is not first
@@ -0,0 +1,70 @@
+# test_layout_checker.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from layout_checker import check_layouts, layout_issues, popcount_rows, summarize_layout
+
+
+@pytest.fixture
+def df_all():
+    rows = [
+        # message_id, message_name, frame_id, dlc, name, start_bit, bit_length, byte_order
+        (1, "Overlap", 0x10, 8, "A", 0, 8, "little_endian"),
+        (2, "Range", 0x20, 2, "D", 0, 8, "little_endian"),
+        (1, "Overlap", 0x10, 8, "B", 4, 8, "little_endian"),
+        (4, "Clean", 0x40, 8, "H", 7, 16, "big_endian"),
+        (2, "Range", 0x20, 2, "E", 16, 8, "little_endian"),  # dlc 2바이트 밖
+        (3, "Edge", 0x30, 64, "G", 510, 8, "little_endian"),  # 512비트를 넘어 잘림
+        (1, "Overlap", 0x10, 8, "C", 16, 4, "little_endian"),
+        (2, "Range", 0x20, 2, "F", 100, 70, "little_endian"),  # 64비트 초과
+        (4, "Clean", 0x40, 8, "I", 23, 8, "big_endian"),
+    ]
+    df = pd.DataFrame(rows, columns=["message_id", "message_name", "frame_id", "dlc", "name",
+                                     "start_bit", "bit_length", "byte_order"])
+    df.insert(0, "id", range(1, len(df) + 1))
+    return df
+
+
+def test_popcount_rows():
+    masks = np.array([[0xFF, 0x01], [0, 0], [0x80, 0x0F]], np.uint8)
+    assert popcount_rows(masks).tolist() == [9, 0, 5]
+
+
+def test_check_layouts(df_all):
+    report = check_layouts(df_all).set_index("message_id")
+    assert report.index.tolist() == [1, 2, 3, 4]
+    assert report["n_signals"].tolist() == [3, 3, 1, 2]
+    assert report["message_name"].tolist() == ["Overlap", "Range", "Edge", "Clean"]
+
+    overlap = report.loc[1]
+    assert overlap["overlap_bits"] == 4 and overlap["overlaps"] == ["A & B"]
+    assert overlap["used_bits"] == 16 and overlap["gap_bits"] == 4  # 12~15번 비트가 빔
+    assert overlap["out_of_range"] == []
+
+    assert sorted(report.loc[2, "out_of_range"]) == ["E", "F"]
+    assert report.loc[3, "out_of_range"] == ["G"]
+
+    clean = report.loc[4]
+    assert clean["overlap_bits"] == 0 and clean["overlaps"] == [] and clean["out_of_range"] == []
+    assert clean["used_bits"] == 24 and clean["gap_bits"] == 0
+
+
+def test_check_layouts_without_dlc_uses_canfd_length(df_all):
+    report = check_layouts(df_all.drop(columns=["dlc"])).set_index("message_id")
+    assert report.loc[2, "out_of_range"] == ["F"]  # 길이 한계만 남음
+    assert report.loc[2, "payload_bytes"] == 64
+
+
+def test_issues_and_summary(df_all):
+    report = check_layouts(df_all)
+    assert layout_issues(report)["message_id"].tolist() == [1, 2, 3]
+    assert summarize_layout(report) == "레이아웃 경고: 비트 겹침 1개, 범위 초과 2개 메시지 (총 4개)"
+    clean = check_layouts(df_all[df_all["message_id"] == 4])
+    assert layout_issues(clean).empty
+    assert summarize_layout(clean) == "레이아웃 검사: 메시지 1개 이상 없음"
+
+
+def test_empty_catalog(df_all):
+    report = check_layouts(df_all.iloc[:0])
+    assert report.empty and "overlaps" in report
@@ -0,0 +1,78 @@
+# test_signal_search.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_search import SearchSession, SignalSearchIndex, TrigramIndex
+
+NAMES = ["EngRpm", "EngTemp", "VehSpd", "SAS_Angle", "SAS_Speed", "BrkPedalSts", "엔진온도", None, "", "ab"]
+
+
+def _contains_rows(texts, keyword):
+    """pandas str.contains로 구한 기준 결과."""
+    lowered = pd.Series(texts).fillna("").astype(str).str.lower()
+    return np.flatnonzero(lowered.str.contains(keyword.lower(), regex=False).to_numpy(dtype=bool))
+
+
+def _random_names(rng, n):
+    alphabet = np.array(list("abcdeABCDE_12"))
+    return ["".join(rng.choice(alphabet, rng.integers(0, 12))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("keyword", ["eng", "ENG", "sas_", "s", "Sp", "엔진", "온도", "zzz", "ab", "gtemp"])
+def test_search_matches_str_contains(keyword):
+    index = TrigramIndex(NAMES)
+    assert index.search(keyword).tolist() == _contains_rows(NAMES, keyword).tolist()
+
+
+def test_search_matches_str_contains_random():
+    rng = np.random.default_rng(11)
+    names = _random_names(rng, 3000)
+    index = TrigramIndex(names)
+    for _ in range(200):
+        keyword = "".join(rng.choice(list("abcdeABCDE_12"), rng.integers(1, 6)))
+        assert index.search(keyword).tolist() == _contains_rows(names, keyword).tolist(), keyword
+
+
+def test_trigrams_do_not_cross_row_boundaries():
+    index = TrigramIndex(["abc", "def"])
+    assert index.search("cde").tolist() == []
+    assert index.search("bc").tolist() == [0]
+
+
+def test_fuzzy_search_finds_typo():
+    index = TrigramIndex(NAMES)
+    rows = [i for i, _ in index.fuzzy_search("EngTmep", k=3)]
+    assert rows[0] == NAMES.index("EngTemp")
+    scores = [sc for _, sc in index.fuzzy_search("sas", k=5)]
+    assert scores == sorted(scores, reverse=True) and all(0 <= sc <= 1 for sc in scores)
+    assert index.fuzzy_search("qqqq") == []
+
+
+@pytest.fixture
+def df_all():
+    return pd.DataFrame({
+        "name": ["EngRpm", "EngTemp", "VehSpd", "Checksum"],
+        "message_name": ["Engine", "Engine", "Vehicle", "EngineCRC"],
+    })
+
+
+def test_signal_search_index_fields(df_all):
+    index = SignalSearchIndex(df_all)
+    assert index.search("eng")["name"].tolist() == ["EngRpm", "EngTemp"]
+    assert index.search_rows("eng", fields=("name", "message_name")).tolist() == [0, 1, 3]
+    assert index.search_rows("eng", fields=("missing",)).tolist() == []
+    result = index.fuzzy_search("VehSpeed", k=1)
+    assert result["name"].tolist() == ["VehSpd"] and "score" in result
+
+
+def test_search_session_refines_and_caches(df_all):
+    session = SearchSession(SignalSearchIndex(df_all), cache_size=2)
+    first = session.search_rows("en")
+    assert first.tolist() == [0, 1]
+    assert session.search_rows("ENG").tolist() == [0, 1]  # 이전 결과 안에서 좁히기
+    assert session.search_rows("engt").tolist() == [1]
+    assert session.search_rows("eng").tolist() == [0, 1]  # LRU 캐시 적중
+    session.search_rows("v")
+    session.search_rows("ve")
+    assert "en" not in session._cache  # cache_size를 넘으면 오래된 항목부터 제거
@@ -0,0 +1,90 @@
+# test_timeseries_store.py
+import numpy as np
+
+from timeseries_store import SignalSeries, TimeSeriesStore, lttb
+
+
+def _all(series):
+    return series.raw(-np.inf, np.inf)
+
+
+def test_append_in_order_seals_chunks():
+    s = SignalSeries(chunk_size=8)
+    s.append(np.arange(20.0), np.arange(20.0) * 2)
+    assert len(s) == 20
+    assert len(s.sealed) == 2 and s.tail_len == 4
+    ts, values = _all(s)
+    np.testing.assert_array_equal(ts, np.arange(20.0))
+    np.testing.assert_array_equal(values, np.arange(20.0) * 2)
+    assert s.merges == 0
+
+
+def test_late_samples_inside_tail_do_not_reopen_sealed_chunks():
+    s = SignalSeries(chunk_size=8)
+    s.append(np.arange(20.0), np.arange(20.0))
+    sealed = list(s.sealed)
+    s.append([17.5, 16.5], [-1.0, -2.0])  # 꼬리(16~19) 안의 지터
+    assert s.merges == 1 and s.reopened == 0
+    assert s.sealed == sealed  # 봉인 청크(와 피라미드)는 그대로
+    ts, values = _all(s)
+    assert np.all(np.diff(ts) >= 0)
+    assert values[ts == 16.5][0] == -2.0 and values[ts == 17.5][0] == -1.0
+
+
+def test_late_samples_reopen_only_from_the_affected_chunk():
+    s = SignalSeries(chunk_size=8)
+    s.append(np.arange(40.0), np.arange(40.0))
+    first_two = s.sealed[:2]
+    s.append([20.5], [100.0])  # 세 번째 청크(16~23)에 닿음
+    assert s.sealed[:2] == first_two
+    assert s.reopened == len(s.sealed) - 2
+    ts, values = _all(s)
+    np.testing.assert_array_equal(ts, np.sort(np.append(np.arange(40.0), 20.5)))
+    assert len(s) == 41 and s.sealed_last == [c.ts[-1] for c in s.sealed]
+
+
+def test_late_batch_matches_full_sort():
+    rng = np.random.default_rng(0)
+    s = SignalSeries(chunk_size=64)
+    expected_ts, expected_values = [], []
+    clock = 0.0
+    for _ in range(50):
+        ts = clock + np.sort(rng.random(10)) - rng.random() * 0.5  # 일부는 이전 배치보다 이른 지터
+        values = rng.random(10)
+        s.append(ts, values)
+        expected_ts.append(ts)
+        expected_values.append(values)
+        clock += 1.0
+    expected_ts = np.concatenate(expected_ts)
+    order = np.argsort(expected_ts, kind="stable")
+    ts, values = _all(s)
+    np.testing.assert_array_equal(ts, expected_ts[order])
+    np.testing.assert_array_equal(values, np.concatenate(expected_values)[order])
+    for chunk in s.sealed:  # 다시 만든 피라미드도 청크 원본과 맞아야 함
+        np.testing.assert_array_equal(chunk.levels[0][3], chunk.values.reshape(-1, 16).min(axis=1))
+        np.testing.assert_array_equal(chunk.levels[0][5], chunk.values.reshape(-1, 16).max(axis=1))
+
+
+def test_unsorted_batch_is_sorted():
+    s = SignalSeries(chunk_size=8)
+    s.append([3.0, 1.0, 2.0], [30.0, 10.0, 20.0])
+    ts, values = _all(s)
+    np.testing.assert_array_equal(ts, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(values, [10.0, 20.0, 30.0])
+
+
+def test_query_downsamples_to_max_points():
+    store = TimeSeriesStore(chunk_size=1024)
+    t = np.arange(100_000) * 0.001
+    store.append(7, t, np.sin(t))
+    ts, values = store.query(7, max_points=500)
+    assert 0 < len(ts) <= 500
+    assert values.min() >= -1.0 and values.max() <= 1.0
+    ts, _ = store.query(7, 10.0, 10.1, max_points=500)  # 좁은 구간은 원본 그대로
+    assert len(ts) == 101
+
+
+def test_lttb_keeps_endpoints():
+    t = np.arange(1000.0)
+    ts, values = lttb(t, np.cos(t), 50)
+    assert len(ts) == 50 and ts[0] == 0.0 and ts[-1] == 999.0
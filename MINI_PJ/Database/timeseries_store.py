@@ -0,0 +1,318 @@
+# timeseries_store.py
+"""디코딩된 시그널 값을 시그널별 (timestamp, value) 컬럼 배열로 쌓아 두는 저장소.
+
+- 값은 CHUNK_SIZE개 단위 청크에 덧붙이기만 하며(append-only), 가득 찬 청크는 봉인됩니다.
+- 봉인된 청크마다 min/max 피라미드(16, 256, 4096, 65536개 묶음)를 미리 만들어 두어
+  긴 구간을 그릴 때 원본 대신 요약 레벨을 읽습니다.
+- query()는 화면 폭에 맞춰 max_points개 안팎의 점만 돌려줍니다 (min/max 봉투 또는 LTTB).
+"""
+
+import threading
+
+import numpy as np
+
+from can_log_reader import iter_log_chunks
+from decode_engine import decode_frames
+
+# ============================================
+# ⚙️ 설정
+# ============================================
+CHUNK_SIZE = 1 << 16  # 65536 샘플 (100Hz 기준 약 11분)
+PYRAMID_FACTOR = 16
+PYRAMID_LEVELS = 4  # 묶음 크기 16, 256, 4096, 65536
+DEFAULT_MAX_POINTS = 2000
+LTTB_MAX_INPUT = 200_000  # LTTB 입력이 이보다 많으면 min/max 봉투를 먼저 거칩니다.
+
+
+# ============================================
+# 📉 다운샘플링
+# ============================================
+def bucket_minmax(ts, values, size):
+    """size개씩 묶은 구간별 (t_first, t_last, t_min, v_min, t_max, v_max) 배열을 만듭니다.
+
+    마지막 구간이 덜 차 있어도 됩니다.
+    """
+    # 원본 한 점 = 시작/끝/최소/최대가 모두 같은 구간 하나로 보고 묶습니다.
+    return merge_buckets((ts, ts, ts, values, ts, values), size)
+
+
+def merge_buckets(level, factor):
+    """피라미드 레벨의 구간을 factor개씩 다시 묶습니다 (레벨 사이 해상도 조정용)."""
+    t_first, t_last, t_min, v_min, t_max, v_max = level
+    n = len(t_first)
+    n_buckets = -(-n // factor)
+    pad = n_buckets * factor - n
+    low = np.pad(v_min, (0, pad), constant_values=np.inf).reshape(n_buckets, factor)
+    high = np.pad(v_max, (0, pad), constant_values=-np.inf).reshape(n_buckets, factor)
+    starts = np.arange(n_buckets) * factor
+    i_min = starts + low.argmin(axis=1)
+    i_max = starts + high.argmax(axis=1)
+    ends = np.minimum(starts + factor, n) - 1
+    return t_first[starts], t_last[ends], t_min[i_min], v_min[i_min], t_max[i_max], v_max[i_max]
+
+
+def minmax_envelope(level):
+    """구간별 min/max 두 점을 시간순으로 펼쳐 선 그래프용 (ts, values)를 만듭니다."""
+    _, _, t_min, v_min, t_max, v_max = level
+    min_first = t_min <= t_max
+    ts = np.empty(2 * len(t_min))
+    values = np.empty(2 * len(t_min))
+    ts[0::2] = np.where(min_first, t_min, t_max)
+    ts[1::2] = np.where(min_first, t_max, t_min)
+    values[0::2] = np.where(min_first, v_min, v_max)
+    values[1::2] = np.where(min_first, v_max, v_min)
+    return ts, values
+
+
+def lttb(ts, values, n_out):
+    """Largest-Triangle-Three-Buckets 다운샘플링. 첫/마지막 점은 항상 유지합니다."""
+    n = len(ts)
+    if n_out >= n or n_out < 3:
+        return ts, values
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # 가운데 n_out-2개 구간 경계
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # 다음 구간의 평균점 (마지막 구간은 마지막 점)
+        nlo, nhi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        avg_t = ts[nlo:nhi].mean()
+        avg_v = values[nlo:nhi].mean()
+        pt, pv = ts[prev], values[prev]
+        area = np.abs((pt - avg_t) * (values[lo:hi] - pv) - (pt - ts[lo:hi]) * (avg_v - pv))
+        prev = lo + int(area.argmax())
+        keep[b + 1] = prev
+    return ts[keep], values[keep]
+
+
+# ============================================
+# 📦 시그널 하나의 청크 저장소
+# ============================================
+class _Chunk:
+    __slots__ = ("ts", "values", "levels")
+
+    def __init__(self, ts, values):
+        self.ts = ts
+        self.values = values
+        self.levels = [
+            bucket_minmax(ts, values, PYRAMID_FACTOR ** (k + 1)) for k in range(PYRAMID_LEVELS)
+        ]
+
+
+class SignalSeries:
+    """append-only 청크 배열. 타임스탬프는 항상 오름차순으로 유지합니다.
+
+    구간 검색(searchsorted)이 정렬을 전제로 하므로, 이미 쌓인 마지막 시각보다 이른
+    샘플이 들어오면 그 샘플이 닿는 청크부터 끝까지만 병합 정렬해 다시 쌓습니다.
+    실시간 수신의 수 ms 지터는 대개 봉인 전 꼬리 안에서 끝나므로 꼬리만 다시 정렬됩니다.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.sealed = []  # 가득 찬 _Chunk 목록
+        self.sealed_first = []  # 청크별 첫 타임스탬프 (구간 검색용)
+        self.sealed_last = []  # 청크별 마지막 타임스탬프 (늦은 샘플이 닿는 청크 찾기용)
+        self.tail_ts = np.empty(chunk_size, dtype=np.float64)
+        self.tail_values = np.empty(chunk_size, dtype=np.float64)
+        self.tail_len = 0
+        self._tail_chunk = None  # 봉인 전 꼬리 청크의 피라미드 (append 시 무효화)
+        self.merges = 0  # 순서가 어긋난 append로 다시 쌓은 횟수
+        self.reopened = 0  # 그때 피라미드를 다시 만든 봉인 청크 수 (성능 확인용)
+
+    def __len__(self):
+        return len(self.sealed) * self.chunk_size + self.tail_len
+
+    def last_ts(self):
+        if self.tail_len:
+            return self.tail_ts[self.tail_len - 1]
+        return self.sealed[-1].ts[-1] if self.sealed else None
+
+    def append(self, ts, values):
+        ts = np.asarray(ts, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if not len(ts):
+            return
+        if (ts[1:] < ts[:-1]).any():
+            order = np.argsort(ts, kind="stable")
+            ts, values = ts[order], values[order]
+        last = self.last_ts()
+        if last is not None and ts[0] < last:
+            self._merge(ts, values)
+        else:
+            self._extend(ts, values)
+
+    def _merge(self, ts, values):
+        """ts[0]보다 늦은 샘플을 가진 첫 청크부터 꼬리까지를 새 샘플과 병합해 다시 쌓습니다.
+
+        그 앞의 봉인 청크는 가득 차 있고 모두 ts[0] 이하이므로 그대로 둡니다.
+        """
+        k = int(np.searchsorted(self.sealed_last, ts[0], side="right"))
+        reopened = self.sealed[k:]
+        # 꼬리는 _extend가 덮어쓰므로 concatenate로 먼저 복사합니다.
+        all_ts = np.concatenate([c.ts for c in reopened] + [self.tail_ts[:self.tail_len], ts])
+        all_values = np.concatenate([c.values for c in reopened] + [self.tail_values[:self.tail_len], values])
+        order = np.argsort(all_ts, kind="stable")  # 같은 시각이면 기존 샘플이 앞
+        del self.sealed[k:], self.sealed_first[k:], self.sealed_last[k:]
+        self.tail_len = 0
+        self.merges += 1
+        self.reopened += len(reopened)
+        self._extend(all_ts[order], all_values[order])
+
+    def _extend(self, ts, values):
+        pos = 0
+        while pos < len(ts):
+            take = min(self.chunk_size - self.tail_len, len(ts) - pos)
+            end = self.tail_len + take
+            self.tail_ts[self.tail_len:end] = ts[pos:pos + take]
+            self.tail_values[self.tail_len:end] = values[pos:pos + take]
+            self.tail_len = end
+            pos += take
+            if self.tail_len == self.chunk_size:
+                self._seal()
+        self._tail_chunk = None
+
+    def _seal(self):
+        chunk = _Chunk(self.tail_ts.copy(), self.tail_values.copy())
+        self.sealed.append(chunk)
+        self.sealed_first.append(chunk.ts[0])
+        self.sealed_last.append(chunk.ts[-1])
+        self.tail_len = 0
+
+    def time_range(self):
+        if not len(self):
+            return None
+        first = self.sealed[0].ts[0] if self.sealed else self.tail_ts[0]
+        last = self.tail_ts[self.tail_len - 1] if self.tail_len else self.sealed[-1].ts[-1]
+        return float(first), float(last)
+
+    def _chunks_in(self, t0, t1):
+        """[t0, t1]과 겹치는 청크 목록 (꼬리 청크 포함)."""
+        chunks = []
+        if self.sealed:
+            lo = max(0, int(np.searchsorted(self.sealed_first, t0, side="right")) - 1)
+            hi = int(np.searchsorted(self.sealed_first, t1, side="right"))
+            chunks = self.sealed[lo:hi]
+        if self.tail_len and self.tail_ts[self.tail_len - 1] >= t0 and self.tail_ts[0] <= t1:
+            if self._tail_chunk is None:
+                self._tail_chunk = _Chunk(self.tail_ts[:self.tail_len].copy(),
+                                          self.tail_values[:self.tail_len].copy())
+            chunks.append(self._tail_chunk)
+        return chunks
+
+    def raw(self, t0, t1):
+        ts_parts, value_parts = [], []
+        for c in self._chunks_in(t0, t1):
+            lo, hi = np.searchsorted(c.ts, t0, side="left"), np.searchsorted(c.ts, t1, side="right")
+            ts_parts.append(c.ts[lo:hi])
+            value_parts.append(c.values[lo:hi])
+        if not ts_parts:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(ts_parts), np.concatenate(value_parts)
+
+    def _level(self, chunks, k, t0, t1):
+        """피라미드 k 레벨에서 [t0, t1]과 겹치는 구간만 이어 붙입니다."""
+        parts = []
+        for c in chunks:
+            level = c.levels[k]
+            lo = np.searchsorted(level[1], t0, side="left")  # t_last >= t0
+            hi = np.searchsorted(level[0], t1, side="right")  # t_first <= t1
+            parts.append(tuple(a[lo:hi] for a in level))
+        return tuple(np.concatenate(cols) for cols in zip(*parts))
+
+    def _count_raw(self, chunks, t0, t1):
+        return sum(
+            int(np.searchsorted(c.ts, t1, side="right") - np.searchsorted(c.ts, t0, side="left"))
+            for c in chunks
+        )
+
+    def query(self, t0=None, t1=None, max_points=DEFAULT_MAX_POINTS, method="minmax"):
+        """[t0, t1] 구간을 max_points개 안팎의 점으로 돌려줍니다.
+
+        원본 점이 max_points 이하이면 원본 그대로 돌려줍니다. 아니면 구간 수가
+        max_points/2의 PYRAMID_FACTOR배를 넘지 않는 가장 촘촘한 레벨(또는 원본)을 골라
+        max_points/2 구간으로 다시 묶은 min/max 봉투를 사용합니다.
+        method="lttb"이면 원본(또는 봉투)에 LTTB를 적용해 max_points개로 줄입니다.
+        """
+        span = self.time_range()
+        if span is None:
+            return np.empty(0), np.empty(0)
+        t0 = span[0] if t0 is None else t0
+        t1 = span[1] if t1 is None else t1
+        chunks = self._chunks_in(t0, t1)
+
+        n_raw = self._count_raw(chunks, t0, t1)
+        budget = max_points if method == "minmax" else LTTB_MAX_INPUT
+        n_buckets = max(1, budget // 2)
+        if n_raw <= budget:
+            ts, values = self.raw(t0, t1)
+        else:
+            if n_raw <= n_buckets * PYRAMID_FACTOR:
+                level = bucket_minmax(*self.raw(t0, t1), 1)
+            else:
+                for k in range(PYRAMID_LEVELS):
+                    level = self._level(chunks, k, t0, t1)
+                    if len(level[0]) <= n_buckets * PYRAMID_FACTOR:
+                        break
+            factor = -(-len(level[0]) // n_buckets)
+            ts, values = minmax_envelope(merge_buckets(level, factor))
+        if method == "lttb":
+            ts, values = lttb(ts, values, max_points)
+        return ts, values
+
+
+# ============================================
+# 🗄️ 전체 시그널 저장소
+# ============================================
+class TimeSeriesStore:
+    """시그널 id(DecodePlan 키) → SignalSeries. 여러 스레드(실시간 수신/GUI)에서 함께 씁니다."""
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self.series
+
+    def keys(self):
+        with self._lock:
+            return sorted(self.series)
+
+    def append(self, key, ts, values):
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = SignalSeries(self.chunk_size)
+            series.append(ts, values)
+
+    def append_decoded(self, decoded):
+        """decode_frames() 결과 {키: (ts, values)}를 한 번에 추가합니다."""
+        for key, (ts, values) in decoded.items():
+            self.append(key, ts, values)
+
+    def time_range(self, key):
+        with self._lock:
+            series = self.series.get(key)
+            return series.time_range() if series is not None else None
+
+    def query(self, key, t0=None, t1=None, max_points=DEFAULT_MAX_POINTS, method="minmax"):
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                return np.empty(0), np.empty(0)
+            return series.query(t0, t1, max_points, method)
+
+    def clear(self):
+        with self._lock:
+            self.series.clear()
+
+
+def ingest_log(store, plan, path, fmt=None):
+    """candump/ASC 로그 파일을 청크 단위로 디코딩해 저장소에 넣고 프레임 수를 반환합니다."""
+    frames = 0
+    for chunk in iter_log_chunks(path, fmt=fmt):
+        store.append_decoded(decode_frames(plan, chunk.timestamp, chunk.frame_id, chunk.payload))
+        frames += len(chunk.frame_id)
+    return frames
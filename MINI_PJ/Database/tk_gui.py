@@ -1,16 +1,174 @@
 # tk_gui.py
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk
-import math
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from analyze_logic import (
-    parse_bits_from_original_code,
     calculate_bits,
     get_can_id_by_original_code,
-    load_and_process_data,
+    get_db_stats,
     CarPoint,
 )
+from catalog_cache import load_catalog
+from dbc_parser import parse_sg_line
+from bit_mask import get_mask_table, payload_size_for, CANFD_PAYLOAD_BYTES
+from signal_search import SignalSearchIndex, SearchSession
+from point_index import PointGrid
+from layout_checker import check_layouts, layout_issues, summarize_layout
+from decode_engine import DecodePlan
+from live_stream import CanBusSource, CandumpStreamSource, LiveDecoder
+from fault_rules import FaultEngine, load_rules
+from timeseries_store import TimeSeriesStore, ingest_log
+from signal_classifier import (
+    build_category_index,
+    group_names_by_status,
+    NORMAL_STATUS,
+    ERROR_STATUS,
+)
+import numpy as np
 import pyperclip
+import perf
+
+SEARCH_DEBOUNCE_MS = 200  # 입력이 멈춘 뒤 검색을 시작하기까지 대기 시간
+FUZZY_TOP_K = 50  # 유사도 검색 시 보여줄 상위 결과 수
+BOX_PAGE_SIZE = 30  # 위치 분석 결과 박스 한 페이지에 보여줄 이름 수
+POINT_RADIUS = 12  # 캔버스 포인트 점 크기
+CLICK_RADIUS = 20  # 포인트 클릭 판정 반경
+PERF_REFRESH_MS = 1000  # 성능 탭 갱신 주기
+PERF_TAB_TEXT = "⏱ 성능"  # Ctrl+Shift+P 로 열고 닫는 숨김 탭
+LIVE_MAX_FPS = 10  # 실시간 탭 화면 갱신 상한 (버스 속도와 무관하게 초당 이 횟수만 갱신)
+LIVE_SOURCES = ("가상 버스 (python-can virtual)", "TCP candump (host:port)", "stdin 파이프 (candump -L)")
+FAULT_OUTLINE_WIDTH = 5  # 고장 포인트 테두리 두께 (평상시 빨간 점과 구분)
+FAULT_TREE_MAX = 200  # 고장 목록에 보여줄 최대 행 수
+LAYOUT_ISSUES_SHOWN = 30  # 레이아웃 경고 대화상자에 나열할 최대 메시지 수
+PLOT_MARGIN = 50  # 그래프 축 라벨 여백(px)
+PLOT_ZOOM_STEP = 0.8  # 휠 한 칸당 보이는 시간 범위 배율
+
+# 시그널 상세 검색 탭의 Treeview 컬럼 ↔ df_all 컬럼
+TREE_FIELDS = (
+    ("ID", "id"),
+    ("Name", "name"),
+    ("StartBit", "start_bit"),
+    ("BitLength", "bit_length"),
+    ("ByteOrder", "byte_order"),
+    ("IsSigned", "is_signed"),
+    ("Factor", "factor"),
+    ("Offset", "offset"),
+    ("Min", "min_val"),
+    ("Max", "max_val"),
+    ("Unit", "unit"),
+    ("Message", "message_name"),
+)
+
+
+# ============================================
+# 📜 가상 Treeview (보이는 구간만 행 생성)
+# ============================================
+class VirtualTreeView:
+    """결과 전체를 Treeview 항목으로 만들지 않고, 보이는 행(+버퍼)만 재사용하며 값만 바꿔 끼웁니다.
+
+    항목이 재사용되므로 선택 상태는 항목 ID가 아니라 df_all 행 위치로 기억하고,
+    스크롤할 때마다 지금 그 행을 보여주는 항목에 다시 입힙니다.
+    """
+
+    BUFFER_ROWS = 5
+
+    def __init__(self, parent, columns):
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings")
+        self.scrollbar = ttk.Scrollbar(
+            self.frame, orient="vertical", command=self.on_scrollbar
+        )
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.columns_data = []  # 컬럼별 NumPy 배열 (df_all 순서)
+        self.rows = np.empty(0, dtype=np.int64)  # 표시할 df_all 행 위치
+        self.top = 0
+        self.item_ids = []
+        self.selected = set()  # 선택된 df_all 행 위치
+        self.row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+        self.tree.bind("<Configure>", lambda event: self.render())
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        # Treeview 기본 스크롤까지 처리되면 재사용 항목이 밀리므로 "break"로 막습니다.
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+
+    def set_source(self, columns_data):
+        self.columns_data = columns_data
+
+    def set_rows(self, rows):
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.top = 0
+        self.selected = set()
+        self.render()
+
+    def window_rows(self):
+        """지금 항목에 표시 중인 df_all 행 위치 (item_ids와 같은 순서)."""
+        return self.rows[self.top:self.top + len(self.item_ids)].tolist()
+
+    def on_select(self, event=None):
+        # 보이는 구간의 선택만 갱신하고, 화면 밖에 있는 선택 행은 그대로 둡니다.
+        shown = dict(zip(self.item_ids, self.window_rows()))
+        picked = {shown[iid] for iid in self.tree.selection() if iid in shown}
+        self.selected = (self.selected - set(shown.values())) | picked
+
+    def selected_rows(self):
+        return sorted(self.selected)
+
+    def visible_count(self):
+        # 헤더 한 줄을 제외한 표시 가능 행 수
+        return max(1, self.tree.winfo_height() // self.row_height - 1)
+
+    def render(self):
+        with perf.timer("tree.render"):
+            self._render()
+
+    def _render(self):
+        total = len(self.rows)
+        n_show = max(0, min(self.visible_count() + self.BUFFER_ROWS, total - self.top))
+
+        # 필요한 개수만큼만 항목을 만들거나 지웁니다.
+        while len(self.item_ids) < n_show:
+            self.item_ids.append(self.tree.insert("", tk.END))
+        while len(self.item_ids) > n_show:
+            self.tree.delete(self.item_ids.pop())
+
+        window = self.rows[self.top:self.top + n_show].tolist()
+        for iid, idx in zip(self.item_ids, window):
+            self.tree.item(iid, values=tuple(col[idx] for col in self.columns_data))
+        # 항목 ID가 아니라 행 위치 기준으로 선택 표시를 다시 맞춥니다.
+        self.tree.selection_set([iid for iid, idx in zip(self.item_ids, window) if idx in self.selected])
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_count()) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), len(self.rows) - self.visible_count()))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(value) * len(self.rows))
+        elif action == "scroll":
+            step = 1 if unit == "units" else self.visible_count()
+            self.scroll_to(self.top + int(value) * step)
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.top + rows)
+        return "break"
+
+    def on_mousewheel(self, event):
+        return self.scroll_by(-int(event.delta / 120) * 3)
+
 
 # ============================================
 # 🖥️ 통합 애플리케이션 클래스
@@ -21,17 +179,176 @@ class CanAnalyzerIntegratedApp:
         self.root.title("CAN 통신 통합 해석기 (Original Code/위치/검색)")
         self.root.geometry("1400x750")
 
-        # 데이터 로딩 및 처리
-        self.df_all = load_and_process_data()
+        # 데이터는 백그라운드 스레드에서 로드하고, 창은 바로 띄웁니다.
+        self.df_all = None
+        self.mask_table = None
+        self.layout_report = None  # 메시지별 비트 배치 검사 결과
+        self.search_index = None
+        self.category_index = {}
+        self.box_pages = {}  # 결과 박스 → [이름 배열, 현재 페이지, 페이지 라벨]
+        self.points = []
+        self.point_grid = PointGrid()
+        self.selected_point = None
+        self.bg_item = None  # 차량 이미지 캔버스 아이템 (한 번만 생성)
+        self.search_session = None
+        self.search_executor = ThreadPoolExecutor(max_workers=1)
+        self.search_generation = 0  # 최신 검색 번호 (오래된 결과 폐기용)
+        self.search_after_id = None
+        self.pending_search = False  # 로딩 중 요청된 검색은 완료 후 실행
+        self.load_queue = queue.Queue()
+        self.perf_frame = None  # 성능 탭 (열려 있을 때만)
+        self.perf_after_id = None
+        self.decode_plan = None  # 실시간/그래프 탭에서 처음 필요할 때 만듭니다.
+        self.ts_store = TimeSeriesStore()  # 디코딩된 시그널 값 이력 (실시간 수신/로그 불러오기)
+        self.plot_keys = {}  # 콤보박스 표시 이름 → 저장소 키 (시그널 id)
+        self.plot_view = None  # 그래프에 보이는 (t0, t1), None이면 전체
+        self.plot_drag_x = None
+        self.plot_executor = ThreadPoolExecutor(max_workers=1)
+        self.live_decoder = None
+        self.live_items = {}  # 시그널 키 → Treeview 항목 ID
+        self.live_after_id = None
+        self.fault_rules = []  # 고장 규칙 파일에서 읽은 규칙
+        self.fault_engine = None
+        self.rule_points = {}  # 규칙 → 고장 시 표시할 CarPoint 목록
+        self.fault_points = set()  # 지금 고장 표시 중인 CarPoint
 
         # UI 설정
         self.setup_layout()
+        self.root.bind("<Control-P>", self.toggle_perf_tab)  # Ctrl+Shift+P
+        if perf.is_enabled():
+            self.show_perf_tab()
 
         # 3. 이미지 및 포인트 로드 (tk2 로직)
         self.load_image_and_points()
 
+        # 4. 카탈로그 로딩 시작 (로컬 스냅샷 우선, DB 변경 시에만 재조회)
+        self.start_background_load()
+
+    # ============================================
+    # ⏳ 백그라운드 데이터 로딩
+    # ============================================
+    @property
+    def data_ready(self):
+        return self.df_all is not None
+
+    def start_background_load(self):
+        """워커 스레드에서 카탈로그를 로드하고 root.after로 완료 여부를 확인합니다."""
+        self.progress.start(10)
+        self.lbl_status.config(text="시그널 카탈로그 로딩 중...")
+        worker = threading.Thread(target=self._load_worker, daemon=True)
+        worker.start()
+        self.root.after(100, self._poll_load)
+
+    def _load_worker(self):
+        """(워커 스레드) Tk 위젯은 건드리지 않고 결과만 큐에 넣습니다.
+
+        스냅샷으로 먼저 화면을 채우고, 백그라운드 지문 확인에서 DB가 바뀐 것으로
+        나오면 새 카탈로그로 같은 준비 과정을 한 번 더 거칩니다.
+        """
+        validated = queue.Queue()
+        try:
+            with perf.timer("catalog.load"):
+                df_all = load_catalog(on_update=validated.put)
+            self._prepare_catalog(df_all)
+            refreshed = validated.get()  # 지문 확인이 끝날 때까지 (워커 스레드라 UI는 막지 않음)
+            if refreshed is not None:
+                self.load_queue.put(("stage", "DB 변경 반영 중..."))
+                self._prepare_catalog(refreshed)
+        except Exception as e:
+            self.load_queue.put(("error", e))
+        else:
+            self.load_queue.put(("finished",))
+
+    def _prepare_catalog(self, df_all):
+        """(워커 스레드) 마스크/레이아웃 검사/검색 색인을 만들어 "done" 메시지로 넘깁니다."""
+        self.load_queue.put(("stage", f"비트 마스크 계산 중... ({len(df_all)}개)"))
+        # 전체 시그널 비트 마스크를 한 번에 계산해 두고 클릭 시에는 조회만 합니다.
+        with perf.timer("catalog.masks"):
+            mask_table = get_mask_table(df_all) if not df_all.empty else None
+        self.load_queue.put(("stage", "비트 배치 검사 중..."))
+        with perf.timer("catalog.layout_check"):
+            layout_report = check_layouts(df_all, mask_table) if not df_all.empty else None
+        self.load_queue.put(("stage", "검색 색인 생성 중..."))
+        with perf.timer("catalog.search_index"):
+            search_index = SignalSearchIndex(df_all) if not df_all.empty else None
+            category_index = build_category_index(df_all) if not df_all.empty else {}
+        self.load_queue.put(("done", df_all, mask_table, search_index, category_index, layout_report))
+
+    def _poll_load(self):
+        """(메인 스레드) 큐에 쌓인 진행 상황을 반영합니다."""
+        try:
+            while True:
+                msg = self.load_queue.get_nowait()
+                if msg[0] == "stage":
+                    self.lbl_status.config(text=msg[1])
+                elif msg[0] == "done":
+                    self.on_data_loaded(*msg[1:])
+                elif msg[0] == "finished":
+                    return
+                elif msg[0] == "error":
+                    self.progress.stop()
+                    self.lbl_status.config(text=f"데이터 로딩 실패: {msg[1]}")
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(100, self._poll_load)
+
+    def on_data_loaded(self, df_all, mask_table, search_index, category_index, layout_report=None):
+        self.df_all = df_all
+        self.decode_plan = None  # DB 변경으로 다시 불러온 경우 시그널 id가 바뀌었을 수 있음
+        self.mask_table = mask_table
+        self.layout_report = layout_report
+        self.search_index = search_index
+        self.category_index = category_index
+        if search_index is not None:
+            self.search_session = SearchSession(search_index)
+        # Treeview 값은 iterrows 대신 컬럼 배열에서 바로 꺼냅니다.
+        self.result_view.set_source(
+            [df_all[field].to_numpy() if field in df_all else np.full(len(df_all), "")
+             for _, field in TREE_FIELDS]
+        )
+        self.progress.stop()
+        self.progress.pack_forget()
+        if df_all.empty:
+            self.lbl_status.config(text="시그널 데이터 없음 (DB/스냅샷 확인 필요)")
+        else:
+            status = f"시그널 {len(df_all)}개 로드 완료"
+            if layout_report is not None:
+                status += f" | {summarize_layout(layout_report)}"
+                if len(layout_issues(layout_report)):
+                    status += " (클릭해서 보기)"
+            self.lbl_status.config(text=status)
+        self.lbl_info.config(text="차량의 [앞/뒤/좌/우]를 클릭하세요.")
+
+        # 로딩 중에 검색 요청이 있었다면 바로 실행
+        if self.pending_search:
+            self.pending_search = False
+            self.search_signals_treeview()
+
+    def show_layout_issues(self):
+        """비트 겹침/범위 초과 메시지 목록을 대화상자로 보여줍니다 (상태 표시줄 클릭)."""
+        if self.layout_report is None:
+            return
+        issues = layout_issues(self.layout_report)
+        if not len(issues):
+            return
+        lines = [f"[{row.message_name}] 겹침: {row.overlaps} / 범위 초과: {row.out_of_range}"
+                 for row in issues.head(LAYOUT_ISSUES_SHOWN).itertuples(index=False)]
+        if len(issues) > LAYOUT_ISSUES_SHOWN:
+            lines.append(f"... 외 {len(issues) - LAYOUT_ISSUES_SHOWN}개 메시지")
+        messagebox.showwarning("레이아웃 경고", "\n".join(lines))
+
     def setup_layout(self):
         """UI에 3개의 탭을 구성합니다: 1. Code 분석, 2. 위치 분석, 3. 시그널 검색"""
+        # 하단 상태 표시줄 (로딩 진행 상황)
+        status_bar = tk.Frame(self.root, padx=10)
+        status_bar.pack(side="bottom", fill="x")
+        self.lbl_status = tk.Label(status_bar, text="", anchor="w", fg="gray")
+        self.lbl_status.pack(side="left", fill="x", expand=True)
+        self.lbl_status.bind("<Button-1>", lambda event: self.show_layout_issues())
+        self.progress = ttk.Progressbar(status_bar, mode="indeterminate", length=200)
+        self.progress.pack(side="right", pady=2)
+
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
 
@@ -50,6 +367,16 @@ class CanAnalyzerIntegratedApp:
         self.notebook.add(frame3, text="3. 시그널 상세 검색")
         self.setup_search_viewer_tab(frame3)
 
+        # 탭 4: 실시간 모니터
+        frame4 = ttk.Frame(self.notebook)
+        self.notebook.add(frame4, text="4. 실시간 모니터")
+        self.setup_live_tab(frame4)
+
+        # 탭 5: 시그널 그래프
+        frame5 = ttk.Frame(self.notebook)
+        self.notebook.add(frame5, text="5. 시그널 그래프")
+        self.setup_plot_tab(frame5)
+
     def setup_code_analyzer_tab(self, frame):
         title = tk.Label(
             frame,
@@ -109,14 +436,12 @@ class CanAnalyzerIntegratedApp:
         self.lbl_bit.pack(fill="x", pady=5)
 
     def on_tab_changed(self, event):
-        """탭이 변경될 때 캔버스에 이미지를 그리고 포인트를 그립니다."""
+        """탭 2로 처음 이동할 때만 이미지와 포인트 아이템을 만들고, 이후에는 그대로 둡니다."""
         loc = 60
         if self.notebook.tab(self.notebook.select(), "text") == "2. 위치 기반 분석":
             # 이미지가 로드된 경우에만
-            if hasattr(self, "tk_image"):
-                # 캔버스 초기화 후 이미지 다시 그리기
-                self.canvas.delete("all")
-                self.canvas.create_image(
+            if hasattr(self, "tk_image") and self.bg_item is None:
+                self.bg_item = self.canvas.create_image(
                     self.canvas_width // 2+70,
                     self.img_h // 2 +loc,
                     image=self.tk_image,
@@ -152,6 +477,9 @@ class CanAnalyzerIntegratedApp:
                 CarPoint("Rear_R", "후방 센서(우)", x + 100, 580+loc, "Rear"),
             ]
 
+            # 클릭 판정용 격자 색인 (칸 크기 = 클릭 반경의 2배)
+            self.point_grid = PointGrid(self.points, cell_size=CLICK_RADIUS * 2)
+
             # 초기에는 그리지 않고 탭 이동 시 그립니다.
 
         except FileNotFoundError:
@@ -160,20 +488,22 @@ class CanAnalyzerIntegratedApp:
                 "car.png 파일을 찾을 수 없습니다. 위치 기반 분석 탭을 사용할 수 없습니다.",
             )
 
+    @perf.timed("code_tab.analyze")
     def on_analyze_clicked(self):
         original = self.txt_original.get("1.0", tk.END).strip()
         if not original:
             messagebox.showwarning("알림", "original_code 한 줄을 입력하세요.")
             return
 
-        # 1) start_bit, bit_length 파싱
-        start_bit, bit_length = parse_bits_from_original_code(original)
-        if start_bit is None or bit_length is None:
+        # 1) start_bit, bit_length, byte_order 파싱
+        sig = parse_sg_line(original)
+        if sig is None:
             messagebox.showwarning(
                 "알림",
                 "original_code에서 비트 정보를 파싱할 수 없습니다. 형식 확인 필요.",
             )
             return
+        start_bit, bit_length = sig.start_bit, sig.bit_length
 
         # 2) CAN ID 조회
         can_id = get_can_id_by_original_code(original)
@@ -182,11 +512,16 @@ class CanAnalyzerIntegratedApp:
         else:
             self.lbl_can_id.config(text=f"CAN ID: 0x{can_id:X} (Decimal: {can_id})")
 
-        # 3) 비트 마스크 계산 및 표시
-        bit_bytes = calculate_bits(start_bit, bit_length)
-        bit_str = " ".join(f"{b:02X}" for b in bit_bytes)
+        # 3) 비트 마스크 조회(캐시) 또는 계산 후 표시
+        bit_bytes = None
+        if self.mask_table is not None:
+            bit_bytes = self.mask_table.find(sig.name, start_bit, bit_length)
+        if bit_bytes is None:
+            bit_bytes = calculate_bits(start_bit, bit_length, sig.byte_order, CANFD_PAYLOAD_BYTES)
+        size = payload_size_for(bit_bytes)
+        bit_str = " ".join(f"{b:02X}" for b in bit_bytes[:size])
         self.lbl_bit.config(
-            text=f"BIT (8바이트 마스크): {bit_str}\n(Start:{start_bit}, Length:{bit_length})"
+            text=f"BIT ({size}바이트 마스크): {bit_str}\n(Start:{start_bit}, Length:{bit_length}, {sig.byte_order})"
         )
 
     # ============================================
@@ -222,7 +557,8 @@ class CanAnalyzerIntegratedApp:
         self.box_normal = tk.Text(
             left_frame, height=13, bg="#eaf7ea", font=("Arial", 10), state="disabled"
         )
-        self.box_normal.pack(fill="x", pady=(0, 15))
+        self.box_normal.pack(fill="x")
+        self.make_box_pager(left_frame, self.box_normal).pack(fill="x", pady=(0, 10))
 
         tk.Label(
             left_frame,
@@ -233,11 +569,12 @@ class CanAnalyzerIntegratedApp:
         self.box_error = tk.Text(
             left_frame, height=15, bg="#f7eaea", font=("Arial", 10), state="disabled"
         )
-        self.box_error.pack(fill="x", pady=(0, 10))
+        self.box_error.pack(fill="x")
+        self.make_box_pager(left_frame, self.box_error).pack(fill="x", pady=(0, 5))
         # self.box_error.place(x=0, y=400, relwidth=1, height=300)
 
         self.lbl_info = tk.Label(
-            left_frame, text="차량의 [앞/뒤/좌/우]를 클릭하세요.", fg="gray"
+            left_frame, text="데이터 로딩 중...", fg="gray"
         )
         self.lbl_info.pack(pady=10)
 
@@ -247,80 +584,142 @@ class CanAnalyzerIntegratedApp:
         self.canvas.pack(fill="both", expand=True)
         self.canvas.bind("<Button-1>", self.on_canvas_click)  # 클릭 이벤트 바인딩
 
+    def make_box_pager(self, parent, box_widget):
+        """결과 박스 아래의 [이전/다음] 페이지 이동 줄을 만듭니다."""
+        pager = tk.Frame(parent)
+        tk.Button(
+            pager, text="◀ 이전", command=lambda: self.change_box_page(box_widget, -1)
+        ).pack(side="left")
+        tk.Button(
+            pager, text="다음 ▶", command=lambda: self.change_box_page(box_widget, 1)
+        ).pack(side="right")
+        lbl_page = tk.Label(pager, text="", fg="gray")
+        lbl_page.pack(side="left", expand=True)
+        self.box_pages[box_widget] = [np.empty(0, dtype=object), 0, lbl_page]
+        return pager
+
+    def change_box_page(self, box_widget, delta):
+        names, page, _ = self.box_pages[box_widget]
+        last_page = max(0, (len(names) - 1) // BOX_PAGE_SIZE)
+        new_page = min(max(page + delta, 0), last_page)
+        if new_page != page:
+            self.fill_box(box_widget, names, new_page)
+
+    def search_signal_rows(self, keyword, fuzzy=False):
+        """시그널 이름에 keyword가 포함된 행 위치 배열을 반환합니다 (색인이 없으면 전체 스캔).
+
+        fuzzy=True이면 유사도 상위 FUZZY_TOP_K개를 점수순으로 반환합니다.
+        (워커 스레드에서도 호출되므로 Tk 변수는 여기서 읽지 않습니다.)
+        """
+        perf.count("search.queries")
+        if fuzzy and self.search_index is not None:
+            with perf.timer("search.fuzzy"):
+                rows, _ = self.search_index.fuzzy_rows(keyword, FUZZY_TOP_K)
+            return rows
+        with perf.timer("search.rows"):
+            if self.search_session is not None:
+                return self.search_session.search_rows(keyword)
+            mask = self.df_all["name"].str.contains(keyword, case=False, na=False, regex=False)
+            return np.flatnonzero(mask.to_numpy())
+
+    def search_signals(self, keyword):
+        """시그널 이름에 keyword가 포함된 df_all 부분 DataFrame을 반환합니다."""
+        return self.df_all.iloc[self.search_signal_rows(keyword)]
+
     def search_can_location(self):
         """위치 분석 탭의 검색 버튼 로직 (tk2.py 기반)"""
         keyword = self.search_entry_loc.get()
-        if not keyword:
+        if not keyword or not self.data_ready:
             return
 
-        results = self.df_all[
-            self.df_all["name"].str.contains(keyword, case=False, na=False)
-        ]
-        self.update_result_boxes(f"'{keyword}' 검색 결과", results)
+        results = self.search_signals(keyword)
+        self.update_result_boxes(f"'{keyword}' 검색 결과", group_names_by_status(results))
 
     # ============================================
     # 캔버스 클릭 이벤트 처리 (새로 추가)
     # ============================================
     def on_canvas_click(self, event):
         """캔버스에서 클릭된 위치에 대한 작업"""
-        x, y = event.x, event.y
-        clicked_point = None
-
-        # 클릭된 포인트가 있으면 색상을 토글
-        for p in self.points:
-            distance = math.hypot(p.x - x, p.y - y)
-            if distance < 20:  # 클릭된 영역이 포인트 내에 있으면
-                p.toggle_color()
-                clicked_point = p
-            else:
-                p.color = "red"  # 색상 초기화
-
-        self.draw_points()  # 포인트들을 다시 그리기
+        # 격자 색인으로 주변 칸의 포인트만 검사
+        clicked_point = self.point_grid.nearest(event.x, event.y, CLICK_RADIUS)
+
+        # 색이 바뀐 포인트만 다시 칠합니다 (이전 선택 해제 + 새 선택 토글).
+        changed = []
+        if self.selected_point is not None and self.selected_point is not clicked_point:
+            self.selected_point.color = "red"  # 색상 초기화
+            changed.append(self.selected_point)
+        if clicked_point is not None:
+            clicked_point.toggle_color()
+            changed.append(clicked_point)
+        self.update_point_items(changed)
 
         if clicked_point and clicked_point.color == "green":  # 색상이 green이면
+            self.selected_point = clicked_point
             self.show_component_info(clicked_point)  # 정보 표시
         else:
+            self.selected_point = None
             self.clear_boxes()  # 그 외에는 박스 초기화
 
     def draw_points(self):
-        """차량 위치를 나타내는 포인트들을 그리는 메소드"""
-        self.canvas.delete("dots")  # 기존에 그려진 포인트 삭제
-        r = 12  # 점 크기
+        """차량 위치를 나타내는 포인트 아이템을 한 번만 만드는 메소드"""
+        r = POINT_RADIUS  # 점 크기
         for p in self.points:
-            self.canvas.create_oval(
+            if p.item_id is not None:
+                continue
+            p.item_id = self.canvas.create_oval(
                 p.x - r,
                 p.y - r,
                 p.x + r,
                 p.y + r,
-                fill=p.color,
-                outline="black",
                 tags="dots",
+                **self.point_style(p),
             )
 
+    def point_style(self, p):
+        """고장 중인 포인트는 빨간 점 + 굵은 빨간 테두리로, 그 외에는 선택 색으로 그립니다."""
+        if p.fault:
+            return {"fill": "red", "outline": "red", "width": FAULT_OUTLINE_WIDTH}
+        return {"fill": p.color, "outline": "black", "width": 1}
+
+    def update_point_items(self, points):
+        """바뀐 포인트의 색만 itemconfig로 갱신합니다."""
+        for p in points:
+            if p.item_id is not None:
+                self.canvas.itemconfig(p.item_id, **self.point_style(p))
+
+    @perf.timed("location.show")
     def show_component_info(self, point):
         """선택된 포인트의 정보를 표시하는 메소드"""
         category = point.category
-        df_cat = self.df_all[self.df_all["Category"] == category]
+        if not self.data_ready:
+            self.lbl_info.config(text="데이터 로딩 중... 잠시 후 다시 클릭하세요.")
+            return
+        # 미리 묶어 둔 Category → Status → 이름 배열을 조회만 합니다.
+        groups = self.category_index.get(category, {})
+        total = sum(len(names) for names in groups.values())
         self.lbl_info.config(
-            text=f"선택된 위치: [{category}]\n데이터 개수: {len(df_cat)}개"
+            text=f"선택된 위치: [{category}]\n데이터 개수: {total}개"
         )
-        self.update_result_boxes(category, df_cat)
+        self.update_result_boxes(category, groups)
 
-    def update_result_boxes(self, title, df_subset):
-        """결과 박스를 업데이트하는 메소드"""
-        df_normal = df_subset[df_subset["Status"] == "작동(Normal)"]
-        df_error = df_subset[df_subset["Status"] == "고장(Error)"]
+    def update_result_boxes(self, title, groups):
+        """결과 박스를 업데이트하는 메소드 (groups: Status → 이름 배열)"""
+        empty = np.empty(0, dtype=object)
+        self.fill_box(self.box_normal, groups.get(NORMAL_STATUS, empty))
+        self.fill_box(self.box_error, groups.get(ERROR_STATUS, empty))
 
-        self.fill_box(self.box_normal, df_normal)
-        self.fill_box(self.box_error, df_error)
+    def fill_box(self, box_widget, names, page=0):
+        """결과 박스에 이름 배열의 page번째 페이지(BOX_PAGE_SIZE개)를 채우는 메소드"""
+        pager = self.box_pages[box_widget]
+        pager[0], pager[1] = names, page
+        n_pages = max(1, -(-len(names) // BOX_PAGE_SIZE))
+        pager[2].config(text=f"{page + 1}/{n_pages} (총 {len(names)}개)" if len(names) else "")
 
-    def fill_box(self, box_widget, df_data):
-        """결과 박스에 데이터를 채우는 메소드"""
         box_widget.config(state="normal")
         box_widget.delete(1.0, tk.END)
-        if not df_data.empty:
-            for name in df_data["name"].head(30):
-                box_widget.insert(tk.END, f"- {name}\n")
+        if len(names):
+            chunk = names[page * BOX_PAGE_SIZE:(page + 1) * BOX_PAGE_SIZE]
+            box_widget.insert(tk.END, "".join(f"- {name}\n" for name in chunk))
         else:
             box_widget.insert(tk.END, "데이터 없음")
         box_widget.config(state="disabled")
@@ -332,6 +731,9 @@ class CanAnalyzerIntegratedApp:
             box.config(state="normal")
             box.delete(1.0, tk.END)
             box.config(state="disabled")
+            pager = self.box_pages[box]
+            pager[0], pager[1] = np.empty(0, dtype=object), 0
+            pager[2].config(text="")
 
     # ============================================
     # 탭 3: 시그널 상세 검색 UI (tk3.py 기반)
@@ -352,24 +754,24 @@ class CanAnalyzerIntegratedApp:
         )
         search_button.pack(side="left", padx=5)
 
-        # Treeview (검색 결과 표시)
-        columns = (
-            "ID",
-            "Name",
-            "StartBit",
-            "BitLength",
-            "ByteOrder",
-            "IsSigned",
-            "Factor",
-            "Offset",
-            "Min",
-            "Max",
-            "Unit",
-            "Message",
-        )
-
-        self.tree = ttk.Treeview(frame, columns=columns, show="headings")
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        # 유사도(오타 허용) 검색 모드: 상위 FUZZY_TOP_K개를 점수순으로 표시
+        self.fuzzy_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            search_frame,
+            text=f"Fuzzy (Top {FUZZY_TOP_K})",
+            variable=self.fuzzy_var,
+            command=self.search_signals_treeview,
+        ).pack(side="left", padx=5)
+
+        # 검색 결과 개수 표시
+        self.lbl_result_count = tk.Label(search_frame, text="", fg="gray")
+        self.lbl_result_count.pack(side="left", padx=10)
+
+        # Treeview (검색 결과 표시) - 보이는 구간만 그리는 가상 리스트
+        columns = tuple(col for col, _ in TREE_FIELDS)
+        self.result_view = VirtualTreeView(frame, columns)
+        self.result_view.frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.tree = self.result_view.tree
 
         for col in columns:
             self.tree.heading(col, text=col)
@@ -383,6 +785,8 @@ class CanAnalyzerIntegratedApp:
         # 나머지 컬럼 너비는 기본값
 
         self.search_entry.bind("<Return>", lambda event: self.search_signals_treeview())
+        # 입력할 때마다 디바운스 후 자동 검색
+        self.search_var.trace_add("write", self.on_search_var_changed)
         ## ==========================================================
         # self.tree.bind("<ButtonRelease-1>", self.copy_selected_item)
 
@@ -413,43 +817,490 @@ class CanAnalyzerIntegratedApp:
     #     pyperclip.copy(formatted_signal)
     #     print(f"Copied to clipboard: {formatted_signal}")  # 확인용 출력
 
+    def on_search_var_changed(self, *args):
+        """검색어가 바뀔 때마다 타이머를 다시 걸어 입력이 멈춘 뒤에만 검색합니다."""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.run_live_search)
+
+    def run_live_search(self):
+        """검색은 워커 스레드에서 수행하고, 더 새로운 검색이 시작되면 결과를 버립니다."""
+        self.search_after_id = None
+        keyword = self.search_var.get().strip()
+        if not keyword or not self.data_ready:
+            self.search_signals_treeview()
+            return
+
+        self.search_generation += 1
+        future = self.search_executor.submit(
+            self.search_signal_rows, keyword, self.fuzzy_var.get()
+        )
+        self.lbl_result_count.config(text="검색 중...")
+        self.root.after(10, self._poll_live_search, future, self.search_generation)
+
+    def _poll_live_search(self, future, generation):
+        if generation != self.search_generation:
+            future.cancel()  # 이미 오래된 검색
+            return
+        if not future.done():
+            self.root.after(10, self._poll_live_search, future, generation)
+            return
+        try:
+            rows = future.result()
+        except Exception as e:  # 워커 스레드 예외를 여기서 받아 "검색 중" 상태를 끝냅니다.
+            self.result_view.set_rows([])
+            self.lbl_result_count.config(text=f"검색 실패: {e}")
+            return
+        self.show_search_rows(rows)
+
+    def show_search_rows(self, rows):
+        self.result_view.set_rows(rows)
+        self.lbl_result_count.config(text=f"검색 결과: {len(rows):,}건")
+
     """시그널 상세 검색 탭의 검색 로직 (tk3.py 기반)"""
     def search_signals_treeview(self):
 
         keyword = self.search_var.get().strip()
-
-        # 결과 테이블 초기화
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        # 진행 중인 자동 검색은 취소
+        self.search_generation += 1
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+            self.search_after_id = None
 
         if not keyword:
+            self.result_view.set_rows([])
+            self.lbl_result_count.config(text="")
             return
 
-        # 메모리(df_all)에서 LIKE 검색
-        results_df = self.df_all[
-            self.df_all["name"].str.contains(keyword, case=False, na=False)
-        ]
-
-        # 테이블에 검색 결과 삽입
-        for index, row in results_df.iterrows():
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    row["id"],
-                    row["name"],
-                    row["start_bit"],
-                    row["bit_length"],
-                    row["byte_order"],
-                    row["is_signed"],
-                    row["factor"],
-                    row["offset"],
-                    row["min_val"],
-                    row["max_val"],
-                    row["unit"],
-                    row["message_name"],
-                ),
-            )
+        if not self.data_ready:
+            # 로딩이 끝나면 on_data_loaded에서 다시 실행됩니다.
+            self.pending_search = True
+            self.lbl_result_count.config(text="데이터 로딩 중...")
+            return
+
+        # 트라이그램 색인으로 대소문자 무시 부분 문자열 검색 후, 보이는 구간만 표시
+        self.show_search_rows(self.search_signal_rows(keyword, self.fuzzy_var.get()))
+
+    # ============================================
+    # 탭 4: 실시간 CAN 스트림 모니터
+    # ============================================
+    def setup_live_tab(self, frame):
+        bar = ttk.Frame(frame)
+        bar.pack(fill="x", padx=10, pady=10)
+
+        self.live_source_var = tk.StringVar(value=LIVE_SOURCES[0])
+        ttk.Combobox(
+            bar, textvariable=self.live_source_var, values=LIVE_SOURCES, state="readonly", width=32
+        ).pack(side="left")
+        tk.Label(bar, text="채널/주소:").pack(side="left", padx=(10, 0))
+        self.live_address_var = tk.StringVar(value="vcan0")
+        ttk.Entry(bar, textvariable=self.live_address_var, width=20).pack(side="left", padx=5)
+        self.btn_live_start = ttk.Button(bar, text="시작", command=self.start_live)
+        self.btn_live_start.pack(side="left", padx=5)
+        self.btn_live_stop = ttk.Button(bar, text="정지", command=self.stop_live, state="disabled")
+        self.btn_live_stop.pack(side="left")
+        ttk.Button(bar, text="고장 규칙...", command=self.load_fault_rules).pack(side="left", padx=(10, 0))
+        self.lbl_fault = tk.Label(bar, text="규칙 없음", fg="gray")
+        self.lbl_fault.pack(side="left", padx=5)
+        self.lbl_live_rate = tk.Label(bar, text="", fg="gray")
+        self.lbl_live_rate.pack(side="left", padx=10)
+
+        fault_columns = ("Rule", "Signal", "Since", "Value")
+        self.fault_tree = ttk.Treeview(frame, columns=fault_columns, show="headings", height=6)
+        for col in fault_columns:
+            self.fault_tree.heading(col, text=col)
+            self.fault_tree.column(col, width=120, anchor="e")
+        self.fault_tree.column("Rule", width=300, anchor="w")
+        self.fault_tree.column("Signal", width=250, anchor="w")
+        self.fault_tree.pack(side="bottom", fill="x", padx=10, pady=(0, 10))
+
+        columns = ("Signal", "Value", "Time", "Samples")
+        self.live_tree = ttk.Treeview(frame, columns=columns, show="headings")
+        for col in columns:
+            self.live_tree.heading(col, text=col)
+            self.live_tree.column(col, width=120, anchor="e")
+        self.live_tree.column("Signal", width=250, anchor="w")
+        self.live_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+    def get_decode_plan(self):
+        if self.decode_plan is None:
+            self.decode_plan = DecodePlan(self.df_all)
+        return self.decode_plan
+
+    def open_live_source(self):
+        kind = LIVE_SOURCES.index(self.live_source_var.get())
+        address = self.live_address_var.get().strip()
+        if kind == 0:
+            return CanBusSource(channel=address or "vcan0", interface="virtual")
+        if kind == 1:
+            host, _, port = address.rpartition(":")
+            return CandumpStreamSource.connect(host or "127.0.0.1", int(port))
+        return CandumpStreamSource.stdin()
+
+    def start_live(self):
+        if not self.data_ready or self.df_all.empty:
+            messagebox.showwarning("알림", "시그널 카탈로그를 먼저 불러와야 합니다.")
+            return
+        try:
+            plan = self.get_decode_plan()
+            source = self.open_live_source()
+        except (RuntimeError, ValueError, OSError) as e:
+            messagebox.showerror("에러", f"실시간 소스를 열 수 없습니다: {e}")
+            return
+
+        self.live_tree.delete(*self.live_tree.get_children())
+        self.live_items = {}
+        self.fault_engine = FaultEngine(self.fault_rules, plan) if self.fault_rules else None
+        self.rule_points = self.map_rule_points(self.fault_engine)
+        self.refresh_faults()
+        self.live_decoder = LiveDecoder(plan, source, store=self.ts_store, faults=self.fault_engine)
+        self.live_decoder.start()
+        self.btn_live_start.config(state="disabled")
+        self.btn_live_stop.config(state="normal")
+        self.live_after_id = self.root.after(1000 // LIVE_MAX_FPS, self.refresh_live)
+
+    def stop_live(self):
+        if self.live_after_id is not None:
+            self.root.after_cancel(self.live_after_id)
+            self.live_after_id = None
+        if self.live_decoder is not None:
+            self.live_decoder.stop()
+            self.refresh_live(reschedule=False)  # 남은 갱신분 반영
+        # 스트림이 멈추면 고장 판정도 멈추므로 포인트 고장 표시를 지웁니다 (목록은 마지막 상태로 남김).
+        for p in self.fault_points:
+            p.fault = False
+        self.update_point_items(self.fault_points)
+        self.fault_points = set()
+        if self.fault_rules:
+            self.lbl_fault.config(fg="gray")
+        self.btn_live_start.config(state="normal")
+        self.btn_live_stop.config(state="disabled")
+
+    def refresh_live(self, reschedule=True):
+        """(메인 스레드) 마지막 갱신 이후 바뀐 시그널만 한 번씩 반영합니다."""
+        decoder = self.live_decoder
+        with perf.timer("live.refresh"):
+            for key, (ts, value, total) in decoder.pop_updates().items():
+                values = (decoder.plan.label(key), f"{value:.6g}", f"{ts:.3f}", total)
+                iid = self.live_items.get(key)
+                if iid is None:
+                    self.live_items[key] = self.live_tree.insert("", tk.END, values=values)
+                else:
+                    self.live_tree.item(iid, values=values)
+            if self.fault_engine is not None and self.fault_engine.pop_changes():
+                self.refresh_faults()
+
+        status = f"{decoder.frame_rate():,.0f} frames/s, 누적 {decoder.frames:,}개"
+        if decoder.unknown_frames:
+            status += f" (카탈로그에 없는 ID {decoder.unknown_frames:,}개)"
+        if decoder.error is not None:
+            status += f" - 수신 에러: {decoder.error}"
+        self.lbl_live_rate.config(text=status)
+
+        if not reschedule:
+            return
+        if decoder.running:
+            self.live_after_id = self.root.after(1000 // LIVE_MAX_FPS, self.refresh_live)
+        else:
+            self.live_after_id = None
+            self.stop_live()  # 스트림 종료/에러
+
+    def load_fault_rules(self):
+        path = filedialog.askopenfilename(
+            title="고장 규칙 파일", filetypes=[("JSON", "*.json"), ("모든 파일", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            rules = load_rules(path)
+        except (OSError, ValueError, TypeError) as e:
+            messagebox.showerror("에러", f"고장 규칙을 읽을 수 없습니다: {e}")
+            return
+        self.fault_rules = rules
+        text = f"규칙 {len(rules)}개"
+        if self.data_ready:
+            missing = [r for r in rules if not self.catalog_has_signal(r)]
+            if missing:
+                text += f" (카탈로그에 없는 시그널 {len(missing)}개)"
+        self.lbl_fault.config(text=text)
+        if self.live_decoder is not None and self.live_decoder.running:
+            self.lbl_status.config(text="고장 규칙은 다음 시작부터 적용됩니다.")
+
+    def catalog_has_signal(self, rule):
+        """규칙의 시그널(과 message/frame_id 조건)에 맞는 행이 카탈로그에 있는지."""
+        rows = self.df_all["name"] == rule.signal
+        if rule.message is not None and "message_name" in self.df_all:
+            rows &= self.df_all["message_name"] == rule.message
+        if rule.frame_id is not None and "frame_id" in self.df_all:
+            rows &= self.df_all["frame_id"] == rule.frame_id
+        return bool(rows.any())
+
+    def map_rule_points(self, engine):
+        """규칙의 point(CarPoint id)가 있으면 그 포인트, 없으면 시그널 Category가 같은 포인트들."""
+        if engine is None:
+            return {}
+        by_id = {p.id: p for p in self.points}
+        category_of = {}
+        if "Category" in self.df_all:
+            # 엔진의 디코딩 키는 시그널 id (DecodePlan 기본 키)
+            category_of = dict(zip(self.df_all["id"], self.df_all["Category"]))
+        mapping = {}
+        for rule, key in zip(engine.rules, engine.rule_keys):
+            if rule.point is not None:
+                mapping[rule] = [by_id[rule.point]] if rule.point in by_id else []
+            else:
+                category = category_of.get(key)
+                mapping[rule] = [p for p in self.points if p.category == category]
+        return mapping
+
+    def refresh_faults(self):
+        """(메인 스레드) 고장 목록과 고장 포인트 표시를 현재 상태로 맞춥니다."""
+        active = self.fault_engine.active_faults() if self.fault_engine is not None else []
+        self.fault_tree.delete(*self.fault_tree.get_children())
+        for rule, key, since, value in active[-FAULT_TREE_MAX:]:
+            shown = "-" if np.isnan(value) else f"{value:.6g}"  # 고착/타임아웃은 값 없음
+            signal = self.decode_plan.label(key) if self.decode_plan is not None else rule.target
+            self.fault_tree.insert("", tk.END, values=(rule.describe(), signal, f"{since:.3f}", shown))
+
+        faulted = {p for rule, _, _, _ in active for p in self.rule_points.get(rule, ())}
+        changed = faulted ^ self.fault_points
+        for p in changed:
+            p.fault = p in faulted
+        self.fault_points = faulted
+        self.update_point_items(changed)
+        if self.fault_rules:
+            text = f"규칙 {len(self.fault_rules)}개, 고장 {len(active)}건"
+            if self.fault_engine is not None and self.fault_engine.unresolved:
+                text += f" (시그널을 특정하지 못한 규칙 {len(self.fault_engine.unresolved)}개)"
+            self.lbl_fault.config(text=text, fg="red" if active else "gray")
+
+    # ============================================
+    # 탭 5: 시그널 그래프 (줌 수준에 맞는 해상도로 조회)
+    # ============================================
+    def setup_plot_tab(self, frame):
+        bar = ttk.Frame(frame)
+        bar.pack(fill="x", padx=10, pady=10)
+
+        tk.Label(bar, text="시그널:").pack(side="left")
+        self.plot_key_var = tk.StringVar()
+        combo = ttk.Combobox(
+            bar, textvariable=self.plot_key_var, width=40,
+            postcommand=lambda: combo.config(values=self.update_plot_keys()),
+        )
+        combo.pack(side="left", padx=5)
+        combo.bind("<<ComboboxSelected>>", lambda event: self.reset_plot_view())
+        self.plot_lttb_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bar, text="LTTB", variable=self.plot_lttb_var, command=self.redraw_plot).pack(side="left")
+        ttk.Button(bar, text="새로고침", command=self.redraw_plot).pack(side="left", padx=5)
+        ttk.Button(bar, text="로그 불러오기", command=self.load_log_for_plot).pack(side="left")
+        self.lbl_plot_info = tk.Label(bar, text="휠: 확대/축소, 드래그: 이동, 더블클릭: 전체 보기", fg="gray")
+        self.lbl_plot_info.pack(side="left", padx=10)
+
+        self.plot_canvas = tk.Canvas(frame, bg="white", highlightthickness=0)
+        self.plot_canvas.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        # 선/축 라벨 아이템은 한 번만 만들고 좌표와 글자만 바꿉니다.
+        self.plot_line = self.plot_canvas.create_line(0, 0, 0, 0, fill="#1f77b4")
+        # 라벨: 최댓값, 점 개수, 최솟값, 시작 시각, 끝 시각
+        self.plot_labels = [self.plot_canvas.create_text(0, 0, fill="gray", anchor=a)
+                            for a in ("nw", "ne", "sw", "sw", "se")]
+        self.plot_canvas.bind("<Configure>", lambda event: self.redraw_plot())
+        self.plot_canvas.bind("<MouseWheel>", lambda e: self.zoom_plot(e.x, 1 if e.delta > 0 else -1))
+        self.plot_canvas.bind("<Button-4>", lambda e: self.zoom_plot(e.x, 1))
+        self.plot_canvas.bind("<Button-5>", lambda e: self.zoom_plot(e.x, -1))
+        self.plot_canvas.bind("<ButtonPress-1>", self.on_plot_press)
+        self.plot_canvas.bind("<B1-Motion>", self.on_plot_drag)
+        self.plot_canvas.bind("<Double-Button-1>", lambda event: self.reset_plot_view())
+
+    def update_plot_keys(self):
+        """저장소의 시그널 id를 '메시지.시그널' 표시 이름으로 바꿔 콤보박스 목록을 만듭니다."""
+        plan = self.decode_plan
+        self.plot_keys = {plan.label(key) if plan is not None else str(key): key for key in self.ts_store.keys()}
+        return sorted(self.plot_keys)
+
+    def plot_key(self):
+        return self.plot_keys.get(self.plot_key_var.get())
+
+    def plot_time_range(self):
+        """(전체 범위, 보이는 범위). 선택한 시그널에 데이터가 없으면 None."""
+        full = self.ts_store.time_range(self.plot_key())
+        if full is None:
+            return None
+        return full, self.plot_view or full
+
+    def reset_plot_view(self):
+        self.plot_view = None
+        self.redraw_plot()
+
+    def zoom_plot(self, x, direction):
+        ranges = self.plot_time_range()
+        if ranges is None:
+            return
+        full, (t0, t1) = ranges
+        width = max(1, self.plot_canvas.winfo_width() - 2 * PLOT_MARGIN)
+        anchor = t0 + (t1 - t0) * min(max((x - PLOT_MARGIN) / width, 0.0), 1.0)
+        scale = PLOT_ZOOM_STEP if direction > 0 else 1 / PLOT_ZOOM_STEP
+        self.set_plot_view(anchor - (anchor - t0) * scale, anchor + (t1 - anchor) * scale, full)
+
+    def on_plot_press(self, event):
+        self.plot_drag_x = event.x
+
+    def on_plot_drag(self, event):
+        ranges = self.plot_time_range()
+        if ranges is None or self.plot_drag_x is None:
+            return
+        full, (t0, t1) = ranges
+        width = max(1, self.plot_canvas.winfo_width() - 2 * PLOT_MARGIN)
+        shift = (self.plot_drag_x - event.x) * (t1 - t0) / width
+        self.plot_drag_x = event.x
+        self.set_plot_view(t0 + shift, t1 + shift, full)
+
+    def set_plot_view(self, t0, t1, full):
+        span = min(t1 - t0, full[1] - full[0])
+        t0 = min(max(t0, full[0]), full[1] - span)  # 전체 범위 밖으로 나가지 않게
+        self.plot_view = (t0, t0 + span)
+        self.redraw_plot()
+
+    def redraw_plot(self):
+        """보이는 범위를 캔버스 폭에 맞는 점 개수로 조회해 선 하나로 다시 그립니다."""
+        canvas = self.plot_canvas
+        ranges = self.plot_time_range()
+        if ranges is None:
+            canvas.coords(self.plot_line, 0, 0, 0, 0)
+            for item in self.plot_labels:
+                canvas.itemconfig(item, text="")
+            return
+        view = ranges[1]
+
+        w, h = canvas.winfo_width(), canvas.winfo_height()
+        plot_w, plot_h = max(1, w - 2 * PLOT_MARGIN), max(1, h - 2 * PLOT_MARGIN)
+        method = "lttb" if self.plot_lttb_var.get() else "minmax"
+        with perf.timer("plot.query"):
+            ts, values = self.ts_store.query(self.plot_key(), *view, max_points=2 * plot_w, method=method)
+        if len(ts) < 2:
+            canvas.coords(self.plot_line, 0, 0, 0, 0)
+            return
+
+        t0, t1 = view
+        v_min, v_max = float(values.min()), float(values.max())
+        v_span = (v_max - v_min) or 1.0
+        xy = np.empty(2 * len(ts))
+        xy[0::2] = PLOT_MARGIN + (ts - t0) * plot_w / ((t1 - t0) or 1.0)
+        xy[1::2] = PLOT_MARGIN + (v_max - values) * plot_h / v_span
+        with perf.timer("plot.render"):
+            canvas.coords(self.plot_line, *xy.tolist())
+
+        labels = (f"{v_max:.6g}", f"점 {len(ts):,}개", f"{v_min:.6g}", f"{t0:.3f}s", f"{t1:.3f}s")
+        positions = ((4, PLOT_MARGIN), (w - 4, 4), (4, h - PLOT_MARGIN),
+                     (PLOT_MARGIN, h - 4), (w - PLOT_MARGIN, h - 4))
+        for item, text, (x, y) in zip(self.plot_labels, labels, positions):
+            canvas.coords(item, x, y)
+            canvas.itemconfig(item, text=text)
+
+    def load_log_for_plot(self):
+        if not self.data_ready or self.df_all.empty:
+            messagebox.showwarning("알림", "시그널 카탈로그를 먼저 불러와야 합니다.")
+            return
+        path = filedialog.askopenfilename(
+            filetypes=[("CAN 로그", "*.log *.asc *.txt"), ("모든 파일", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            plan = self.get_decode_plan()
+        except ValueError as e:
+            messagebox.showerror("에러", f"디코딩 계획을 만들 수 없습니다: {e}")
+            return
+        self.lbl_plot_info.config(text="로그 디코딩 중...")
+        future = self.plot_executor.submit(ingest_log, self.ts_store, plan, path)
+        self.root.after(100, self._poll_log_ingest, future)
+
+    def _poll_log_ingest(self, future):
+        if not future.done():
+            self.root.after(100, self._poll_log_ingest, future)
+            return
+        try:
+            frames = future.result()
+        except Exception as e:  # 파일 에러뿐 아니라 디코딩 중 예외도 화면에 표시
+            self.lbl_plot_info.config(text=f"로그 불러오기 실패: {type(e).__name__}: {e}")
+            return
+        self.lbl_plot_info.config(text=f"프레임 {frames:,}개 디코딩 완료 (시그널 {len(self.ts_store.keys()):,}개)")
+        self.redraw_plot()
+
+    # ============================================
+    # ⏱️ 성능 탭 (숨김, Ctrl+Shift+P)
+    # ============================================
+    def toggle_perf_tab(self, event=None):
+        if self.perf_frame is None:
+            perf.enable(True)
+            self.show_perf_tab()
+        else:
+            self.hide_perf_tab()
+
+    def show_perf_tab(self):
+        """최근 측정값 기준 p50/p95를 보여 주는 탭을 추가합니다."""
+        self.perf_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.perf_frame, text=PERF_TAB_TEXT)
+
+        bar = ttk.Frame(self.perf_frame)
+        bar.pack(fill="x", padx=10, pady=10)
+        ttk.Button(bar, text="초기화", command=self.reset_perf).pack(side="left")
+        ttk.Button(bar, text="JSON 내보내기", command=self.export_perf).pack(side="left", padx=5)
+        self.lbl_perf_db = tk.Label(bar, text="", fg="gray", anchor="w")
+        self.lbl_perf_db.pack(side="left", padx=10)
+
+        columns = ("Name", "Count", "p50 ms", "p95 ms", "Max ms")
+        self.perf_tree = ttk.Treeview(self.perf_frame, columns=columns, show="headings")
+        for col in columns:
+            self.perf_tree.heading(col, text=col)
+            self.perf_tree.column(col, width=100, anchor="e")
+        self.perf_tree.column("Name", width=250, anchor="w")
+        self.perf_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.refresh_perf_tab()
+
+    def hide_perf_tab(self):
+        if self.perf_after_id is not None:
+            self.root.after_cancel(self.perf_after_id)
+            self.perf_after_id = None
+        self.notebook.forget(self.perf_frame)
+        self.perf_frame.destroy()
+        self.perf_frame = None
+        perf.enable(False)
+
+    def refresh_perf_tab(self):
+        stats = perf.snapshot()
+        self.perf_tree.delete(*self.perf_tree.get_children())
+        for t in stats["timings"]:
+            self.perf_tree.insert("", tk.END, values=(
+                t["name"], t["count"], f"{t['p50_ms']:.2f}", f"{t['p95_ms']:.2f}", f"{t['max_ms']:.2f}"
+            ))
+        for name, n in sorted(stats["counters"].items()):
+            self.perf_tree.insert("", tk.END, values=(name, n, "", "", ""))
+
+        db = get_db_stats()
+        self.lbl_perf_db.config(
+            text=f"DB: 쿼리 {db['queries']}회 (평균 {db['avg_query_ms']:.1f}ms), "
+                 f"풀 대기 평균 {db['avg_pool_wait_ms']:.1f}ms"
+        )
+        self.perf_after_id = self.root.after(PERF_REFRESH_MS, self.refresh_perf_tab)
+
+    def reset_perf(self):
+        perf.reset()
+        if self.perf_after_id is not None:
+            self.root.after_cancel(self.perf_after_id)
+        self.refresh_perf_tab()
+
+    def export_perf(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json", filetypes=[("JSON", "*.json")], initialfile="perf.json"
+        )
+        if not path:
+            return
+        try:
+            perf.export_json(path, extra={"db": get_db_stats()})
+        except OSError as e:
+            messagebox.showerror("에러", f"저장 실패: {e}")
+            return
+        self.lbl_status.config(text=f"성능 통계 저장: {path}")
 
 
 # ============================================